@@ -0,0 +1,32 @@
+"""add employee list indexes
+
+Revision ID: 8c2f4b1e9d07
+Revises: 3010557452bd
+Create Date: 2026-10-17 09:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c2f4b1e9d07'
+down_revision: Union[str, Sequence[str], None] = '3010557452bd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_employees_last_name_id', 'employees', ['last_name', 'id'], unique=False)
+    op.create_index(op.f('ix_employees_department_id'), 'employees', ['department_id'], unique=False)
+    op.create_index(op.f('ix_employees_position_id'), 'employees', ['position_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_employees_position_id'), table_name='employees')
+    op.drop_index(op.f('ix_employees_department_id'), table_name='employees')
+    op.drop_index('ix_employees_last_name_id', table_name='employees')
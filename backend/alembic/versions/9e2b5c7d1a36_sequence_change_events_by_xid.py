@@ -0,0 +1,109 @@
+"""sequence change events by xid
+
+Revision ID: 9e2b5c7d1a36
+Revises: c6f1a8d4e273
+Create Date: 2026-10-17 21:04:12.517930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e2b5c7d1a36'
+down_revision: Union[str, Sequence[str], None] = 'c6f1a8d4e273'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# table -> (entité publiée, départements concernés par la ligne r; NULL: tous)
+TRACKED_TABLES = {
+    "employees": ("employee", "ARRAY[r.department_id]"),
+    "departments": ("department", "ARRAY[r.id]"),
+    "positions": ("position", "NULL::uuid[]"),
+}
+
+# UPDATE: ancien et nouveau département (un employé muté quitte l'un et rejoint l'autre)
+UPDATED_DEPARTMENTS = {
+    "employees": "ARRAY(SELECT DISTINCT unnest(ARRAY[n.department_id, o.department_id]))",
+    "departments": "ARRAY[n.id]",
+    "positions": "NULL::uuid[]",
+}
+
+# version a4d8e6b2c917, recréée au downgrade
+SEQUENCE_CHANGES = """
+    CREATE FUNCTION change_events_sequence() RETURNS trigger AS $$
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM change_events WHERE seq IS NULL) THEN
+            RETURN NULL;
+        END IF;
+        PERFORM pg_advisory_xact_lock(hashtext('change_events_sequence'));
+        UPDATE change_events c SET seq = s.seq
+        FROM (
+            SELECT p.id, nextval('change_events_seq_seq') AS seq
+            FROM (SELECT id FROM change_events WHERE seq IS NULL ORDER BY id) AS p
+        ) AS s
+        WHERE c.id = s.id;
+        PERFORM pg_notify('hr_changes', '');
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+
+def record_changes(table: str, notify: bool) -> str:
+    entity, departments = TRACKED_TABLES[table]
+    # même payload dans la transaction: une seule notification, livrée au commit
+    wake = "PERFORM pg_notify('hr_changes', '');" if notify else ""
+    return f"""
+        CREATE OR REPLACE FUNCTION {table}_record_changes() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO change_events (entity, op, entity_id, department_ids)
+                SELECT '{entity}', 'created', r.id, {departments} FROM new_rows r ORDER BY r.id;
+            ELSIF TG_OP = 'UPDATE' THEN
+                INSERT INTO change_events (entity, op, entity_id, department_ids)
+                SELECT '{entity}', 'updated', n.id, {UPDATED_DEPARTMENTS[table]}
+                FROM new_rows n JOIN old_rows o ON o.id = n.id
+                WHERE n IS DISTINCT FROM o
+                ORDER BY n.id;
+            ELSE
+                INSERT INTO change_events (entity, op, entity_id, department_ids)
+                SELECT '{entity}', 'deleted', r.id, {departments} FROM old_rows r ORDER BY r.id;
+            END IF;
+            {wake}
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # plus de verrou global au commit: les écritures ne se sérialisent plus entre elles,
+    # seq est attribué après coup par ChangeFeedService.sequence (ordre des xid)
+    op.execute("DROP TRIGGER change_events_sequence ON change_events")
+    op.execute("DROP FUNCTION change_events_sequence()")
+    op.execute(
+        "ALTER TABLE change_events ADD COLUMN xid xid8 NOT NULL DEFAULT pg_current_xact_id()"
+    )
+    op.drop_index('ix_change_events_pending', table_name='change_events')
+    op.execute("CREATE INDEX ix_change_events_pending ON change_events (xid, id) WHERE seq IS NULL")
+    for table in TRACKED_TABLES:
+        op.execute(record_changes(table, notify=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TRACKED_TABLES:
+        op.execute(record_changes(table, notify=False))
+    op.drop_index('ix_change_events_pending', table_name='change_events')
+    op.execute("CREATE INDEX ix_change_events_pending ON change_events (id) WHERE seq IS NULL")
+    op.drop_column('change_events', 'xid')
+    op.execute(SEQUENCE_CHANGES)
+    op.execute(
+        "CREATE CONSTRAINT TRIGGER change_events_sequence AFTER INSERT ON change_events "
+        "DEFERRABLE INITIALLY DEFERRED "
+        "FOR EACH ROW EXECUTE FUNCTION change_events_sequence()"
+    )
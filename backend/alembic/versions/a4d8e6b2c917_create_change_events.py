@@ -0,0 +1,139 @@
+"""create change events
+
+Revision ID: a4d8e6b2c917
+Revises: f1c7d3e9b250
+Create Date: 2026-10-17 16:12:45.381204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d8e6b2c917'
+down_revision: Union[str, Sequence[str], None] = 'f1c7d3e9b250'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# table -> (entité publiée, départements concernés par la ligne r; NULL: tous)
+TRACKED_TABLES = {
+    "employees": ("employee", "ARRAY[r.department_id]"),
+    "departments": ("department", "ARRAY[r.id]"),
+    "positions": ("position", "NULL::uuid[]"),
+}
+
+# UPDATE: ancien et nouveau département (un employé muté quitte l'un et rejoint l'autre)
+UPDATED_DEPARTMENTS = {
+    "employees": "ARRAY(SELECT DISTINCT unnest(ARRAY[n.department_id, o.department_id]))",
+    "departments": "ARRAY[n.id]",
+    "positions": "NULL::uuid[]",
+}
+
+# numérotation au commit, sous verrou: seq suit l'ordre de commit, sans trou visible
+# pour un lecteur (un curseur "seq > N" ne peut pas manquer une transaction plus lente)
+SEQUENCE_CHANGES = """
+    CREATE FUNCTION change_events_sequence() RETURNS trigger AS $$
+    BEGIN
+        -- premier déclenchement de la transaction: tout est numéroté, les suivants sortent ici
+        IF NOT EXISTS (SELECT 1 FROM change_events WHERE seq IS NULL) THEN
+            RETURN NULL;
+        END IF;
+        PERFORM pg_advisory_xact_lock(hashtext('change_events_sequence'));
+        UPDATE change_events c SET seq = s.seq
+        FROM (
+            SELECT p.id, nextval('change_events_seq_seq') AS seq
+            FROM (SELECT id FROM change_events WHERE seq IS NULL ORDER BY id) AS p
+        ) AS s
+        WHERE c.id = s.id;
+        -- même payload dans la transaction: une seule notification, livrée au commit
+        PERFORM pg_notify('hr_changes', '');
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+
+def record_changes(table: str) -> str:
+    entity, departments = TRACKED_TABLES[table]
+    return f"""
+        CREATE FUNCTION {table}_record_changes() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO change_events (entity, op, entity_id, department_ids)
+                SELECT '{entity}', 'created', r.id, {departments} FROM new_rows r ORDER BY r.id;
+            ELSIF TG_OP = 'UPDATE' THEN
+                INSERT INTO change_events (entity, op, entity_id, department_ids)
+                SELECT '{entity}', 'updated', n.id, {UPDATED_DEPARTMENTS[table]}
+                FROM new_rows n JOIN old_rows o ON o.id = n.id
+                WHERE n IS DISTINCT FROM o
+                ORDER BY n.id;
+            ELSE
+                INSERT INTO change_events (entity, op, entity_id, department_ids)
+                SELECT '{entity}', 'deleted', r.id, {departments} FROM old_rows r ORDER BY r.id;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('change_events',
+    sa.Column('id', sa.BigInteger(), sa.Identity(), nullable=False),
+    sa.Column('seq', sa.BigInteger(), nullable=True),
+    sa.Column('entity', sa.String(length=20), nullable=False),
+    sa.Column('op', sa.String(length=10), nullable=False),
+    sa.Column('entity_id', sa.UUID(), nullable=False),
+    sa.Column('department_ids', postgresql.ARRAY(sa.UUID()), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute("CREATE SEQUENCE change_events_seq_seq OWNED BY change_events.seq")
+    op.create_index('ix_change_events_seq', 'change_events', ['seq'], unique=True)
+    op.create_index('ix_change_events_created_at', 'change_events', ['created_at'])
+    # lignes de la transaction en cours, pas encore numérotées
+    op.create_index(
+        'ix_change_events_pending', 'change_events', ['id'], postgresql_where=sa.text('seq IS NULL')
+    )
+
+    op.execute(SEQUENCE_CHANGES)
+    op.execute(
+        "CREATE CONSTRAINT TRIGGER change_events_sequence AFTER INSERT ON change_events "
+        "DEFERRABLE INITIALLY DEFERRED "
+        "FOR EACH ROW EXECUTE FUNCTION change_events_sequence()"
+    )
+
+    # triggers par statement avec tables de transition, comme employee_headcounts
+    for table in TRACKED_TABLES:
+        op.execute(record_changes(table))
+        op.execute(
+            f"CREATE TRIGGER {table}_changes_insert AFTER INSERT ON {table} "
+            "REFERENCING NEW TABLE AS new_rows "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION {table}_record_changes()"
+        )
+        op.execute(
+            f"CREATE TRIGGER {table}_changes_update AFTER UPDATE ON {table} "
+            "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION {table}_record_changes()"
+        )
+        op.execute(
+            f"CREATE TRIGGER {table}_changes_delete AFTER DELETE ON {table} "
+            "REFERENCING OLD TABLE AS old_rows "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION {table}_record_changes()"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TRACKED_TABLES:
+        for event in ("insert", "update", "delete"):
+            op.execute(f"DROP TRIGGER {table}_changes_{event} ON {table}")
+        op.execute(f"DROP FUNCTION {table}_record_changes()")
+    op.execute("DROP TRIGGER change_events_sequence ON change_events")
+    op.execute("DROP FUNCTION change_events_sequence()")
+    op.drop_table('change_events')
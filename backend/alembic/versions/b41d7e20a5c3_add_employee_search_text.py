@@ -0,0 +1,43 @@
+"""add employee search text
+
+Revision ID: b41d7e20a5c3
+Revises: 8c2f4b1e9d07
+Create Date: 2026-10-17 10:04:55.870312
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b41d7e20a5c3'
+down_revision: Union[str, Sequence[str], None] = '8c2f4b1e9d07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.add_column('employees', sa.Column(
+        'search_text',
+        sa.Text(),
+        sa.Computed("lower(first_name || ' ' || last_name || ' ' || email)", persisted=True),
+        nullable=True,
+    ))
+    op.create_index(
+        'ix_employees_search_text_trgm',
+        'employees',
+        ['search_text'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'search_text': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_employees_search_text_trgm', table_name='employees', postgresql_using='gin')
+    op.drop_column('employees', 'search_text')
@@ -0,0 +1,70 @@
+"""create employees archive
+
+Revision ID: c6f1a8d4e273
+Revises: a4d8e6b2c917
+Create Date: 2026-10-17 17:48:19.520376
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6f1a8d4e273'
+down_revision: Union[str, Sequence[str], None] = 'a4d8e6b2c917'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # mêmes colonnes qu'employees; email non unique (réutilisable par un nouvel employé)
+    op.create_table('employees_archive',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('first_name', sa.String(length=50), nullable=False),
+    sa.Column('last_name', sa.String(length=50), nullable=False),
+    sa.Column('email', sa.String(length=100), nullable=False),
+    sa.Column('department_id', sa.UUID(), nullable=False),
+    sa.Column('position_id', sa.UUID(), nullable=False),
+    sa.Column('photo_url', sa.String(length=500), nullable=False),
+    sa.Column('hire_date', sa.Date(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column(
+        'search_text',
+        sa.Text(),
+        sa.Computed("lower(first_name || ' ' || last_name || ' ' || email)", persisted=True),
+        nullable=True,
+    ),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['department_id'], ['departments.id'], ),
+    sa.ForeignKeyConstraint(['position_id'], ['positions.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_employees_archive_last_name_id', 'employees_archive', ['last_name', 'id'])
+    op.create_index('ix_employees_archive_department_id', 'employees_archive', ['department_id'])
+    op.create_index('ix_employees_archive_position_id', 'employees_archive', ['position_id'])
+    op.create_index(
+        'ix_employees_archive_search_text_trgm',
+        'employees_archive',
+        ['search_text'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'search_text': 'gin_trgm_ops'},
+    )
+    # candidats de l'archivage, sans parcourir les employés actifs
+    op.create_index(
+        'ix_employees_terminated_updated_at',
+        'employees',
+        ['updated_at'],
+        postgresql_where=sa.text("status = 'terminated'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_employees_terminated_updated_at', table_name='employees')
+    op.drop_table('employees_archive')
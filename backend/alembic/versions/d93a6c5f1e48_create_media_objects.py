@@ -0,0 +1,39 @@
+"""create media objects
+
+Revision ID: d93a6c5f1e48
+Revises: b41d7e20a5c3
+Create Date: 2026-10-17 11:26:09.542117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd93a6c5f1e48'
+down_revision: Union[str, Sequence[str], None] = 'b41d7e20a5c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('media_objects',
+    sa.Column('path', sa.String(length=500), nullable=False),
+    sa.Column('ref_count', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('path')
+    )
+    # photos déjà en place: une référence par employé
+    op.execute(
+        "INSERT INTO media_objects (path, ref_count) "
+        "SELECT photo_url, count(*) FROM employees WHERE photo_url <> '' GROUP BY photo_url"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('media_objects')
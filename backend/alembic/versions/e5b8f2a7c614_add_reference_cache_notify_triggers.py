@@ -0,0 +1,48 @@
+"""add reference cache notify triggers
+
+Revision ID: e5b8f2a7c614
+Revises: d93a6c5f1e48
+Create Date: 2026-10-17 13:41:27.204855
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b8f2a7c614'
+down_revision: Union[str, Sequence[str], None] = 'd93a6c5f1e48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # NOTIFY par instruction, livré au commit: invalide le cache de référence de chaque worker
+    op.execute(
+        """
+        CREATE FUNCTION notify_reference_cache() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('hr_reference_cache', TG_TABLE_NAME);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table in ("departments", "positions"):
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_notify_reference_cache
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION notify_reference_cache()
+            """
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ("departments", "positions"):
+        op.execute(f"DROP TRIGGER {table}_notify_reference_cache ON {table}")
+    op.execute("DROP FUNCTION notify_reference_cache()")
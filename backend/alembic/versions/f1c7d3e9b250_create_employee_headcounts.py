@@ -0,0 +1,94 @@
+"""create employee headcounts
+
+Revision ID: f1c7d3e9b250
+Revises: e5b8f2a7c614
+Create Date: 2026-10-17 14:58:02.117630
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c7d3e9b250'
+down_revision: Union[str, Sequence[str], None] = 'e5b8f2a7c614'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Applique un delta (+1 / -1 par ligne) agrégé par (department_id, position_id, status).
+# ORDER BY: les statements concurrents verrouillent les compteurs dans le même ordre.
+APPLY_DELTAS = """
+    INSERT INTO employee_headcounts AS h (department_id, position_id, status, headcount)
+    SELECT department_id, position_id, status, sum(delta)
+    FROM ({rows}) AS d
+    GROUP BY department_id, position_id, status
+    HAVING sum(delta) <> 0
+    ORDER BY department_id, position_id, status
+    ON CONFLICT (department_id, position_id, status)
+    DO UPDATE SET headcount = h.headcount + EXCLUDED.headcount;
+"""
+NEW_ROWS = "SELECT department_id, position_id, status, 1 AS delta FROM new_rows"
+OLD_ROWS = "SELECT department_id, position_id, status, -1 AS delta FROM old_rows"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('employee_headcounts',
+    sa.Column('department_id', sa.UUID(), nullable=False),
+    sa.Column('position_id', sa.UUID(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('headcount', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['department_id'], ['departments.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['position_id'], ['positions.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('department_id', 'position_id', 'status')
+    )
+
+    # triggers par statement avec tables de transition: un upsert par lot, pas par ligne
+    op.execute(
+        f"""
+        CREATE FUNCTION employee_headcounts_apply() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                {APPLY_DELTAS.format(rows=NEW_ROWS)}
+            ELSIF TG_OP = 'UPDATE' THEN
+                {APPLY_DELTAS.format(rows=NEW_ROWS + " UNION ALL " + OLD_ROWS)}
+            ELSE
+                {APPLY_DELTAS.format(rows=OLD_ROWS)}
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER employees_headcount_insert AFTER INSERT ON employees "
+        "REFERENCING NEW TABLE AS new_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION employee_headcounts_apply()"
+    )
+    op.execute(
+        "CREATE TRIGGER employees_headcount_update AFTER UPDATE ON employees "
+        "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION employee_headcounts_apply()"
+    )
+    op.execute(
+        "CREATE TRIGGER employees_headcount_delete AFTER DELETE ON employees "
+        "REFERENCING OLD TABLE AS old_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION employee_headcounts_apply()"
+    )
+
+    op.execute(
+        "INSERT INTO employee_headcounts (department_id, position_id, status, headcount) "
+        "SELECT department_id, position_id, status, count(*) FROM employees "
+        "GROUP BY department_id, position_id, status"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for event in ("insert", "update", "delete"):
+        op.execute(f"DROP TRIGGER employees_headcount_{event} ON employees")
+    op.execute("DROP FUNCTION employee_headcounts_apply()")
+    op.drop_table('employee_headcounts')
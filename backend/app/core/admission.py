@@ -0,0 +1,204 @@
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+
+from starlette.responses import JSONResponse
+from starlette.routing import Match
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import ADMISSION_IN_USE, ADMISSION_QUEUED, REQUESTS_SHED
+
+DEFAULT_WEIGHT = 1
+
+
+class admission_weight:
+    """
+    Poids d'une route pour le contrôle d'admission (1 par défaut, 0: jamais limitée):
+
+        @router.get("/export")
+        @admission_weight(5)
+        async def export(...): ...
+    """
+
+    def __init__(self, weight: int):
+        self.weight = weight
+
+    def __call__(self, endpoint):
+        endpoint.__admission_weight__ = self.weight
+        return endpoint
+
+
+class AdmissionController:
+    """
+    Sémaphore pondéré à file FIFO bornée: au plus `capacity` unités de travail en cours
+    (alignées sur le pool SQL), `queue_size` requêtes en attente pendant `timeout` secondes.
+    """
+
+    def __init__(self, capacity: int, queue_size: int, timeout: float):
+        self.capacity = capacity
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.in_use = 0
+        self._waiters: deque[tuple[int, asyncio.Future]] = deque()
+
+    async def acquire(self, weight: int) -> bool:
+        weight = min(weight, self.capacity)
+        if not self._waiters and self.in_use + weight <= self.capacity:
+            self.in_use += weight
+            return True
+        if len(self._waiters) >= self.queue_size:
+            return False
+
+        future = asyncio.get_running_loop().create_future()
+        entry = (weight, future)
+        self._waiters.append(entry)
+        try:
+            await asyncio.wait_for(future, self.timeout)
+            return True
+        except asyncio.TimeoutError:
+            if future.done() and not future.cancelled():
+                # accordé au moment de l'expiration: la place est prise, on la garde
+                return True
+            self._drop(entry)
+            return False
+        except asyncio.CancelledError:
+            # client parti pendant l'attente
+            if future.done() and not future.cancelled():
+                self.release(weight)
+            else:
+                self._drop(entry)
+            raise
+
+    def release(self, weight: int) -> None:
+        self.in_use -= min(weight, self.capacity)
+        self._wake()
+
+    def _drop(self, entry: tuple[int, asyncio.Future]) -> None:
+        self._waiters.remove(entry)
+        # une requête lourde en tête de file peut en avoir bloqué de plus légères
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters:
+            weight, future = self._waiters[0]
+            if future.done():
+                self._waiters.popleft()
+                continue
+            if self.in_use + weight > self.capacity:
+                break
+            self._waiters.popleft()
+            self.in_use += weight
+            future.set_result(True)
+
+
+class TokenBucketLimiter:
+    """Seau à jetons par client, en mémoire (par worker), borné à `max_clients` clients récents."""
+
+    def __init__(self, rate: float, burst: int, max_clients: int = 10_000):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def take(self, key: str) -> float:
+        """0 si la requête passe, sinon délai (secondes) avant le prochain jeton."""
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (float(self.burst), now))
+        tokens = min(float(self.burst), tokens + (now - updated) * self.rate)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / self.rate
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_clients:
+            self._buckets.popitem(last=False)
+        return wait
+
+
+def _matched_endpoint(routes, scope: Scope):
+    for route in routes:
+        match, _ = route.matches(scope)
+        if match != Match.FULL:
+            continue
+        # include_router: FastAPI garde le routeur d'origine derrière un objet de correspondance
+        included = getattr(route, "original_router", None)
+        if included is not None:
+            return _matched_endpoint(included.routes, scope)
+        # Mount (/media): fichiers statiques, pas d'endpoint
+        return getattr(route, "endpoint", None)
+    return None
+
+
+def route_weight(scope: Scope) -> int:
+    # le routage n'a pas encore eu lieu: même correspondance que le routeur
+    endpoint = _matched_endpoint(scope["app"].router.routes, scope)
+    if endpoint is None:
+        return 0
+    return getattr(endpoint, "__admission_weight__", DEFAULT_WEIGHT)
+
+
+class AdmissionMiddleware:
+    """
+    Limite par client (429) puis admission pondérée (503) avant d'atteindre le pool SQL:
+    au-delà de la capacité, les requêtes attendent dans une file bornée au lieu de
+    s'empiler sur le checkout du pool jusqu'au timeout.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        capacity = settings.ADMISSION_CAPACITY or settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+        self.controller = AdmissionController(
+            capacity, settings.ADMISSION_QUEUE_SIZE, settings.ADMISSION_QUEUE_TIMEOUT
+        )
+        self.limiter = (
+            TokenBucketLimiter(settings.RATE_LIMIT_PER_SECOND, settings.RATE_LIMIT_BURST)
+            if settings.RATE_LIMIT_PER_SECOND > 0
+            else None
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        weight = route_weight(scope)
+        if weight == 0:
+            await self.app(scope, receive, send)
+            return
+
+        if self.limiter is not None:
+            client = scope.get("client")
+            wait = self.limiter.take(client[0] if client else "unknown")
+            if wait > 0:
+                REQUESTS_SHED.labels("rate_limited").inc()
+                response = JSONResponse(
+                    {"detail": "Too many requests"},
+                    status_code=429,
+                    headers={"Retry-After": str(math.ceil(wait))},
+                )
+                await response(scope, receive, send)
+                return
+
+        ADMISSION_QUEUED.inc()
+        try:
+            admitted = await self.controller.acquire(weight)
+        finally:
+            ADMISSION_QUEUED.dec()
+        if not admitted:
+            REQUESTS_SHED.labels("overloaded").inc()
+            response = JSONResponse(
+                {"detail": "Server busy, retry later"},
+                status_code=503,
+                headers={"Retry-After": str(math.ceil(settings.ADMISSION_QUEUE_TIMEOUT))},
+            )
+            await response(scope, receive, send)
+            return
+
+        ADMISSION_IN_USE.inc(weight)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            ADMISSION_IN_USE.dec(weight)
+            self.controller.release(weight)
@@ -0,0 +1,91 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+from app.core.config import settings
+
+# alimenté par les triggers notify_reference_cache sur departments / positions
+INVALIDATION_CHANNEL = "hr_reference_cache"
+
+_MISSING = object()
+
+
+class ReferenceCache:
+    """
+    Cache LRU borné avec TTL pour les tables de référence (départements, postes).
+    Chaque invalidation incrémente la version: un chargement commencé avant
+    l'invalidation n'est jamais mis en cache.
+    """
+
+    def __init__(self, name: str, maxsize: int | None = None, ttl: float | None = None):
+        self.name = name
+        # None: REFERENCE_CACHE_*, lus au premier usage (pas à l'import)
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self.version = 0
+        self._entries: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize if self._maxsize is not None else settings.REFERENCE_CACHE_MAXSIZE
+
+    @property
+    def ttl(self) -> float:
+        return self._ttl if self._ttl is not None else settings.REFERENCE_CACHE_TTL
+
+    def get(self, key: Any) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return _MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Any, value: Any, version: int) -> None:
+        with self._lock:
+            if version != self.version:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def load(self, key: Any, loader: Callable[[], Any], store: bool = True) -> Any:
+        value = self.get(key)
+        if value is not _MISSING:
+            return value
+        version = self.version
+        value = loader()
+        if store:
+            self.set(key, value, version)
+        return value
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+
+
+department_cache = ReferenceCache("departments")
+position_cache = ReferenceCache("positions")
+
+CACHES = {cache.name: cache for cache in (department_cache, position_cache)}
+
+
+def on_invalidation(payload: str | None) -> None:
+    """Handler du canal INVALIDATION_CHANNEL (voir app.db.notifications.listen)."""
+    if payload is None:
+        # (re)connexion: des notifications ont pu être perdues pendant la déconnexion
+        for cache in CACHES.values():
+            cache.invalidate()
+        return
+    cache = CACHES.get(payload)
+    if cache is not None:
+        cache.invalidate()
@@ -0,0 +1,202 @@
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optionnel: br non proposé
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optionnel: zstd non proposé
+    zstandard = None
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/problem+json",
+    "application/javascript",
+    "image/svg+xml",
+    "text/",
+)
+# flux SSE: chaque événement doit partir tel quel, sans passer par un compresseur
+UNCOMPRESSED_TYPES = ("text/event-stream",)
+# déjà compressés (webp, jpeg, png...): servis tels quels
+SKIP_PATH_PREFIXES = ("/media",)
+
+
+class _Gzip:
+    def __init__(self):
+        self._obj = zlib.compressobj(6, zlib.DEFLATED, 31)
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._obj.compress(chunk) + self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._obj.flush()
+
+
+class _Brotli:
+    def __init__(self):
+        self._obj = brotli.Compressor(quality=4)
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._obj.process(chunk) + self._obj.flush()
+
+    def finish(self) -> bytes:
+        return self._obj.finish()
+
+
+class _Zstd:
+    def __init__(self):
+        self._obj = zstandard.ZstdCompressor(level=3).compressobj()
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._obj.compress(chunk) + self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._obj.flush()
+
+
+# préférence serveur, à qualité égale côté client
+ENCODERS = {
+    name: encoder
+    for name, encoder, available in (
+        ("zstd", _Zstd, zstandard is not None),
+        ("br", _Brotli, brotli is not None),
+        ("gzip", _Gzip, True),
+    )
+    if available
+}
+
+
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """Meilleur codage disponible selon Accept-Encoding (q-values, "*", q=0); None: identité."""
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[name] = q
+
+    best, best_q = None, 0.0
+    for name in ENCODERS:
+        q = weights.get(name, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+def _weaken_etag(headers: MutableHeaders) -> None:
+    # représentation différente de l'originale: l'ETag fort devient faible
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["ETag"] = f"W/{etag}"
+
+
+def _validated_weak(request_headers: Headers, etag: str | None) -> bool:
+    """Le client a reçu l'ETag affaibli (réponse compressée) et c'est celui qu'il revalide."""
+    if not etag or etag.startswith("W/"):
+        return False
+    if_none_match = request_headers.get("if-none-match", "")
+    return f"W/{etag}" in [tag.strip() for tag in if_none_match.split(",")]
+
+
+class CompressionMiddleware:
+    """
+    Compression négociée (zstd, br, gzip) des réponses textuelles au-delà de `minimum_size`.
+    Réponses en flux (export) compressées morceau par morceau, sans mise en mémoire.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(SKIP_PATH_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        encoding = negotiate_encoding(request_headers.get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Message | None = None
+        compressor = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start, compressor, passthrough
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                if message["status"] == 304 and _validated_weak(request_headers, headers.get("etag")):
+                    # même validateur que la réponse compressée qu'il confirme; une réponse
+                    # envoyée non compressée (trop petite) garde son ETag fort
+                    _weaken_etag(MutableHeaders(raw=message["headers"]))
+                passthrough = (
+                    message["status"] in (204, 206, 304)
+                    or "content-encoding" in headers
+                    or not content_type.startswith(COMPRESSIBLE_TYPES)
+                    or content_type.startswith(UNCOMPRESSED_TYPES)
+                )
+                if passthrough:
+                    await send(message)
+                else:
+                    # en attente du premier morceau: taille connue seulement là
+                    start = message
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if start is None:
+                data = compressor.compress(body) if body else b""
+                if not more_body:
+                    data += compressor.finish()
+                if data or not more_body:
+                    await send({"type": "http.response.body", "body": data, "more_body": more_body})
+                return
+
+            response_start, start = start, None
+            headers = MutableHeaders(raw=response_start["headers"])
+            headers.add_vary_header("Accept-Encoding")
+            if not more_body and len(body) < self.minimum_size:
+                passthrough = True
+                await send(response_start)
+                await send(message)
+                return
+
+            compressor = ENCODERS[encoding]()
+            data = compressor.compress(body)
+            headers["Content-Encoding"] = encoding
+            _weaken_etag(headers)
+            if more_body:
+                # flux: longueur inconnue, transfert chunked
+                if "content-length" in headers:
+                    del headers["Content-Length"]
+            else:
+                data += compressor.finish()
+                headers["Content-Length"] = str(len(data))
+            await send(response_start)
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
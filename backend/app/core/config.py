@@ -1,3 +1,6 @@
+from functools import lru_cache
+from typing import Literal, cast
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -6,7 +9,72 @@ class Settings(BaseSettings):
     ENV: str = "dev"
     DATABASE_URL: str
     TEST_DATABASE_URL: str
+    # défaut: DATABASE_URL avec le driver asyncpg
+    ASYNC_DATABASE_URL: str | None = None
+    # pool SQL par engine et par worker
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    # admission: unités de travail simultanées par worker (défaut: taille du pool + overflow),
+    # file d'attente bornée au-delà, 503 + Retry-After quand elle est pleine ou trop lente
+    ADMISSION_CAPACITY: int | None = None
+    ADMISSION_QUEUE_SIZE: int = 64
+    ADMISSION_QUEUE_TIMEOUT: float = 10
+    # limite par client (jetons par seconde, rafale), 0: désactivée
+    RATE_LIMIT_PER_SECOND: float = 0
+    RATE_LIMIT_BURST: int = 50
+    # réplicas en lecture seule (driver asyncpg par défaut), ex. '["postgresql://ro1/hr"]'
+    READ_REPLICA_URLS: list[str] = []
+    # après une écriture, les lectures du client restent sur le primaire (secondes)
+    READ_YOUR_WRITES_WINDOW: float = 5
+    # réplica injoignable: écartée pendant ce délai (secondes)
+    REPLICA_RETRY_AFTER: float = 30
+    # retard de réplication vérifié toutes les REPLICA_CHECK_INTERVAL secondes; au-delà de
+    # REPLICA_MAX_LAG la réplica est écartée (à garder sous READ_YOUR_WRITES_WINDOW)
+    REPLICA_CHECK_INTERVAL: float = 2
+    REPLICA_MAX_LAG: float = 5
+    # process pool de redimensionnement des photos
+    IMAGE_WORKERS: int = 2
+    # cache mémoire des départements / postes (secondes, nombre d'entrées)
+    REFERENCE_CACHE_TTL: float = 300
+    REFERENCE_CACHE_MAXSIZE: int = 1024
+    # budget SQL par route: "raise" en tests, "log" en staging, "off" sinon
+    QUERY_BUDGET_MODE: Literal["off", "log", "raise"] = "log"
+    # "raise": tout chargement paresseux d'une relation lève une erreur
+    RELATIONSHIP_LOADING: Literal["select", "raise"] = "select"
+    # réponses plus petites envoyées sans compression (octets)
+    COMPRESSION_MIN_SIZE: int = 1024
+    # flux /events: journal conservé (jours), keep-alive (secondes),
+    # événements en retard par client avant déconnexion, reprise maximale via Last-Event-ID
+    CHANGE_EVENTS_RETENTION_DAYS: int = 7
+    EVENTS_KEEPALIVE: float = 15
+    EVENTS_QUEUE_SIZE: int = 1000
+    EVENTS_REPLAY_LIMIT: int = 1000
+    # archivage (app.jobs.archive_employees): employés terminés depuis N jours, par lots
+    ARCHIVE_AFTER_DAYS: int = 365
+    ARCHIVE_BATCH_SIZE: int = 1000
+
+    # démarrage: /ready répond 503 tant que le préchauffage n'est pas terminé,
+    # puis tant que la base ne répond pas dans ce délai (secondes)
+    READY_DB_TIMEOUT: float = 2
+    LOG_LEVEL: str = "INFO"
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
-settings = Settings()
+
+@lru_cache
+def get_settings() -> Settings:
+    """Lue dans l'environnement (.env) au premier appel, pas à l'import."""
+    return Settings()
+
+
+class _LazySettings:
+    """`settings.X` délègue à get_settings(): importer un module ne lit pas l'environnement."""
+
+    def __getattr__(self, name: str):
+        return getattr(get_settings(), name)
+
+    def __setattr__(self, name: str, value) -> None:
+        setattr(get_settings(), name, value)
+
+
+settings = cast(Settings, _LazySettings())
@@ -0,0 +1,205 @@
+import os
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from fastapi import Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client import REGISTRY
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being served",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+REQUEST_SQL_STATEMENTS = Histogram(
+    "http_request_sql_statements",
+    "SQL statements executed per HTTP request",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100),
+)
+REQUEST_SQL_SECONDS = Histogram(
+    "http_request_sql_seconds",
+    "Time spent in SQL per HTTP request",
+    ["method", "route"],
+)
+REQUESTS_SHED = Counter(
+    "http_requests_shed_total",
+    "Requests refused before reaching the application",
+    ["reason"],
+)
+ADMISSION_IN_USE = Gauge(
+    "admission_in_use",
+    "Admission units held by requests in progress",
+    multiprocess_mode="livesum",
+)
+ADMISSION_QUEUED = Gauge(
+    "admission_queued",
+    "Requests waiting for admission",
+    multiprocess_mode="livesum",
+)
+STARTUP_SECONDS = Gauge(
+    "app_startup_seconds",
+    "Time from app creation to readiness (warm-up included)",
+    multiprocess_mode="liveall",
+)
+SQL_STATEMENTS = Counter(
+    "sql_statements_total",
+    "SQL statements executed, in or out of a request",
+    ["engine"],
+)
+POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Connections opened beyond pool_size",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pool connection (including connect)",
+    ["engine"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+
+@dataclass
+class QueryStats:
+    statements: int = 0
+    seconds: float = 0.0
+
+
+# stats SQL de la requête HTTP courante (propagé dans les greenlets de run_sync)
+current_query_stats: ContextVar[QueryStats | None] = ContextVar("current_query_stats", default=None)
+
+
+class _TimedCheckoutMixin:
+    metrics_label = "sync"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_CHECKOUT_WAIT.labels(self.metrics_label).observe(time.perf_counter() - started)
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    metrics_label = "sync"
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    metrics_label = "async"
+
+
+def instrument_engine(engine: Engine, label: str) -> None:
+    """Compte les requêtes SQL (globales et par requête HTTP) et suit l'état du pool."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        SQL_STATEMENTS.labels(label).inc()
+        stats = current_query_stats.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.seconds += elapsed
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        started = context.connection.info.get("query_started") if context.connection is not None else None
+        if started:
+            started.pop()
+
+    pool = engine.pool
+
+    @event.listens_for(engine, "checkout")
+    def _checkout(*args):
+        POOL_CHECKED_OUT.labels(label).set(pool.checkedout())
+        POOL_OVERFLOW.labels(label).set(max(pool.overflow(), 0))
+
+    @event.listens_for(engine, "checkin")
+    def _checkin(*args):
+        # émis avant le retour effectif dans le pool
+        POOL_CHECKED_OUT.labels(label).set(max(pool.checkedout() - 1, 0))
+        POOL_OVERFLOW.labels(label).set(max(pool.overflow(), 0))
+
+
+class MetricsMiddleware:
+    """Middleware ASGI: latence par route (template), requêtes en cours, SQL par requête."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        root_path = scope.get("root_path", "")
+        status = 500
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        REQUESTS_IN_PROGRESS.labels(method).inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            REQUESTS_IN_PROGRESS.labels(method).dec()
+            current_query_stats.reset(token)
+
+            # template ("/employees/{employee_id}") et non chemin réel: cardinalité bornée
+            route = scope.get("route")
+            route_label = getattr(route, "path", None)
+            if route_label is None:
+                # Mount (/media): Starlette ne pose que root_path
+                mounted = scope.get("root_path", "")
+                route_label = mounted.removeprefix(root_path) if mounted != root_path else "unmatched"
+            REQUEST_LATENCY.labels(method, route_label, str(status)).observe(elapsed)
+            REQUEST_SQL_STATEMENTS.labels(method, route_label).observe(stats.statements)
+            REQUEST_SQL_SECONDS.labels(method, route_label).observe(stats.seconds)
+
+
+def metrics_response() -> Response:
+    # plusieurs workers uvicorn/gunicorn: agrégation via PROMETHEUS_MULTIPROC_DIR
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,91 @@
+import logging
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import QueryStats, current_query_stats
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(RuntimeError):
+    pass
+
+
+def report_overrun(label: str, statements: int, budget: int) -> None:
+    message = f"{label} executed {statements} SQL statements (budget: {budget})"
+    if settings.QUERY_BUDGET_MODE == "raise":
+        raise QueryBudgetExceeded(message)
+    if settings.QUERY_BUDGET_MODE == "log":
+        logger.warning(message)
+
+
+class query_budget:
+    """Nombre maximal de requêtes SQL, pour une route ou un bloc de code.
+
+    En décorateur, déclare le budget d'une route (vérifié par QueryBudgetMiddleware,
+    corps d'une StreamingResponse compris); en context manager, vérifie le bloc:
+
+        @router.get("/{id}")
+        @query_budget(2)
+        async def get_thing(...): ...
+
+        with query_budget(3, "import batch"):
+            ...
+    """
+
+    def __init__(self, max_statements: int, label: str | None = None):
+        self.max_statements = max_statements
+        self.label = label
+
+    def __call__(self, endpoint):
+        endpoint.__query_budget__ = self.max_statements
+        return endpoint
+
+    def __enter__(self) -> QueryStats:
+        self._stats = current_query_stats.get()
+        self._token = None
+        if self._stats is None:
+            # hors requête HTTP (scripts, tests de service): compteur dédié
+            self._stats = QueryStats()
+            self._token = current_query_stats.set(self._stats)
+        self._start = self._stats.statements
+        return self._stats
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self._token is not None:
+            current_query_stats.reset(self._token)
+        used = self._stats.statements - self._start
+        if exc_type is None and used > self.max_statements:
+            report_overrun(self.label or "block", used, self.max_statements)
+
+
+class QueryBudgetMiddleware:
+    """Compare le nombre de requêtes SQL de chaque requête HTTP au budget de sa route."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or settings.QUERY_BUDGET_MODE == "off":
+            await self.app(scope, receive, send)
+            return
+
+        # partage le compteur posé par MetricsMiddleware s'il est présent
+        stats = current_query_stats.get()
+        token = None
+        if stats is None:
+            stats = QueryStats()
+            token = current_query_stats.set(stats)
+        start = stats.statements
+        try:
+            # StreamingResponse itère son corps dans cet appel: requêtes du flux comptées
+            await self.app(scope, receive, send)
+        finally:
+            if token is not None:
+                current_query_stats.reset(token)
+
+        route = scope.get("route")
+        budget = getattr(getattr(route, "endpoint", None), "__query_budget__", None)
+        if budget is not None and stats.statements - start > budget:
+            report_overrun(f"{scope['method']} {route.path}", stats.statements - start, budget)
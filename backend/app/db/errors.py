@@ -0,0 +1,12 @@
+from sqlalchemy.exc import IntegrityError
+
+
+def constraint_name(error: IntegrityError) -> str | None:
+    """Nom de la contrainte Postgres violée, quel que soit le driver."""
+    orig = error.orig
+    # psycopg / psycopg2
+    diag = getattr(orig, "diag", None)
+    if diag is not None:
+        return diag.constraint_name
+    # asyncpg: l'exception d'origine est chaînée par l'adaptateur SQLAlchemy
+    return getattr(orig.__cause__, "constraint_name", None)
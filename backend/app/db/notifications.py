@@ -0,0 +1,46 @@
+import asyncio
+import logging
+from collections.abc import Callable
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+logger = logging.getLogger(__name__)
+
+# payload reçu; None à chaque (re)connexion: des notifications ont pu être perdues
+NotificationHandler = Callable[[str | None], None]
+
+
+async def listen(database_url: str, handlers: dict[str, NotificationHandler], retry_delay: float = 5.0) -> None:
+    """Tâche de fond par worker: une connexion LISTEN pour tous les canaux, reconnexion automatique."""
+    url = make_url(database_url)
+    if url.get_backend_name() != "postgresql":
+        return
+    dsn = url.set(drivername="postgresql").render_as_string(hide_password=False)
+
+    while True:
+        try:
+            connection = await asyncpg.connect(dsn)
+        except (OSError, asyncpg.PostgresError) as e:
+            logger.warning("Notification listener cannot connect: %s", e)
+            await asyncio.sleep(retry_delay)
+            continue
+
+        closed = asyncio.Event()
+        connection.add_termination_listener(lambda _: closed.set())
+        try:
+            for channel, handler in handlers.items():
+                await connection.add_listener(
+                    channel, lambda _conn, _pid, _channel, payload, handler=handler: handler(payload)
+                )
+            for handler in handlers.values():
+                handler(None)
+            await closed.wait()
+            logger.warning("Notification listener disconnected, reconnecting")
+        except Exception:
+            # LISTEN refusé, connexion coupée pendant l'abonnement...: on repart de zéro
+            logger.exception("Notification listener failed, reconnecting")
+        finally:
+            if not connection.is_closed():
+                await connection.close()
+        await asyncio.sleep(retry_delay)
@@ -0,0 +1,191 @@
+import asyncio
+import itertools
+import logging
+import math
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+
+from fastapi import Request
+from sqlalchemy import event, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import InstrumentedAsyncQueuePool, instrument_engine
+from app.db.session import AsyncSessionLocal, to_async_url
+
+logger = logging.getLogger(__name__)
+
+# instant (epoch) du dernier commit du client, renvoyé par cookie ou en-tête
+LAST_WRITE_COOKIE = "hr_last_write"
+LAST_WRITE_HEADER = "X-Last-Write"
+
+# créés au premier usage, comme les engines du primaire (voir app.db.session)
+_replica_engines: list[AsyncEngine] | None = None
+# réplica en échec: écartée jusqu'à cet instant (monotonic)
+_down_until: list[float] = []
+_round_robin = itertools.count()
+
+# retard de rejeu (secondes); 0 si tout le WAL reçu est rejoué (primaire inactif), NULL hors recovery
+REPLICA_LAG = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+# commit de la requête HTTP courante (dict mutable: visible depuis les greenlets de run_sync)
+_request_commit: ContextVar[dict | None] = ContextVar("request_commit", default=None)
+
+
+def get_replica_engines() -> list[AsyncEngine]:
+    global _replica_engines, _down_until
+    if _replica_engines is None:
+        _replica_engines = [
+            create_async_engine(
+                to_async_url(url),
+                pool_pre_ping=True,
+                pool_size=settings.DB_POOL_SIZE,
+                max_overflow=settings.DB_MAX_OVERFLOW,
+                poolclass=InstrumentedAsyncQueuePool,
+            )
+            for url in settings.READ_REPLICA_URLS
+        ]
+        for index, engine in enumerate(_replica_engines):
+            instrument_engine(engine.sync_engine, f"replica{index}")
+        _down_until = [0.0] * len(_replica_engines)
+    return _replica_engines
+
+
+async def dispose_replica_engines() -> None:
+    global _replica_engines
+    if _replica_engines is not None:
+        await asyncio.gather(*(engine.dispose() for engine in _replica_engines))
+        _replica_engines = None
+
+
+def is_replica(db: Session) -> bool:
+    return db.info.get("replica", False)
+
+
+@event.listens_for(Session, "after_commit")
+def _record_commit(session: Session) -> None:
+    marker = _request_commit.get()
+    if marker is not None and not is_replica(session):
+        marker["committed_at"] = time.time()
+
+
+def pinned_to_primary(request: Request) -> bool:
+    """Le client a écrit il y a moins de READ_YOUR_WRITES_WINDOW: ses lectures restent sur le primaire."""
+    raw = request.headers.get(LAST_WRITE_HEADER) or request.cookies.get(LAST_WRITE_COOKIE)
+    if not raw:
+        return False
+    try:
+        committed_at = float(raw)
+    except ValueError:
+        return False
+    return time.time() - committed_at < settings.READ_YOUR_WRITES_WINDOW
+
+
+def _mark_down(index: int, reason: str) -> None:
+    if _down_until[index] <= time.monotonic():
+        logger.warning("Read replica %d %s, reading from primary", index, reason)
+    _down_until[index] = time.monotonic() + settings.REPLICA_RETRY_AFTER
+
+
+async def replica_lag(engine: AsyncEngine) -> float:
+    async with engine.connect() as connection:
+        return float(await connection.scalar(REPLICA_LAG) or 0)
+
+
+async def check_replicas() -> None:
+    """Écarte les réplicas injoignables ou trop en retard, réintègre celles qui ont rattrapé."""
+    for index, engine in enumerate(get_replica_engines()):
+        try:
+            lag = await asyncio.wait_for(replica_lag(engine), settings.REPLICA_CHECK_INTERVAL)
+        except (DBAPIError, OSError, asyncio.TimeoutError) as e:
+            _mark_down(index, f"unavailable ({e!r})")
+            continue
+        if lag > settings.REPLICA_MAX_LAG:
+            _mark_down(index, f"lagging {lag:.1f}s behind")
+        elif _down_until[index]:
+            if _down_until[index] > time.monotonic():
+                logger.info("Read replica %d back in rotation", index)
+            _down_until[index] = 0.0
+
+
+async def monitor_replicas() -> None:
+    """Tâche de fond par worker: le retard d'une réplica évolue après le checkout de connexion."""
+    while True:
+        await check_replicas()
+        await asyncio.sleep(settings.REPLICA_CHECK_INTERVAL)
+
+
+def _pick_replica() -> int | None:
+    now = time.monotonic()
+    healthy = [i for i, until in enumerate(_down_until) if until <= now]
+    if not healthy:
+        return None
+    return healthy[next(_round_robin) % len(healthy)]
+
+
+@asynccontextmanager
+async def read_session(pinned: bool = False) -> AsyncIterator[AsyncSession]:
+    """Session de lecture: une réplica saine, sinon (aucune, client épinglé, panne) le primaire."""
+    engines = get_replica_engines()
+    index = None if pinned else _pick_replica()
+    db = None
+    if index is not None:
+        db = AsyncSessionLocal(bind=engines[index], info={"replica": True})
+        try:
+            # checkout + pre_ping: une réplica injoignable échoue ici, pas au milieu de la route
+            await db.connection()
+        except (DBAPIError, OSError) as e:
+            await db.close()
+            db = None
+            _mark_down(index, f"unavailable ({e!r})")
+    if db is None:
+        db = AsyncSessionLocal()
+
+    async with db:
+        yield db
+
+
+async def get_read_db(request: Request):
+    async with read_session(pinned_to_primary(request)) as db:
+        yield db
+
+
+class ReadYourWritesMiddleware:
+    """Après un commit sur le primaire, renvoie son instant au client (cookie + en-tête)."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not get_replica_engines():
+            await self.app(scope, receive, send)
+            return
+
+        marker: dict = {}
+        token = _request_commit.set(marker)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and "committed_at" in marker:
+                committed_at = f"{marker['committed_at']:.3f}"
+                headers = MutableHeaders(raw=message["headers"])
+                headers[LAST_WRITE_HEADER] = committed_at
+                headers.append(
+                    "Set-Cookie",
+                    f"{LAST_WRITE_COOKIE}={committed_at}; Max-Age={math.ceil(settings.READ_YOUR_WRITES_WINDOW)}; "
+                    "Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_commit.reset(token)
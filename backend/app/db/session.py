@@ -1,11 +1,97 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import ORMExecuteState, Session, raiseload, sessionmaker
 
 from app.core.config import settings
+from app.core.metrics import InstrumentedAsyncQueuePool, InstrumentedQueuePool, instrument_engine
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+# engines créés au premier usage (settings lus à ce moment, pas à l'import),
+# fermés par dispose_engines à l'arrêt de l'application
+_engine: Engine | None = None
+_async_engine: AsyncEngine | None = None
+
+# expire_on_commit=False: les objets restent lisibles (sérialisation de la réponse, RETURNING)
+_sessions = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False)
+_async_sessions = async_sessionmaker(class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+
+def to_async_url(url: str) -> str:
+    parsed = make_url(url)
+    if parsed.drivername == "postgresql+asyncpg":
+        return url
+    # même base, driver asyncpg
+    return parsed.set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+
+
+def get_async_database_url() -> str:
+    return settings.ASYNC_DATABASE_URL or to_async_url(settings.DATABASE_URL)
+
+
+def get_engine() -> Engine:
+    global _engine
+    if _engine is None:
+        _engine = create_engine(
+            settings.DATABASE_URL,
+            pool_pre_ping=True,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            poolclass=InstrumentedQueuePool,
+        )
+        instrument_engine(_engine, "sync")
+    return _engine
+
+
+def get_async_engine() -> AsyncEngine:
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_engine(
+            get_async_database_url(),
+            pool_pre_ping=True,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            poolclass=InstrumentedAsyncQueuePool,
+        )
+        instrument_engine(_async_engine.sync_engine, "async")
+    return _async_engine
+
+
+async def dispose_engines() -> None:
+    """Arrêt du worker: connexions rendues au serveur; un usage ultérieur recrée les engines."""
+    global _engine, _async_engine
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+    if _engine is not None:
+        _engine.dispose()
+        _engine = None
+
+
+def SessionLocal(**kwargs) -> Session:
+    """Session sync sur le primaire (jobs, scripts)."""
+    if "bind" not in kwargs:
+        kwargs["bind"] = get_engine()
+    return _sessions(**kwargs)
+
+
+def AsyncSessionLocal(**kwargs) -> AsyncSession:
+    """Session async sur le primaire, sauf bind explicite (réplica)."""
+    if "bind" not in kwargs:
+        kwargs["bind"] = get_async_engine()
+    return _async_sessions(**kwargs)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _raise_on_lazy_load(state: ORMExecuteState) -> None:
+    # RELATIONSHIP_LOADING=raise: une relation non chargée explicitement lève à l'accès
+    if (
+        settings.RELATIONSHIP_LOADING == "raise"
+        and state.is_select
+        and not state.is_column_load
+        and not state.is_relationship_load
+    ):
+        state.statement = state.statement.options(raiseload("*"))
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 def get_db():
     db = SessionLocal()
@@ -13,3 +99,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,49 @@
+"""
+Archive les employés terminés depuis ARCHIVE_AFTER_DAYS: employees -> employees_archive,
+par lots de ARCHIVE_BATCH_SIZE (une transaction chacun). À planifier (cron, une fois par nuit).
+
+    python -m app.jobs.archive_employees --older-than-days 365 --batch-size 1000
+"""
+import argparse
+import time
+from datetime import timedelta
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.employees import EmployeeService
+
+
+def archive_employees(*, older_than_days: int, batch_size: int, max_batches: int | None = None) -> dict:
+    started = time.perf_counter()
+    archived = batches = 0
+    with SessionLocal() as db:
+        # lots courts: verrous et WAL bornés, les requêtes de l'API passent entre deux lots
+        while max_batches is None or batches < max_batches:
+            moved = EmployeeService.archive_batch(db, timedelta(days=older_than_days), batch_size)
+            archived += moved
+            batches += 1
+            if moved < batch_size:
+                break
+
+    return {
+        "archived": archived,
+        "batches": batches,
+        "seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Move long-terminated employees to the archive table.")
+    parser.add_argument("--older-than-days", type=int, default=settings.ARCHIVE_AFTER_DAYS)
+    parser.add_argument("--batch-size", type=int, default=settings.ARCHIVE_BATCH_SIZE)
+    parser.add_argument("--max-batches", type=int, default=None, help="stop after this many batches")
+    args = parser.parse_args()
+    print(archive_employees(
+        older_than_days=args.older_than_days,
+        batch_size=args.batch_size,
+        max_batches=args.max_batches,
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Génère les variantes WebP manquantes des photos existantes (photos antérieures aux variantes,
+fichiers restaurés depuis une sauvegarde). Idempotent: relançable sans effet sur les photos à jour.
+
+    python -m app.jobs.photo_variants --workers 4
+"""
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from sqlalchemy import select, union
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.employee import Employee
+from app.models.employee_archive import ArchivedEmployee
+from app.utils.media import media_path, missing_variants, render_photo_variants
+
+
+def backfill_photo_variants(*, workers: int) -> dict:
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        urls = db.scalars(
+            union(
+                select(Employee.photo_url).where(Employee.photo_url.startswith("/media/")),
+                select(ArchivedEmployee.photo_url).where(ArchivedEmployee.photo_url.startswith("/media/")),
+            )
+        ).all()
+
+    paths = [path for path in map(media_path, urls) if path.exists() and missing_variants(path)]
+    failed = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {path: pool.submit(render_photo_variants, str(path)) for path in paths}
+        for path, future in futures.items():
+            try:
+                future.result()
+            except Exception:
+                # image illisible: l'original reste affiché
+                failed.append(str(path))
+
+    return {
+        "photos": len(urls),
+        "rendered": len(paths) - len(failed),
+        "failed": failed,
+        "seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Render missing WebP variants of stored employee photos.")
+    parser.add_argument("--workers", type=int, default=settings.IMAGE_WORKERS)
+    args = parser.parse_args()
+    print(backfill_photo_variants(workers=args.workers))
+
+
+if __name__ == "__main__":
+    main()
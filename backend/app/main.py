@@ -1,20 +1,109 @@
-from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 
+from app.core.admission import AdmissionMiddleware, admission_weight
+from app.core.cache import INVALIDATION_CHANNEL, on_invalidation
+from app.core.compression import CompressionMiddleware
+from app.core.config import settings
+from app.core.metrics import MetricsMiddleware, metrics_response
+from app.core.query_budget import QueryBudgetMiddleware
+from app.db.notifications import listen
+from app.db.replicas import ReadYourWritesMiddleware, dispose_replica_engines, get_replica_engines, monitor_replicas
+from app.db.session import dispose_engines, get_async_database_url
 from app.routers.departments import router as department_router
 from app.routers.positions import router as position_router
 from app.routers.employees import router as employee_router
+from app.routers.events import router as event_router
+from app.routers.stats import router as stats_router
+from app.services.change_feed import CHANGES_CHANNEL, change_feed
+from app.services.warmup import database_ready, warm_up_until_ready
+from app.utils.media import shutdown_image_pool
+from app.utils.static_files import ImmutableStaticFiles
 
-app = FastAPI(title="HR Lite API", version="1.0.0")
+logger = logging.getLogger(__name__)
 
-# Folder to stock static files
-app.mount("/media", StaticFiles(directory="media"), name="media")
 
+def log_failure(task: asyncio.Task) -> None:
+    """Done-callback des tâches de fond: une tâche morte est loguée, pas silencieuse."""
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Background task %s failed", task.get_name(), exc_info=task.exception())
 
-app.include_router(department_router)
-app.include_router(position_router)
-app.include_router(employee_router)
 
-@app.get("/health")
-def health():
-    return {"status": "ok"}
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # invalidation du cache de référence et journal des changements, émis par les autres workers
+    tasks = [
+        asyncio.create_task(
+            listen(
+                get_async_database_url(),
+                {INVALIDATION_CHANNEL: on_invalidation, CHANGES_CHANNEL: change_feed.notify},
+            ),
+            name="notifications",
+        ),
+        asyncio.create_task(change_feed.run(), name="change feed"),
+        # préchauffage en tâche de fond: /health répond déjà, /ready attend la fin
+        asyncio.create_task(warm_up_until_ready(app.state), name="warm-up"),
+    ]
+    if get_replica_engines():
+        tasks.append(asyncio.create_task(monitor_replicas(), name="replica monitor"))
+    for task in tasks:
+        task.add_done_callback(log_failure)
+    yield
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    # connexions rendues au serveur et processus d'images arrêtés avant la sortie du worker
+    await asyncio.gather(dispose_engines(), dispose_replica_engines())
+    shutdown_image_pool()
+
+
+# pas d'application créée à l'import: uvicorn app.main:create_app --factory
+def create_app() -> FastAPI:
+    logging.basicConfig(level=settings.LOG_LEVEL)
+
+    app = FastAPI(title="HR Lite API", version="1.0.0", lifespan=lifespan)
+    app.state.started_at = time.perf_counter()
+    app.state.ready = False
+
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE)
+    app.add_middleware(ReadYourWritesMiddleware)
+    # MetricsMiddleware en dernier: le plus externe, son compteur SQL sert aussi aux budgets
+    app.add_middleware(QueryBudgetMiddleware)
+    app.add_middleware(AdmissionMiddleware)
+    app.add_middleware(MetricsMiddleware)
+
+    # Folder to stock static files
+    app.mount("/media", ImmutableStaticFiles(directory="media"), name="media")
+
+    app.include_router(department_router)
+    app.include_router(position_router)
+    app.include_router(employee_router)
+    app.include_router(stats_router)
+    app.include_router(event_router)
+
+    @app.get("/metrics", include_in_schema=False)
+    @admission_weight(0)
+    def metrics():
+        return metrics_response()
+
+    # liveness: le processus répond, sans toucher à la base
+    @app.get("/health")
+    @admission_weight(0)
+    def health():
+        return {"status": "ok"}
+
+    # readiness: préchauffage terminé et base joignable, sinon 503 (hors du load balancer)
+    @app.get("/ready")
+    @admission_weight(0)
+    async def ready(request: Request):
+        if not request.app.state.ready:
+            return JSONResponse({"status": "warming up"}, status_code=503)
+        if not await database_ready(settings.READY_DB_TIMEOUT):
+            return JSONResponse({"status": "database unavailable"}, status_code=503)
+        return {"status": "ready"}
+
+    return app
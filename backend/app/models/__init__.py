@@ -1,5 +1,17 @@
+from app.models.change_event import ChangeEvent
 from app.models.department import Department
 from app.models.employee import Employee
+from app.models.employee_archive import ArchivedEmployee
+from app.models.headcount import EmployeeHeadcount
+from app.models.media import MediaObject
 from app.models.position import Position
 
-__all__ = ["Department", "Employee", "Position"]
+__all__ = [
+    "ArchivedEmployee",
+    "ChangeEvent",
+    "Department",
+    "Employee",
+    "EmployeeHeadcount",
+    "MediaObject",
+    "Position",
+]
@@ -0,0 +1,45 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import BigInteger, DateTime, Identity, Index, String, func, text
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.types import UserDefinedType
+
+
+from app.db.base import Base
+
+
+class XID8(UserDefinedType):
+    cache_ok = True
+
+    def get_col_spec(self, **kw) -> str:
+        return "xid8"
+
+
+class ChangeEvent(Base):
+    """
+    Journal des créations / modifications / suppressions, écrit par trigger sur employees,
+    departments et positions (voir migration), jamais par l'API.
+    """
+
+    __tablename__ = "change_events"
+    __table_args__ = (
+        # lignes pas encore numérotées, dans l'ordre où ChangeFeedService.sequence les prend
+        Index("ix_change_events_pending", "xid", "id", postgresql_where=text("seq IS NULL")),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    # numéro attribué une fois toutes les transactions antérieures terminées: curseur des clients
+    seq: Mapped[int | None] = mapped_column(BigInteger, unique=True, index=True, nullable=True)
+    # transaction d'écriture (pg_current_xact_id), jamais lue par l'API
+    xid: Mapped[str] = mapped_column(
+        XID8, nullable=False, server_default=text("pg_current_xact_id()"), deferred=True
+    )
+    entity: Mapped[str] = mapped_column(String(20), nullable=False)
+    op: Mapped[str] = mapped_column(String(10), nullable=False)
+    entity_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    # départements concernés (ancien et nouveau après une mutation), NULL: tous
+    department_ids: Mapped[list[uuid.UUID] | None] = mapped_column(ARRAY(UUID(as_uuid=True)), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), index=True
+    )
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Date, String, ForeignKey
+from sqlalchemy import Computed, Date, String, ForeignKey, Index, Text, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -10,13 +10,28 @@ from app.models.mixins import TimestampMixin
 
 class Employee(TimestampMixin, Base):
     __tablename__ = "employees"
+    __table_args__ = (
+        Index("ix_employees_last_name_id", "last_name", "id"),
+        # candidats de l'archivage (app.jobs.archive_employees)
+        Index(
+            "ix_employees_terminated_updated_at",
+            "updated_at",
+            postgresql_where=text("status = 'terminated'"),
+        ),
+        Index(
+            "ix_employees_search_text_trgm",
+            "search_text",
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     first_name: Mapped[str] = mapped_column(String(50), nullable=False)
     last_name: Mapped[str] = mapped_column(String(50), nullable=False)
     email: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
-    department_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("departments.id"), nullable=False)
-    position_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("positions.id"), nullable=False)
+    department_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("departments.id"), nullable=False, index=True)
+    position_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("positions.id"), nullable=False, index=True)
 
     # photo
     photo_url: Mapped[str] = mapped_column(String(500), nullable=False)
@@ -25,5 +40,12 @@ class Employee(TimestampMixin, Base):
 
     status: Mapped[str] = mapped_column(String(20), nullable=False, default="active")
 
+    # search: colonne générée par Postgres, jamais chargée avec l'entité
+    search_text: Mapped[str | None] = mapped_column(
+        Text,
+        Computed("lower(first_name || ' ' || last_name || ' ' || email)", persisted=True),
+        deferred=True,
+    )
+
     department = relationship("Department", back_populates="employees")
     position = relationship("Position", back_populates="employees")
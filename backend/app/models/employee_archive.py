@@ -0,0 +1,45 @@
+import uuid
+from datetime import date, datetime
+from sqlalchemy import Computed, Date, DateTime, ForeignKey, Index, String, Text, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+from app.db.base import Base
+
+
+class ArchivedEmployee(Base):
+    """
+    Employés terminés sortis de la table employees (voir app.jobs.archive_employees):
+    mêmes colonnes, dates d'origine conservées. Lus seulement via include_archived.
+    """
+
+    __tablename__ = "employees_archive"
+    __table_args__ = (
+        Index("ix_employees_archive_last_name_id", "last_name", "id"),
+        Index(
+            "ix_employees_archive_search_text_trgm",
+            "search_text",
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        ),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    first_name: Mapped[str] = mapped_column(String(50), nullable=False)
+    last_name: Mapped[str] = mapped_column(String(50), nullable=False)
+    # pas unique: l'adresse peut avoir été réattribuée depuis
+    email: Mapped[str] = mapped_column(String(100), nullable=False)
+    department_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("departments.id"), nullable=False, index=True)
+    position_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("positions.id"), nullable=False, index=True)
+    photo_url: Mapped[str] = mapped_column(String(500), nullable=False)
+    hire_date: Mapped[date | None] = mapped_column(Date, nullable=True)
+    status: Mapped[str] = mapped_column(String(20), nullable=False)
+    search_text: Mapped[str | None] = mapped_column(
+        Text,
+        Computed("lower(first_name || ' ' || last_name || ' ' || email)", persisted=True),
+        deferred=True,
+    )
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    archived_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -0,0 +1,22 @@
+import uuid
+from sqlalchemy import ForeignKey, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+from app.db.base import Base
+
+
+class EmployeeHeadcount(Base):
+    """Compteurs maintenus par trigger sur employees (voir migration), jamais écrits par l'API."""
+
+    __tablename__ = "employee_headcounts"
+
+    department_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("departments.id", ondelete="CASCADE"), primary_key=True
+    )
+    position_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("positions.id", ondelete="CASCADE"), primary_key=True
+    )
+    status: Mapped[str] = mapped_column(String(20), primary_key=True)
+    headcount: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -0,0 +1,14 @@
+from sqlalchemy import Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+from app.db.base import Base
+from app.models.mixins import TimestampMixin
+
+
+class MediaObject(TimestampMixin, Base):
+    __tablename__ = "media_objects"
+
+    # URL publique, dérivée du hash du contenu (/media/employees/ab/ab12...png)
+    path: Mapped[str] = mapped_column(String(500), primary_key=True)
+    ref_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
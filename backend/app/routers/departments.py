@@ -1,48 +1,86 @@
 import uuid
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.core.query_budget import query_budget
+from app.db.replicas import get_read_db
+from app.db.session import get_async_db
 from app.schemas.department import DepartmentOut, DepartmentCreate, DepartmentUpdate
-from app.services.department import DepartmentService
+from app.services.department import AsyncDepartmentService
+from app.utils.conditional import make_etag, is_not_modified, not_modified, set_validators
+from app.utils.fields import parse_fields, sparse_response
 
 router = APIRouter(prefix="/departments", tags=["departments"])
 
 @router.get("", response_model=list[DepartmentOut])
-def list_departments(db: Session = Depends(get_db)):
-    departments = DepartmentService.list(db)
+@query_budget(2)
+async def list_departments(
+    request: Request,
+    response: Response,
+    fields: str | None = Query(default=None, description="Comma-separated subset of fields"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    try:
+        selected = parse_fields(fields, DepartmentOut)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    count, last_modified = await AsyncDepartmentService.fingerprint(db)
+    etag = make_etag("departments", count, last_modified, sorted(selected or ()))
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified)
+    set_validators(response, etag, last_modified)
+
+    # liste servie par le cache mémoire: la projection ne porte que sur la sérialisation
+    departments = await AsyncDepartmentService.list_cached(db)
+    if selected is not None:
+        return sparse_response(DepartmentOut, selected, departments, response)
     return departments
 
 @router.post("", response_model=DepartmentOut, status_code=201)
-def create_department(payload: DepartmentCreate, db: Session = Depends(get_db)):
+@query_budget(1)
+async def create_department(payload: DepartmentCreate, response: Response, upsert: bool = False, db: AsyncSession = Depends(get_async_db)):
+    if upsert:
+        obj, created = await AsyncDepartmentService.upsert(db, payload)
+        if not created:
+            response.status_code = 200
+        return obj
     try:
-        department = DepartmentService.create(db, payload)
+        department = await AsyncDepartmentService.create(db, payload)
         return department
     except ValueError as e:
         raise HTTPException(status_code=409, detail=str(e))
 
 @router.get("/{department_id}", response_model=DepartmentOut)
-def get_department(department_id: uuid.UUID, db: Session = Depends(get_db)):
-    obj = DepartmentService.get(db, department_id)
+@query_budget(1)
+async def get_department(department_id: uuid.UUID, request: Request, response: Response, db: AsyncSession = Depends(get_read_db)):
+    obj = await AsyncDepartmentService.get_cached(db, department_id)
     if not obj:
         raise HTTPException(status_code=404, detail="Department not found")
+    etag = make_etag(obj.id, obj.updated_at)
+    if is_not_modified(request, etag, obj.updated_at):
+        return not_modified(etag, obj.updated_at)
+    set_validators(response, etag, obj.updated_at)
     return obj
 
 @router.patch("/{department_id}", response_model=DepartmentOut)
-def update_department(department_id: uuid.UUID, payload: DepartmentUpdate, db: Session = Depends(get_db)):
-    obj = DepartmentService.get(db, department_id)
-    if not obj:
-        raise HTTPException(status_code=404, detail="Department not found")
+@query_budget(1)
+async def update_department(department_id: uuid.UUID, payload: DepartmentUpdate, db: AsyncSession = Depends(get_async_db)):
     try:
-        updated_obj = DepartmentService.update(db, obj, payload)
-        return updated_obj
+        updated_obj = await AsyncDepartmentService.update(db, department_id, payload)
     except ValueError as e:
         raise HTTPException(status_code=409, detail=str(e))
+    if not updated_obj:
+        raise HTTPException(status_code=404, detail="Department not found")
+    return updated_obj
 
 @router.delete("/{department_id}", status_code=204)
-def delete_department(department_id: uuid.UUID, db: Session = Depends(get_db)):
-    obj = DepartmentService.get(db, department_id)
-    if not obj:
+@query_budget(1)
+async def delete_department(department_id: uuid.UUID, db: AsyncSession = Depends(get_async_db)):
+    try:
+        deleted = await AsyncDepartmentService.delete(db, department_id)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if not deleted:
         raise HTTPException(status_code=404, detail="Department not found")
-    DepartmentService.delete(db, obj)
     return None
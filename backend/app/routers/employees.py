@@ -1,43 +1,298 @@
 import uuid
 from datetime import date
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query
-from sqlalchemy.orm import Session
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
-from app.schemas.employee import EmployeeListOut, EmployeeDetailOut
-from app.services.employees import EmployeeService
-from app.utils.media import save_employee_photo
+from app.core.admission import admission_weight
+from app.core.query_budget import query_budget
+from app.db.replicas import get_read_db, pinned_to_primary
+from app.db.session import get_async_db
+from app.schemas.employee import (
+    MAX_BATCH_IDS,
+    MAX_SYNC_CHANGES,
+    EmployeeBatchIn,
+    EmployeeBatchOut,
+    EmployeeBulkResult,
+    EmployeeBulkUpdate,
+    EmployeeChangesOut,
+    EmployeeDetailOut,
+    EmployeeImportReport,
+    EmployeeListOut,
+    EmployeeUpdate,
+)
+from app.services.employees import AsyncEmployeeService
+from app.services.employee_import import import_employees
+from app.services.employee_export import stream_employees, MEDIA_TYPES
+from app.services.media import AsyncMediaService
+from app.services.sync import AsyncSyncService
+from app.utils.conditional import make_etag, is_not_modified, not_modified, set_validators
+from app.utils.fields import parse_fields, sparse_response
+from app.utils.json_response import FastJSONResponse
+from app.utils.pagination import encode_cursor, decode_cursor, decode_sync_token
 
 
 router = APIRouter(prefix="/employees", tags=["employees"])
 
 @router.get("", response_model=list[EmployeeListOut])
-def list_employees(
+# vue compacte: + départements / postes depuis le cache (froid: une requête chacun)
+@query_budget(3)
+async def list_employees(
+    response: Response,
     department_id: uuid.UUID | None = None,
     position_id: uuid.UUID | None = None,
     q: str | None = None,
     limit: int = Query(default=20, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
-    db: Session = Depends(get_db),
+    cursor: str | None = None,
+    view: Literal["full", "compact"] = "full",
+    fields: str | None = Query(default=None, description="Comma-separated subset of fields, e.g. first_name,last_name,email"),
+    include_archived: bool = Query(default=False, description="Also list archived (long-terminated) employees"),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    return EmployeeService.list(
-        db,
+    """
+    view=compact: {"data": [...], "included": {"departments": {id: ...}, "positions": {id: ...}},
+    "next_cursor": ...}, les employés ne portant que department_id / position_id.
+
+    Vue complète: le corps reste un tableau (contrat existant du client), le curseur de
+    la page suivante est renvoyé dans l'en-tête X-Next-Cursor.
+    """
+    try:
+        selected = parse_fields(fields, EmployeeListOut)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if selected is not None and view == "compact":
+        raise HTTPException(status_code=422, detail="fields is not supported with view=compact")
+
+    after = None
+    if cursor:
+        if offset:
+            raise HTTPException(status_code=422, detail="Use either cursor or offset, not both")
+        if q:
+            raise HTTPException(status_code=422, detail="Search results are ranked by relevance, use offset")
+        try:
+            after = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+
+    filters = dict(
         department_id=department_id,
         position_id=position_id,
         q=q,
         limit=limit,
         offset=offset,
+        after=after,
+        include_archived=include_archived,
+    )
+    # page pleine => il peut en rester: on expose le curseur de la page suivante
+    if view == "compact":
+        page = await AsyncEmployeeService.list_compact(db, **filters)
+        rows = page["data"]
+        page["next_cursor"] = None
+        if len(rows) == limit and not q:
+            page["next_cursor"] = encode_cursor(rows[-1]["last_name"], rows[-1]["id"])
+        compact = FastJSONResponse(page)
+        if page["next_cursor"]:
+            compact.headers["X-Next-Cursor"] = page["next_cursor"]
+        return compact
+
+    employees = await AsyncEmployeeService.list(db, fields=selected, **filters)
+    if len(employees) == limit and not q:
+        last = employees[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last.last_name, last.id)
+    if selected is not None:
+        return sparse_response(EmployeeListOut, selected, employees, response)
+    return employees
+
+@router.get("/export")
+# une requête (curseur serveur), exécutée dans le corps streamé: comptée quand même,
+# QueryBudgetMiddleware vérifie après le dernier morceau envoyé
+@query_budget(1)
+@admission_weight(5)
+async def export_employees(
+    request: Request,
+    format: Literal["csv", "ndjson"] = "csv",
+    department_id: uuid.UUID | None = None,
+    position_id: uuid.UUID | None = None,
+    q: str | None = None,
+):
+    body = stream_employees(
+        format,
+        pinned=pinned_to_primary(request),
+        department_id=department_id,
+        position_id=position_id,
+        q=q,
+    )
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="employees.{format}"'},
     )
 
+@router.post("/import", response_model=EmployeeImportReport)
+# pas de budget global (proportionnel au fichier): vérifié par lot dans import_employees
+@admission_weight(5)
+async def import_employees_file(
+    request: Request,
+    format: Literal["csv", "ndjson"] | None = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    # corps brut (pas de multipart): lu par morceaux, traité par lots
+    if format is None:
+        content_type = request.headers.get("content-type", "")
+        format = "ndjson" if "ndjson" in content_type or "jsonl" in content_type else "csv"
+
+    return await import_employees(db, request.stream(), format)
+
+@router.get("/batch", response_model=EmployeeBatchOut)
+@query_budget(1)
+@admission_weight(2)
+async def get_employees_batch(
+    ids: str = Query(description=f"Comma-separated employee ids (max {MAX_BATCH_IDS})"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    try:
+        payload = EmployeeBatchIn(ids=[i.strip() for i in ids.split(",") if i.strip()])
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=jsonable_encoder(e.errors(include_url=False, include_context=False)))
+    items, missing = await AsyncEmployeeService.get_many(db, payload.ids)
+    return {"items": items, "missing": missing}
+
+# même lecture, pour les listes trop longues pour une URL
+@router.post("/batch", response_model=EmployeeBatchOut)
+@query_budget(1)
+@admission_weight(2)
+async def post_employees_batch(payload: EmployeeBatchIn, db: AsyncSession = Depends(get_read_db)):
+    items, missing = await AsyncEmployeeService.get_many(db, payload.ids)
+    return {"items": items, "missing": missing}
+
+@router.post("/bulk-update", response_model=EmployeeBulkResult)
+@query_budget(3)
+@admission_weight(2)
+async def bulk_update_employees(payload: EmployeeBulkUpdate, db: AsyncSession = Depends(get_async_db)):
+    selector = {"ids": payload.ids} if payload.ids is not None else payload.filter.model_dump()
+    try:
+        return await AsyncEmployeeService.bulk_update(db, payload.changes, **selector)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+@router.get("/changes", response_model=EmployeeChangesOut)
+# rétention + journal + employés + départements + postes
+@query_budget(5)
+@admission_weight(2)
+async def get_employee_changes(
+    since: str | None = Query(default=None, description="Token returned by the previous call"),
+    limit: int = Query(default=500, ge=1, le=MAX_SYNC_CHANGES),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Synchronisation incrémentale (badges, paie). Sans `since`: jeton courant, à demander
+    AVANT l'export complet (/employees/export) puis à rejouer ici. 410: jeton plus ancien
+    que la rétention du journal, refaire un export complet.
+    """
+    if since is None:
+        token = await AsyncSyncService.head_token(db)
+        return EmployeeChangesOut(employees=[], departments=[], positions=[], tombstones=[], next=token, has_more=False)
+    try:
+        after = decode_sync_token(since)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if not await AsyncSyncService.is_retained(db, after):
+        raise HTTPException(status_code=410, detail="Sync token expired, start again from a full export")
+    return await AsyncSyncService.changes(db, after, limit)
+
 @router.get("/{employee_id}", response_model=EmployeeDetailOut)
-def get_employee(employee_id: uuid.UUID, db: Session = Depends(get_db)):
-    emp = EmployeeService.get(db, employee_id)
+@query_budget(2)
+async def get_employee(
+    employee_id: uuid.UUID,
+    request: Request,
+    response: Response,
+    fields: str | None = Query(default=None, description="Comma-separated subset of fields"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    try:
+        selected = parse_fields(fields, EmployeeDetailOut)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    # validateur d'abord: une requête légère, la lecture complète seulement si modifié
+    last_modified = await AsyncEmployeeService.last_modified(db, employee_id)
+    if last_modified is None:
+        raise HTTPException(status_code=404, detail="Employee not found")
+    # une représentation par sous-ensemble de champs
+    etag = make_etag(employee_id, last_modified, sorted(selected or ()))
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified)
+    set_validators(response, etag, last_modified)
+
+    emp = await AsyncEmployeeService.get(db, employee_id, selected)
+    if not emp:
+        raise HTTPException(status_code=404, detail="Employee not found")
+    if selected is not None:
+        return sparse_response(EmployeeDetailOut, selected, emp, response)
+    return emp
+
+@router.patch("/{employee_id}", response_model=EmployeeDetailOut)
+@query_budget(3)
+async def update_employee(employee_id: uuid.UUID, payload: EmployeeUpdate, db: AsyncSession = Depends(get_async_db)):
+    try:
+        emp = await AsyncEmployeeService.update(db, employee_id, payload)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     if not emp:
         raise HTTPException(status_code=404, detail="Employee not found")
     return emp
 
+@router.post("/{employee_id}/photo", response_model=EmployeeDetailOut)
+# référence + UPDATE + département / poste (cache froid) + libération de l'ancienne photo
+@query_budget(6)
+@admission_weight(4)
+async def update_employee_photo(
+    employee_id: uuid.UUID,
+    photo: UploadFile = File(...),
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        photo_url = await AsyncMediaService.store_photo(db, photo)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    emp, old_photo_url = await AsyncEmployeeService.replace_photo(db, employee_id, photo_url)
+    if not emp:
+        await AsyncMediaService.release(db, photo_url)
+        raise HTTPException(status_code=404, detail="Employee not found")
+    # fichier supprimé quand plus aucun employé ne le référence
+    await AsyncMediaService.release(db, old_photo_url)
+    return emp
+
+@router.delete("/{employee_id}", status_code=204)
+@query_budget(3)
+async def delete_employee(employee_id: uuid.UUID, db: AsyncSession = Depends(get_async_db)):
+    photo_url = await AsyncEmployeeService.delete(db, employee_id)
+    if photo_url is None:
+        raise HTTPException(status_code=404, detail="Employee not found")
+    await AsyncMediaService.release(db, photo_url)
+    return None
+
+@router.post("/{employee_id}/restore", response_model=EmployeeDetailOut)
+# déplacement + département / poste (cache froid); conflit: + email de l'archive
+@query_budget(4)
+async def restore_employee(employee_id: uuid.UUID, db: AsyncSession = Depends(get_async_db)):
+    try:
+        emp = await AsyncEmployeeService.restore(db, employee_id)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if not emp:
+        raise HTTPException(status_code=404, detail="Archived employee not found")
+    return emp
+
 @router.post("", response_model=EmployeeDetailOut, status_code=201)
-def create_employee(
+@query_budget(6)
+@admission_weight(4)
+async def create_employee(
     first_name: str = Form(...),
     last_name: str = Form(...),
     email: str = Form(...),
@@ -45,7 +300,7 @@ def create_employee(
     position_id: uuid.UUID = Form(...),
     hire_date: date | None = Form(default=None),
     photo: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     #validation
     if len(first_name.strip()) < 2:
@@ -55,13 +310,13 @@ def create_employee(
 
     #save photo
     try:
-        photo_url, photo_path = save_employee_photo(photo)
+        photo_url = await AsyncMediaService.store_photo(db, photo)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
     # create employee
     try:
-        emp = EmployeeService.create(
+        emp = await AsyncEmployeeService.create(
             db,
             first_name=first_name.strip(),
             last_name=last_name.strip(),
@@ -72,9 +327,8 @@ def create_employee(
             hire_date=hire_date,
         )
     except ValueError as e:
-        # ✅ cleanup si DB échoue après upload
-        from app.utils.media import safe_delete_file
-        safe_delete_file(photo_path)
+        # ✅ cleanup si DB échoue après upload (supprime le fichier si plus référencé)
+        await AsyncMediaService.release(db, photo_url)
         raise HTTPException(status_code=409, detail=str(e))
 
     return emp
@@ -0,0 +1,39 @@
+import uuid
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from app.core.admission import admission_weight
+from app.core.query_budget import query_budget
+from app.services.change_feed import stream_changes
+
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+
+@router.get("")
+# reprise: contrôle de rétention + rattrapage (+ dernier seq si trop ancien), dans le flux;
+# vérifié à la déconnexion (les événements diffusés sont lus par la tâche ChangeFeed.run)
+@query_budget(3)
+# connexion longue: ne garde pas d'unité d'admission, la base n'est lue qu'au rattrapage
+@admission_weight(0)
+async def stream_events(
+    department_id: uuid.UUID | None = None,
+    last_event_id: int | None = Query(default=None, ge=0, description="Resume after this event (first connection)"),
+    last_event_id_header: str | None = Header(default=None, alias="Last-Event-ID"),
+):
+    """
+    Flux SSE des créations / modifications / suppressions (employee.*, department.*, position.*).
+    department_id: seulement les événements de ce département (postes: toujours envoyés).
+    Reconnexion: EventSource renvoie Last-Event-ID; "reset" si la reprise n'est plus possible.
+    """
+    if last_event_id_header:
+        try:
+            last_event_id = int(last_event_id_header)
+        except ValueError:
+            raise HTTPException(status_code=422, detail="Last-Event-ID must be an event id")
+
+    return StreamingResponse(
+        stream_changes(department_id, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,50 +1,88 @@
 import uuid
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.core.query_budget import query_budget
+from app.db.replicas import get_read_db
+from app.db.session import get_async_db
 from app.schemas.position import PositionCreate, PositionOut, PositionUpdate
-from app.services.position import PositionService
+from app.services.position import AsyncPositionService
+from app.utils.conditional import make_etag, is_not_modified, not_modified, set_validators
+from app.utils.fields import parse_fields, sparse_response
 
 
 router = APIRouter(prefix="/positions", tags=["positions"])
 
 
 @router.get("", response_model=list[PositionOut])
-def list_positions(db: Session = Depends(get_db)):
-    positions = PositionService.list(db)
+@query_budget(2)
+async def list_positions(
+    request: Request,
+    response: Response,
+    fields: str | None = Query(default=None, description="Comma-separated subset of fields"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    try:
+        selected = parse_fields(fields, PositionOut)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    count, last_modified = await AsyncPositionService.fingerprint(db)
+    etag = make_etag("positions", count, last_modified, sorted(selected or ()))
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified)
+    set_validators(response, etag, last_modified)
+
+    # liste servie par le cache mémoire: la projection ne porte que sur la sérialisation
+    positions = await AsyncPositionService.list_cached(db)
+    if selected is not None:
+        return sparse_response(PositionOut, selected, positions, response)
     return positions
 
 @router.post("", response_model=PositionOut, status_code=201)
-def create_position(payload: PositionCreate, db: Session = Depends(get_db)):
+@query_budget(1)
+async def create_position(payload: PositionCreate, response: Response, upsert: bool = False, db: AsyncSession = Depends(get_async_db)):
+    if upsert:
+        obj, created = await AsyncPositionService.upsert(db, payload)
+        if not created:
+            response.status_code = 200
+        return obj
     try:
-        position = PositionService.create(db, payload)
+        position = await AsyncPositionService.create(db, payload)
         return position
     except ValueError as e:
         raise HTTPException(status_code=409, detail=str(e))
 
 @router.get("/{position_id}", response_model=PositionOut)
-def get_position(position_id: uuid.UUID, db: Session = Depends(get_db)):
-    obj = PositionService.get(db, position_id)
+@query_budget(1)
+async def get_position(position_id: uuid.UUID, request: Request, response: Response, db: AsyncSession = Depends(get_read_db)):
+    obj = await AsyncPositionService.get_cached(db, position_id)
     if not obj:
         raise HTTPException(status_code=404, detail="Position not found")
+    etag = make_etag(obj.id, obj.updated_at)
+    if is_not_modified(request, etag, obj.updated_at):
+        return not_modified(etag, obj.updated_at)
+    set_validators(response, etag, obj.updated_at)
     return obj
 
 @router.patch("/{position_id}", response_model=PositionOut)
-def update_position(position_id: uuid.UUID, payload: PositionUpdate, db: Session = Depends(get_db)):
-    obj = PositionService.get(db, position_id)
-    if not obj:
-        raise HTTPException(status_code=404, detail="Position not found")
+@query_budget(1)
+async def update_position(position_id: uuid.UUID, payload: PositionUpdate, db: AsyncSession = Depends(get_async_db)):
     try:
-        updated_obj = PositionService.update(db, obj, payload)
-        return updated_obj
+        updated_obj = await AsyncPositionService.update(db, position_id, payload)
     except ValueError as e:
         raise HTTPException(status_code=409, detail=str(e))
+    if not updated_obj:
+        raise HTTPException(status_code=404, detail="Position not found")
+    return updated_obj
 
 @router.delete("/{position_id}", status_code=204)
-def delete_position(position_id: uuid.UUID, db: Session = Depends(get_db)):
-    obj = PositionService.get(db, position_id)
-    if not obj:
+@query_budget(1)
+async def delete_position(position_id: uuid.UUID, db: AsyncSession = Depends(get_async_db)):
+    try:
+        deleted = await AsyncPositionService.delete(db, position_id)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if not deleted:
         raise HTTPException(status_code=404, detail="Position not found")
-    PositionService.delete(db, obj)
     return None
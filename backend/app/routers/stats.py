@@ -0,0 +1,32 @@
+import uuid
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.query_budget import query_budget
+from app.db.replicas import get_read_db
+from app.schemas.stats import HeadcountOut
+from app.services.stats import AsyncStatsService
+
+
+router = APIRouter(prefix="/stats", tags=["stats"])
+
+
+@router.get("/headcount", response_model=HeadcountOut)
+@query_budget(3)
+async def get_headcount(
+    department_id: uuid.UUID | None = None,
+    position_id: uuid.UUID | None = None,
+    status: str | None = None,
+    q: str | None = None,
+    include_archived: bool = Query(default=False, description="Also count archived employees"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    # mêmes filtres que GET /employees: facettes à afficher à côté de la liste
+    return await AsyncStatsService.headcount(
+        db,
+        department_id=department_id,
+        position_id=position_id,
+        status=status,
+        q=q,
+        include_archived=include_archived,
+    )
@@ -1,9 +1,11 @@
 import uuid
-from datetime import datetime
-from pydantic import BaseModel, Field, EmailStr
+from typing import ClassVar, Literal
+from datetime import date, datetime
+from pydantic import BaseModel, Field, EmailStr, computed_field, model_validator
 
 from app.schemas.department import DepartmentOut
 from app.schemas.position import PositionOut
+from app.utils.media import photo_variant_url
 
 class EmployeeListOut(BaseModel):
     id: uuid.UUID
@@ -13,6 +15,21 @@ class EmployeeListOut(BaseModel):
     status: str
     photo_url: str
 
+    # champs stockés lus par les champs calculés (vues partielles, ?fields=)
+    field_dependencies: ClassVar[dict[str, tuple[str, ...]]] = {
+        "photo_thumb_url": ("photo_url",),
+        "photo_medium_url": ("photo_url",),
+    }
+
+    @computed_field
+    @property
+    def photo_thumb_url(self) -> str | None:
+        return photo_variant_url(self.photo_url, "thumb")
+
+    @computed_field
+    @property
+    def photo_medium_url(self) -> str | None:
+        return photo_variant_url(self.photo_url, "medium")
 
     department: DepartmentOut
     position: PositionOut
@@ -26,10 +43,99 @@ class EmployeeListOut(BaseModel):
 class EmployeeDetailOut(EmployeeListOut):
     hire_date: datetime | None = None
 
+MAX_BATCH_IDS = 500
+
+class EmployeeBatchIn(BaseModel):
+    ids: list[uuid.UUID] = Field(min_length=1, max_length=MAX_BATCH_IDS)
+
+class EmployeeBatchOut(BaseModel):
+    items: list[EmployeeDetailOut]
+    missing: list[uuid.UUID] = []
+
 class EmployeeUpdate(BaseModel):
     first_name: str | None = Field(default=None, min_length=1, max_length=50)
     last_name: str | None = Field(default=None, min_length=1, max_length=50)
-    email: EmailStr | None = None
+    email: EmailStr | None = Field(default=None, max_length=100)
     department_id: uuid.UUID | None = None
     position_id: uuid.UUID | None = None
     status: str | None = Field(default=None, min_length=1, max_length=20)
+    hire_date: date | None = None
+
+MAX_BULK_IDS = 1000
+
+class EmployeeBulkChanges(BaseModel):
+    department_id: uuid.UUID | None = None
+    position_id: uuid.UUID | None = None
+    status: str | None = Field(default=None, min_length=1, max_length=20)
+
+class EmployeeBulkFilter(BaseModel):
+    department_id: uuid.UUID | None = None
+    position_id: uuid.UUID | None = None
+    # "" ou "   " ne filtreraient rien: l'UPDATE toucherait tous les employés
+    q: str | None = Field(default=None, min_length=1)
+
+    class Config:
+        str_strip_whitespace = True
+
+class EmployeeBulkUpdate(BaseModel):
+    # soit une liste d'ids, soit les filtres de GET /employees
+    ids: list[uuid.UUID] | None = Field(default=None, min_length=1, max_length=MAX_BULK_IDS)
+    filter: EmployeeBulkFilter | None = None
+    changes: EmployeeBulkChanges
+
+    @model_validator(mode="after")
+    def check_target(self):
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Provide either ids or filter")
+        if self.filter is not None and not self.filter.model_dump(exclude_none=True):
+            raise ValueError("filter must contain at least one criterion")
+        if not self.changes.model_dump(exclude_none=True):
+            raise ValueError("changes must contain at least one field")
+        return self
+
+class EmployeeBulkResult(BaseModel):
+    updated: int
+    # ids demandés mais inexistants
+    missing: list[uuid.UUID] = []
+
+MAX_SYNC_CHANGES = 1000
+
+class Tombstone(BaseModel):
+    entity: Literal["employee", "department", "position"]
+    id: uuid.UUID
+
+class EmployeeChangesOut(BaseModel):
+    """Lignes à upserter et suppressions depuis le jeton `since`; rappeler avec `next` tant que has_more."""
+
+    employees: list[EmployeeListOut]
+    # noms embarqués dans les employés: un renommage n'apparaît qu'ici
+    departments: list[DepartmentOut]
+    positions: list[PositionOut]
+    tombstones: list[Tombstone]
+    next: str
+    has_more: bool
+
+
+class EmployeeImportRow(BaseModel):
+    first_name: str = Field(min_length=2, max_length=50)
+    last_name: str = Field(min_length=2, max_length=50)
+    email: EmailStr = Field(max_length=100)
+    # id ou nom du département / titre du poste
+    department: str = Field(min_length=1)
+    position: str = Field(min_length=1)
+    hire_date: date | None = None
+    status: str = Field(default="active", min_length=1, max_length=20)
+    photo_url: str = Field(default="", max_length=500)
+
+    class Config:
+        str_strip_whitespace = True
+
+class EmployeeImportError(BaseModel):
+    line: int
+    error: str
+
+class EmployeeImportReport(BaseModel):
+    inserted: int = 0
+    failed: int = 0
+    errors: list[EmployeeImportError] = []
+    errors_truncated: bool = False
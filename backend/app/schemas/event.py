@@ -0,0 +1,18 @@
+import uuid
+from datetime import datetime
+from typing import Literal
+from pydantic import BaseModel, Field
+
+
+class ChangeEventOut(BaseModel):
+    """Donnée d'un événement SSE: l'identifiant suffit, le client relit la ligne (ex. POST /employees/batch)."""
+
+    seq: int
+    entity: Literal["employee", "department", "position"]
+    op: Literal["created", "updated", "deleted"]
+    id: uuid.UUID = Field(validation_alias="entity_id")
+    department_ids: list[uuid.UUID] | None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,14 @@
+import uuid
+from pydantic import BaseModel
+
+
+class HeadcountBucket(BaseModel):
+    id: uuid.UUID
+    label: str
+    headcount: int
+
+class HeadcountOut(BaseModel):
+    total: int
+    by_department: list[HeadcountBucket]
+    by_position: list[HeadcountBucket]
+    by_status: dict[str, int]
@@ -0,0 +1,265 @@
+import asyncio
+import logging
+import time
+import uuid
+from collections.abc import AsyncIterator
+from datetime import timedelta
+from sqlalchemy import delete, func, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.change_event import ChangeEvent
+from app.schemas.event import ChangeEventOut
+
+logger = logging.getLogger(__name__)
+
+# notifié au commit par les triggers *_record_changes (voir migrations), puis par
+# ChangeFeedService.sequence une fois les événements numérotés
+CHANGES_CHANNEL = "hr_changes"
+
+PRUNE_INTERVAL = 3600
+# événements retenus par une transaction encore en cours: nouvel essai sans attendre de commit
+PENDING_RETRY = 0.5
+
+# seul le numéroteur prend ce verrou, jamais les écritures
+SEQUENCE_LOCK = "SELECT pg_try_advisory_xact_lock(hashtext('change_events_sequence'))"
+SEQUENCE_READY = """
+    UPDATE change_events c SET seq = s.seq
+    FROM (
+        SELECT p.id, nextval('change_events_seq_seq') AS seq
+        FROM (
+            SELECT id FROM change_events
+            WHERE seq IS NULL AND xid < pg_snapshot_xmin(pg_current_snapshot())
+            ORDER BY xid, id
+        ) AS p
+    ) AS s
+    WHERE c.id = s.id
+"""
+
+
+class ChangeFeedService:
+    @staticmethod
+    def sequence(db: Session) -> bool:
+        """
+        Numérote (seq) les événements des transactions terminées, dans l'ordre des xid.
+        Sous xmin (plus ancienne transaction en cours), aucun xid inférieur ne peut encore
+        écrire: un curseur "seq > N" ne manque jamais une transaction plus lente.
+        Un seul numéroteur à la fois; True s'il faut réessayer (verrou pris ailleurs,
+        ou événements retenus par une transaction encore en cours).
+        """
+        if not db.scalar(text(SEQUENCE_LOCK)):
+            db.rollback()
+            return True
+        if db.execute(text(SEQUENCE_READY)).rowcount:
+            # réveille les ChangeFeed des autres workers, au commit
+            db.execute(select(func.pg_notify(CHANGES_CHANNEL, "")))
+        pending = db.scalar(select(select(ChangeEvent.id).where(ChangeEvent.seq.is_(None)).exists()))
+        db.commit()
+        return pending
+
+    @staticmethod
+    def head(db: Session) -> int:
+        """Dernier seq attribué (0: journal vide)."""
+        return db.scalar(select(func.coalesce(func.max(ChangeEvent.seq), 0)))
+
+    @staticmethod
+    def since(
+        db: Session,
+        after: int,
+        *,
+        department_id: uuid.UUID | None = None,
+        limit: int | None = None,
+    ) -> list[ChangeEventOut]:
+        stmt = select(ChangeEvent).where(ChangeEvent.seq > after).order_by(ChangeEvent.seq.asc())
+        if department_id:
+            stmt = stmt.where(
+                or_(ChangeEvent.department_ids.is_(None), ChangeEvent.department_ids.any(department_id))
+            )
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return [ChangeEventOut.model_validate(obj) for obj in db.scalars(stmt)]
+
+    @staticmethod
+    def is_retained(db: Session, after: int) -> bool:
+        """False si des événements postérieurs à `after` ont déjà été purgés."""
+        oldest = db.scalar(select(func.min(ChangeEvent.seq)))
+        return oldest is None or after >= oldest - 1
+
+    @staticmethod
+    def prune(db: Session, older_than: timedelta) -> int:
+        # le dernier événement reste: le journal ne redevient jamais vide (voir is_retained)
+        newest = select(func.max(ChangeEvent.seq)).scalar_subquery()
+        result = db.execute(
+            delete(ChangeEvent).where(
+                ChangeEvent.created_at < func.now() - older_than,
+                ChangeEvent.seq < newest,
+            )
+        )
+        db.commit()
+        return result.rowcount
+
+
+class AsyncChangeFeedService:
+    @staticmethod
+    async def sequence(db: AsyncSession) -> bool:
+        return await db.run_sync(ChangeFeedService.sequence)
+
+    @staticmethod
+    async def head(db: AsyncSession) -> int:
+        return await db.run_sync(ChangeFeedService.head)
+
+    @staticmethod
+    async def since(db: AsyncSession, after: int, **filters) -> list[ChangeEventOut]:
+        return await db.run_sync(ChangeFeedService.since, after, **filters)
+
+    @staticmethod
+    async def is_retained(db: AsyncSession, after: int) -> bool:
+        return await db.run_sync(ChangeFeedService.is_retained, after)
+
+    @staticmethod
+    async def prune(db: AsyncSession, older_than: timedelta) -> int:
+        return await db.run_sync(ChangeFeedService.prune, older_than)
+
+
+class Subscription:
+    def __init__(self, department_id: uuid.UUID | None, maxsize: int):
+        self.department_id = department_id
+        self.queue: asyncio.Queue[ChangeEventOut | None] = asyncio.Queue(maxsize)
+
+    def wants(self, event: ChangeEventOut) -> bool:
+        return (
+            self.department_id is None
+            or event.department_ids is None
+            or self.department_id in event.department_ids
+        )
+
+
+class ChangeFeed:
+    """
+    Diffusion en mémoire (par worker) du journal change_events: une seule lecture SQL
+    par commit notifié, quel que soit le nombre de clients connectés.
+    """
+
+    def __init__(self, queue_size: int | None = None):
+        # None: EVENTS_QUEUE_SIZE, lu à l'abonnement (pas à l'import)
+        self.queue_size = queue_size
+        self.last_seq: int | None = None
+        self._subscribers: set[Subscription] = set()
+        self._wakeup = asyncio.Event()
+
+    def subscribe(self, department_id: uuid.UUID | None = None) -> Subscription:
+        subscription = Subscription(department_id, self.queue_size or settings.EVENTS_QUEUE_SIZE)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    def notify(self, payload: str | None) -> None:
+        """Handler du canal CHANGES_CHANNEL (voir app.db.notifications.listen)."""
+        self._wakeup.set()
+
+    def publish(self, events: list[ChangeEventOut]) -> None:
+        for subscription in list(self._subscribers):
+            try:
+                for event in events:
+                    if subscription.wants(event):
+                        subscription.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # client trop lent: déconnecté, il reprendra depuis son Last-Event-ID
+                self.unsubscribe(subscription)
+                while not subscription.queue.empty():
+                    subscription.queue.get_nowait()
+                subscription.queue.put_nowait(None)
+
+    async def run(self) -> None:
+        """
+        Tâche de fond par worker: numérote et relit le journal à chaque notification,
+        purge périodique.
+        """
+        pruned_at = 0.0
+
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            try:
+                async with AsyncSessionLocal() as db:
+                    if self.last_seq is None:
+                        # démarrage: seuls les commits à venir sont diffusés
+                        self.last_seq = await AsyncChangeFeedService.head(db)
+                    if await AsyncChangeFeedService.sequence(db):
+                        asyncio.get_running_loop().call_later(PENDING_RETRY, self._wakeup.set)
+                    # seq attribués sous xmin: rien ne peut apparaître derrière last_seq
+                    while events := await AsyncChangeFeedService.since(
+                        db, self.last_seq, limit=settings.EVENTS_REPLAY_LIMIT
+                    ):
+                        self.last_seq = events[-1].seq
+                        self.publish(events)
+                    if time.monotonic() - pruned_at > PRUNE_INTERVAL:
+                        pruned_at = time.monotonic()
+                        await AsyncChangeFeedService.prune(
+                            db, timedelta(days=settings.CHANGE_EVENTS_RETENTION_DAYS)
+                        )
+            except Exception:
+                logger.exception("Change feed failed to read change_events")
+                await asyncio.sleep(1)
+                self._wakeup.set()
+
+
+change_feed = ChangeFeed()
+
+
+def _format(event: ChangeEventOut) -> str:
+    return f"id: {event.seq}\nevent: {event.entity}.{event.op}\ndata: {event.model_dump_json()}\n\n"
+
+
+async def stream_changes(
+    department_id: uuid.UUID | None = None,
+    last_event_id: int | None = None,
+) -> AsyncIterator[str]:
+    """
+    Flux SSE: rattrapage depuis last_event_id (journal SQL), puis événements diffusés.
+    L'abonnement est pris avant le rattrapage: les doublons sont écartés par seq.
+    Pris à la première itération seulement: un client parti avant ne laisse rien derrière lui.
+    """
+    subscription = change_feed.subscribe(department_id)
+    try:
+        yield f"retry: {int(settings.EVENTS_KEEPALIVE * 1000)}\n\n"
+        after = last_event_id
+        if after is not None:
+            async with AsyncSessionLocal() as db:
+                replay = None
+                if await AsyncChangeFeedService.is_retained(db, after):
+                    replay = await AsyncChangeFeedService.since(
+                        db,
+                        after,
+                        department_id=department_id,
+                        limit=settings.EVENTS_REPLAY_LIMIT + 1,
+                    )
+                if replay is None or len(replay) > settings.EVENTS_REPLAY_LIMIT:
+                    # trop ancien ou trop long à rejouer: le client recharge ses listes
+                    after = await AsyncChangeFeedService.head(db)
+                    replay = None
+            if replay is None:
+                yield f"id: {after}\nevent: reset\ndata: {{}}\n\n"
+            else:
+                for event in replay:
+                    yield _format(event)
+                    after = event.seq
+
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), settings.EVENTS_KEEPALIVE)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if event is None:
+                return
+            if after is not None and event.seq <= after:
+                continue
+            yield _format(event)
+    finally:
+        change_feed.unsubscribe(subscription)
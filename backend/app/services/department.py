@@ -1,10 +1,17 @@
 import uuid
-from sqlalchemy import select
+from datetime import datetime
+from sqlalchemy import delete, func, literal_column, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 
 from app.models.department import Department
-from app.schemas.department import DepartmentCreate, DepartmentUpdate
+from app.schemas.department import DepartmentCreate, DepartmentOut, DepartmentUpdate
+from app.core.cache import department_cache
+from app.db.replicas import is_replica
+from app.db.errors import constraint_name
 
 
 class DepartmentService:
@@ -18,34 +25,152 @@ class DepartmentService:
     def get(db: Session, department_id: uuid.UUID) -> Department | None:
         return db.get(Department, department_id)
 
+    @staticmethod
+    def list_cached(db: Session) -> "list[DepartmentOut]":
+        return department_cache.load(
+            "list", lambda: [DepartmentOut.model_validate(obj) for obj in DepartmentService.list(db)],
+            store=not is_replica(db),
+        )
+
+    @staticmethod
+    def get_cached(db: Session, department_id: uuid.UUID) -> DepartmentOut | None:
+        def load() -> DepartmentOut | None:
+            obj = DepartmentService.get(db, department_id)
+            return DepartmentOut.model_validate(obj) if obj else None
+
+        return department_cache.load(department_id, load, store=not is_replica(db))
+
+    @staticmethod
+    def fingerprint(db: Session) -> tuple[int, datetime | None]:
+        """(nombre de lignes, max(updated_at)): change à chaque création, modification ou suppression."""
+        def load() -> tuple[int, datetime | None]:
+            count, last_modified = db.execute(select(func.count(), func.max(Department.updated_at))).one()
+            return count, last_modified
+
+        return department_cache.load("fingerprint", load, store=not is_replica(db))
+
+    @staticmethod
+    def exists(db: Session, department_id: uuid.UUID) -> bool:
+        return DepartmentService.get_cached(db, department_id) is not None
+
     @staticmethod
     def create(db: Session, data: DepartmentCreate) -> Department:
-        exists = db.execute(select(Department).where(Department.name == data.name)).scalar_one_or_none()
-        if exists:
+        # la contrainte unique tranche: pas de SELECT préalable, la ligne revient via RETURNING
+        stmt = (
+            insert(Department)
+            .values(name=data.name, description=data.description)
+            .on_conflict_do_nothing(index_elements=[Department.name])
+            .returning(Department)
+        )
+        obj = db.scalars(stmt).one_or_none()
+        if obj is None:
+            db.rollback()
             raise ValueError(f"Department with name '{data.name}' already exists.")
 
-        obj = Department(name=data.name, description=data.description)
-        db.add(obj)
         db.commit()
-        db.refresh(obj)
+        department_cache.invalidate()
         return obj
 
     @staticmethod
-    def update(db: Session, obj: Department, data: DepartmentUpdate) -> Department:
-        if data.name is not None and data.name != obj.name:
-            exists = db.execute(select(Department).where(Department.name == data.name)).scalar_one_or_none()
-            if exists:
-                raise ValueError(f"Department with name '{data.name}' already exists.")
-            obj.name = data.name
+    def upsert(db: Session, data: DepartmentCreate) -> tuple[Department, bool]:
+        """Crée ou met à jour par name. Retourne (objet, créé?)."""
+        stmt = insert(Department).values(name=data.name, description=data.description)
+        stmt = (
+            stmt.on_conflict_do_update(
+                index_elements=[Department.name],
+                # description absente: la valeur en base est conservée
+                set_={
+                    "description": func.coalesce(stmt.excluded.description, Department.description),
+                    "updated_at": func.now(),
+                },
+            )
+            # xmax = 0 uniquement pour une ligne fraîchement insérée
+            .returning(Department, literal_column("xmax = 0").label("inserted"))
+            .execution_options(populate_existing=True)
+        )
+        obj, inserted = db.execute(stmt).one()
+        db.commit()
+        department_cache.invalidate()
+        return obj, inserted
 
-        if data.description is not None:
-            obj.description = data.description
+    @staticmethod
+    def update(db: Session, department_id: uuid.UUID, data: DepartmentUpdate) -> Department | None:
+        changes = data.model_dump(exclude_none=True)
+        if not changes:
+            return DepartmentService.get(db, department_id)
 
-        db.commit()
-        db.refresh(obj)
+        stmt = (
+            update(Department)
+            .where(Department.id == department_id)
+            .values(**changes)
+            .returning(Department)
+            .execution_options(populate_existing=True)
+        )
+        try:
+            obj = db.scalars(stmt).one_or_none()
+            db.commit()
+        except IntegrityError as e:
+            db.rollback()
+            if constraint_name(e) == "departments_name_key":
+                raise ValueError(f"Department with name '{data.name}' already exists.")
+            raise
+
+        department_cache.invalidate()
         return obj
 
     @staticmethod
-    def delete(db: Session, obj: Department) -> None:
-        db.delete(obj)
-        db.commit()
+    def delete(db: Session, department_id: uuid.UUID) -> bool:
+        stmt = delete(Department).where(Department.id == department_id).returning(Department.id)
+        try:
+            deleted = db.execute(stmt).scalar_one_or_none()
+            db.commit()
+        except IntegrityError as e:
+            db.rollback()
+            if constraint_name(e) == "employees_department_id_fkey":
+                raise ValueError("Department still has employees.")
+            if constraint_name(e) == "employees_archive_department_id_fkey":
+                raise ValueError("Department still has archived employees.")
+            raise
+
+        department_cache.invalidate()
+        return deleted is not None
+
+
+class AsyncDepartmentService:
+    """Variante async: exécute DepartmentService sur la connexion async (greenlet, pas de thread)."""
+
+    @staticmethod
+    async def list(db: AsyncSession) -> list[Department]:
+        return await db.run_sync(DepartmentService.list)
+
+    @staticmethod
+    async def get(db: AsyncSession, department_id: uuid.UUID) -> Department | None:
+        return await db.get(Department, department_id)
+
+    @staticmethod
+    async def list_cached(db: AsyncSession) -> "list[DepartmentOut]":
+        return await db.run_sync(DepartmentService.list_cached)
+
+    @staticmethod
+    async def get_cached(db: AsyncSession, department_id: uuid.UUID) -> DepartmentOut | None:
+        return await db.run_sync(DepartmentService.get_cached, department_id)
+
+    @staticmethod
+    async def fingerprint(db: AsyncSession) -> tuple[int, datetime | None]:
+        return await db.run_sync(DepartmentService.fingerprint)
+
+    @staticmethod
+    async def create(db: AsyncSession, data: DepartmentCreate) -> Department:
+        return await db.run_sync(DepartmentService.create, data)
+
+    @staticmethod
+    async def upsert(db: AsyncSession, data: DepartmentCreate) -> tuple[Department, bool]:
+        return await db.run_sync(DepartmentService.upsert, data)
+
+    @staticmethod
+    async def update(db: AsyncSession, department_id: uuid.UUID, data: DepartmentUpdate) -> Department | None:
+        return await db.run_sync(DepartmentService.update, department_id, data)
+
+    @staticmethod
+    async def delete(db: AsyncSession, department_id: uuid.UUID) -> bool:
+        return await db.run_sync(DepartmentService.delete, department_id)
@@ -0,0 +1,89 @@
+import csv
+import io
+import json
+import uuid
+from collections.abc import AsyncIterator
+from sqlalchemy import select
+
+
+from app.db.replicas import read_session
+from app.models.employee import Employee
+from app.models.department import Department
+from app.models.position import Position
+from app.services.employees import EmployeeService
+
+YIELD_PER = 1000
+
+EXPORT_COLUMNS = [
+    Employee.id,
+    Employee.first_name,
+    Employee.last_name,
+    Employee.email,
+    Employee.status,
+    Employee.hire_date,
+    Employee.photo_url,
+    Employee.department_id,
+    Department.name.label("department_name"),
+    Employee.position_id,
+    Position.title.label("position_title"),
+    Employee.created_at,
+    Employee.updated_at,
+]
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def export_stmt(
+    *,
+    department_id: uuid.UUID | None = None,
+    position_id: uuid.UUID | None = None,
+    q: str | None = None,
+):
+    # colonnes seulement (pas d'entités ORM), noms joints en SQL
+    stmt = (
+        select(*EXPORT_COLUMNS)
+        .join(Department, Department.id == Employee.department_id)
+        .join(Position, Position.id == Employee.position_id)
+    )
+    stmt = EmployeeService.apply_filters(stmt, department_id=department_id, position_id=position_id, q=q)
+    return stmt.order_by(Employee.last_name.asc(), Employee.id.asc())
+
+
+def _json_default(value):
+    # dates/datetimes en ISO 8601 comme dans les réponses JSON de l'API
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+def _encode_csv(rows, header: bool) -> bytes:
+    out = io.StringIO()
+    writer = csv.writer(out)
+    if header:
+        writer.writerow([c.key for c in EXPORT_COLUMNS])
+    writer.writerows(
+        [v.isoformat() if hasattr(v, "isoformat") else v for v in row] for row in rows
+    )
+    return out.getvalue().encode()
+
+
+def _encode_ndjson(rows) -> bytes:
+    return "".join(json.dumps(dict(row._mapping), default=_json_default) + "\n" for row in rows).encode()
+
+
+async def stream_employees(fmt: str, *, pinned: bool = False, **filters) -> AsyncIterator[bytes]:
+    """
+    Flux de l'annuaire via un curseur serveur: au plus YIELD_PER lignes en mémoire.
+    La session est ouverte ici car le générateur vit plus longtemps que la requête.
+    """
+    stmt = export_stmt(**filters).execution_options(yield_per=YIELD_PER)
+
+    async with read_session(pinned) as db:
+        result = await db.stream(stmt)
+        first = True
+        async for partition in result.partitions():
+            yield _encode_csv(partition, header=first) if fmt == "csv" else _encode_ndjson(partition)
+            first = False
+        if first and fmt == "csv":
+            yield _encode_csv([], header=True)
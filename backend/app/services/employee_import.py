@@ -0,0 +1,265 @@
+import csv
+import json
+import uuid
+from collections.abc import AsyncIterator
+from sqlalchemy import bindparam, func, select, or_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from pydantic import ValidationError
+
+
+from app.core.query_budget import query_budget
+from app.db.errors import constraint_name
+from app.models.employee import Employee
+from app.models.media import MediaObject
+from app.models.department import Department
+from app.models.position import Position
+from app.schemas.employee import EmployeeImportRow, EmployeeImportError, EmployeeImportReport
+from app.utils.media import is_media_url
+
+BATCH_SIZE = 500
+MAX_LINE_BYTES = 64 * 1024
+MAX_REPORTED_ERRORS = 1000
+# département / poste supprimé entre la résolution et l'INSERT: nouvelle résolution, nouvel essai
+FK_RETRIES = 1
+# par lot: résolution départements + postes, verrou des photos du store, INSERT multi-lignes,
+# références des photos (x nombre d'essais)
+BATCH_QUERY_BUDGET = 5 * (1 + FK_RETRIES)
+
+REFERENCE_CONSTRAINTS = {"employees_department_id_fkey", "employees_position_id_fkey"}
+
+CSV_COLUMNS = ["first_name", "last_name", "email", "department", "position", "hire_date", "status", "photo_url"]
+
+
+def _format_validation_error(e: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors())
+
+
+def _resolve_refs(db: Session, model, label_col, refs: set[str]) -> dict[str, uuid.UUID | None]:
+    """
+    Résout en une requête des références données soit par id, soit par libellé.
+    Retourne {référence telle que fournie: id ou None si inconnue}.
+    """
+    ids: dict[str, uuid.UUID] = {}
+    labels: set[str] = set()
+    for ref in refs:
+        try:
+            ids[ref] = uuid.UUID(ref)
+        except ValueError:
+            labels.add(ref)
+
+    stmt = select(model.id, label_col).where(or_(model.id.in_(ids.values()), label_col.in_(labels)))
+    by_id, by_label = {}, {}
+    for obj_id, label in db.execute(stmt):
+        by_id[obj_id] = obj_id
+        by_label[label] = obj_id
+
+    return {ref: by_id.get(ids[ref]) if ref in ids else by_label.get(ref) for ref in refs}
+
+
+def _lock_media(db: Session, urls: set[str]) -> set[str]:
+    """
+    Photos du store (/media/...) déjà référencées, verrouillées jusqu'au commit du lot:
+    un release concurrent attend, le fichier ne disparaît pas sous l'import.
+    """
+    if not urls:
+        return set()
+    return set(db.scalars(select(MediaObject.path).where(MediaObject.path.in_(urls)).with_for_update()))
+
+
+def _acquire_media(db: Session, urls: list[str]) -> None:
+    """Une référence par employé inséré, dans la transaction du lot (comme MediaService.acquire)."""
+    counts: dict[str, int] = {}
+    for url in urls:
+        counts[url] = counts.get(url, 0) + 1
+    if not counts:
+        return
+    table = MediaObject.__table__
+    db.execute(
+        update(table)
+        .where(table.c.path == bindparam("url"))
+        .values(ref_count=table.c.ref_count + bindparam("count"), updated_at=func.now()),
+        [{"url": url, "count": count} for url, count in counts.items()],
+    )
+
+
+class EmployeeImportService:
+    @staticmethod
+    def parse_line(fmt: str, header: list[str] | None, line: str) -> dict:
+        if fmt == "ndjson":
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError("Expected a JSON object")
+            return record
+
+        values = next(csv.reader([line]))
+        if len(values) != len(header):
+            raise ValueError(f"Expected {len(header)} columns, got {len(values)}")
+        # cellules vides => valeur par défaut du schéma
+        return {k: v for k, v in zip(header, values) if v != ""}
+
+    @staticmethod
+    def import_batch(
+        db: Session,
+        fmt: str,
+        header: list[str] | None,
+        lines: list[tuple[int, str]],
+    ) -> tuple[int, list[EmployeeImportError]]:
+        errors: list[EmployeeImportError] = []
+
+        #parse + validation
+        rows: list[tuple[int, EmployeeImportRow]] = []
+        for line_no, line in lines:
+            try:
+                row = EmployeeImportRow.model_validate(EmployeeImportService.parse_line(fmt, header, line))
+            except ValidationError as e:
+                errors.append(EmployeeImportError(line=line_no, error=_format_validation_error(e)))
+                continue
+            except ValueError as e:
+                errors.append(EmployeeImportError(line=line_no, error=str(e)))
+                continue
+            row.email = row.email.lower()
+            rows.append((line_no, row))
+
+        if not rows:
+            return 0, errors
+
+        #unique email: doublons dans le lot
+        candidates: list[tuple[int, EmployeeImportRow]] = []
+        lines_by_email: dict[str, int] = {}
+        for line_no, row in rows:
+            if row.email in lines_by_email:
+                errors.append(EmployeeImportError(line=line_no, error=f"Duplicate email '{row.email}' in file."))
+                continue
+            lines_by_email[row.email] = line_no
+            candidates.append((line_no, row))
+
+        inserted: set[str] = set()
+        for attempt in range(FK_RETRIES + 1):
+            #FK: une requête par table pour tout le lot
+            departments = _resolve_refs(db, Department, Department.name, {r.department for _, r in candidates})
+            positions = _resolve_refs(db, Position, Position.title, {r.position for _, r in candidates})
+            # photo du store: même fichier qu'un employé existant, référence prise comme à l'upload
+            media = _lock_media(db, {r.photo_url for _, r in candidates if is_media_url(r.photo_url)})
+
+            values: list[dict] = []
+            resolved: list[tuple[int, EmployeeImportRow]] = []
+            for line_no, row in candidates:
+                if departments[row.department] is None:
+                    errors.append(EmployeeImportError(line=line_no, error=f"Department '{row.department}' does not exist."))
+                    continue
+                if positions[row.position] is None:
+                    errors.append(EmployeeImportError(line=line_no, error=f"Position '{row.position}' does not exist."))
+                    continue
+                if is_media_url(row.photo_url) and row.photo_url not in media:
+                    errors.append(EmployeeImportError(line=line_no, error=f"Photo '{row.photo_url}' is not in the media store."))
+                    continue
+                resolved.append((line_no, row))
+                values.append(
+                    dict(
+                        id=uuid.uuid4(),
+                        first_name=row.first_name,
+                        last_name=row.last_name,
+                        email=row.email,
+                        department_id=departments[row.department],
+                        position_id=positions[row.position],
+                        photo_url=row.photo_url,
+                        hire_date=row.hire_date,
+                        status=row.status,
+                    )
+                )
+            candidates = resolved
+
+            if not values:
+                break
+
+            #un seul INSERT multi-lignes; la contrainte unique tranche pour les emails déjà en base
+            stmt = (
+                insert(Employee)
+                .values(values)
+                .on_conflict_do_nothing(index_elements=[Employee.email])
+                .returning(Employee.email, Employee.photo_url)
+            )
+            try:
+                returned = db.execute(stmt).all()
+                _acquire_media(db, [url for _, url in returned if is_media_url(url)])
+                db.commit()
+                inserted = {email for email, _ in returned}
+                break
+            except IntegrityError as e:
+                # lot annulé; les lots précédents restent validés
+                db.rollback()
+                if constraint_name(e) not in REFERENCE_CONSTRAINTS:
+                    raise
+                if attempt == FK_RETRIES:
+                    errors.extend(
+                        EmployeeImportError(line=line_no, error="Department or position was deleted during import.")
+                        for line_no, _ in candidates
+                    )
+                    candidates = []
+
+        for line_no, row in candidates:
+            if row.email not in inserted:
+                errors.append(EmployeeImportError(line=line_no, error=f"Employee with email '{row.email}' already exists."))
+
+        errors.sort(key=lambda e: e.line)
+        return len(inserted), errors
+
+
+async def _iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple[int, str]]:
+    """Découpe le flux en lignes numérotées sans jamais garder plus d'une ligne en mémoire."""
+    buffer = b""
+    line_no = 0
+    async for chunk in chunks:
+        buffer += chunk
+        *complete, buffer = buffer.split(b"\n")
+        for raw in complete:
+            line_no += 1
+            yield line_no, raw.decode("utf-8-sig" if line_no == 1 else "utf-8").rstrip("\r")
+        if len(buffer) > MAX_LINE_BYTES:
+            raise ValueError(f"Line {line_no + 1} exceeds {MAX_LINE_BYTES} bytes")
+    if buffer:
+        line_no += 1
+        yield line_no, buffer.decode("utf-8-sig" if line_no == 1 else "utf-8").rstrip("\r")
+
+
+async def import_employees(db: AsyncSession, chunks: AsyncIterator[bytes], fmt: str) -> EmployeeImportReport:
+    report = EmployeeImportReport()
+
+    def record(inserted: int, errors: list[EmployeeImportError]) -> None:
+        report.inserted += inserted
+        report.failed += len(errors)
+        room = MAX_REPORTED_ERRORS - len(report.errors)
+        report.errors.extend(errors[:room])
+        if len(errors) > room:
+            report.errors_truncated = True
+
+    async def flush(batch: list[tuple[int, str]]) -> None:
+        with query_budget(BATCH_QUERY_BUDGET, "employee import batch"):
+            record(*await db.run_sync(EmployeeImportService.import_batch, fmt, header, batch))
+
+    header: list[str] | None = None
+    batch: list[tuple[int, str]] = []
+    try:
+        async for line_no, line in _iter_lines(chunks):
+            if not line.strip():
+                continue
+            if fmt == "csv" and header is None:
+                header = [h.strip().lower() for h in next(csv.reader([line]))]
+                unknown = set(header) - set(CSV_COLUMNS)
+                if unknown:
+                    raise ValueError(f"Unknown CSV columns: {', '.join(sorted(unknown))}")
+                continue
+            batch.append((line_no, line))
+            if len(batch) >= BATCH_SIZE:
+                await flush(batch)
+                batch = []
+        if batch:
+            await flush(batch)
+    except (ValueError, UnicodeDecodeError) as e:
+        # erreur de flux: les lots précédents sont déjà validés, on arrête ici
+        record(0, [EmployeeImportError(line=0, error=str(e))])
+
+    return report
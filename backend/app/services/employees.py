@@ -1,56 +1,262 @@
 import uuid
-from datetime import date
-from sqlalchemy import select, or_
-from sqlalchemy.orm import Session, joinedload
+from datetime import date, datetime, timedelta
+from typing import NoReturn
+from sqlalchemy import any_, bindparam, delete, select, func, tuple_, union_all, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased, joinedload, load_only
+from pydantic import BaseModel
 
 
+from app.db.errors import constraint_name
 from app.models.employee import Employee
+from app.models.employee_archive import ArchivedEmployee
 from app.models.department import Department
 from app.models.position import Position
+from app.schemas.department import DepartmentOut
+from app.schemas.employee import (
+    EmployeeBulkChanges,
+    EmployeeBulkResult,
+    EmployeeDetailOut,
+    EmployeeListOut,
+    EmployeeUpdate,
+)
+from app.schemas.position import PositionOut
+from app.services.department import DepartmentService
+from app.services.position import PositionService
+from app.utils.fields import field_dependencies
+from app.utils.media import photo_variant_url
+
+COMPACT_COLUMNS = (
+    Employee.id,
+    Employee.first_name,
+    Employee.last_name,
+    Employee.email,
+    Employee.status,
+    Employee.photo_url,
+    Employee.department_id,
+    Employee.position_id,
+    Employee.created_at,
+    Employee.updated_at,
+)
+
+# statut archivé par app.jobs.archive_employees
+ARCHIVED_STATUS = "terminated"
+# colonnes déplacées telles quelles entre employees et employees_archive (search_text recalculée)
+MOVED_COLUMNS = [column.name for column in Employee.__table__.columns if column.computed is None]
+
+# employés actifs + archivés, vus comme des Employee (include_archived=True)
+EMPLOYEES_WITH_ARCHIVE = aliased(
+    Employee,
+    union_all(
+        select(*Employee.__table__.columns),
+        select(*(ArchivedEmployee.__table__.c[column.name] for column in Employee.__table__.columns)),
+    ).subquery("employees_with_archive"),
+)
+
+
+def _search_tokens(q: str) -> list[str]:
+    # échappe les jokers LIKE pour que "_" ou "%" soient cherchés littéralement
+    cleaned = q.strip().lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return cleaned.split()
+
+
+def _included(db: Session, service, ids: set[uuid.UUID]) -> dict[str, dict | None]:
+    if not ids:
+        return {}
+    cached = {ref.id: ref for ref in service.list_cached(db)}
+    included = {}
+    for ref_id in ids:
+        # créé depuis la mise en cache de la liste: lecture unitaire
+        ref = cached.get(ref_id) or service.get_cached(db, ref_id)
+        included[str(ref_id)] = ref.model_dump() if ref else None
+    return included
+
+
+def _check_refs(
+    db: Session, department_id: uuid.UUID | None, position_id: uuid.UUID | None
+) -> tuple[DepartmentOut | None, PositionOut | None]:
+    department = position = None
+    if department_id is not None:
+        department = DepartmentService.get_cached(db, department_id)
+        if department is None:
+            raise ValueError(f"Department does not exist.")
+    if position_id is not None:
+        position = PositionService.get_cached(db, position_id)
+        if position is None:
+            raise ValueError(f"Position does not exist.")
+    return department, position
+
+
+def _raise_conflict(error: IntegrityError, email: str | None = None) -> NoReturn:
+    # département / poste supprimé depuis sa mise en cache, email déjà pris
+    name = constraint_name(error)
+    if name == "employees_department_id_fkey":
+        raise ValueError(f"Department does not exist.")
+    if name == "employees_position_id_fkey":
+        raise ValueError(f"Position does not exist.")
+    if name == "employees_email_key" and email:
+        raise ValueError(f"Employee with email '{email}' already exists.")
+    raise error
+
+
+def _detail_out(emp: Employee, department: DepartmentOut, position: PositionOut) -> EmployeeDetailOut:
+    return EmployeeDetailOut.model_validate(
+        {
+            **{name: getattr(emp, name) for name in EmployeeDetailOut.model_fields if name not in ("department", "position")},
+            "department": department,
+            "position": position,
+        }
+    )
 
 
 class EmployeeService:
     @staticmethod
-    def get(db: Session, employee_id: uuid.UUID) -> Employee | None:
+    def source(include_archived: bool = False):
+        """Entité interrogée: la table active seule, ou l'union avec employees_archive."""
+        return EMPLOYEES_WITH_ARCHIVE if include_archived else Employee
+
+    @staticmethod
+    def apply_filters(
+        stmt,
+        *,
+        entity=Employee,
+        department_id: uuid.UUID | None = None,
+        position_id: uuid.UUID | None = None,
+        q: str | None = None,
+    ):
+        if department_id:
+            stmt = stmt.where(entity.department_id == department_id)
+
+        if position_id:
+            stmt = stmt.where(entity.position_id == position_id)
+
+        # chaque mot doit apparaître dans search_text (index GIN pg_trgm)
+        if q:
+            for token in _search_tokens(q):
+                stmt = stmt.where(entity.search_text.like(f"%{token}%", escape="\\"))
+
+        return stmt
+
+    @staticmethod
+    def load_options(model: type[BaseModel], fields: frozenset[str] | None, entity=Employee) -> list:
+        """Colonnes et jointures nécessaires à la vue `fields` (None: employé complet)."""
+        if fields is None:
+            return [joinedload(entity.department), joinedload(entity.position)]
+
+        needed = field_dependencies(model, fields)
+        # last_name: clé du curseur de pagination
+        columns = {"last_name"} | (needed - {"department", "position"})
+        options = [load_only(*(getattr(entity, name) for name in columns))]
+        if "department" in needed:
+            options.append(joinedload(entity.department))
+        if "position" in needed:
+            options.append(joinedload(entity.position))
+        return options
+
+    @staticmethod
+    def get(db: Session, employee_id: uuid.UUID, fields: frozenset[str] | None = None) -> Employee | None:
+        stmt = (
+            select(Employee)
+            .options(*EmployeeService.load_options(EmployeeDetailOut, fields))
+            .where(Employee.id == employee_id)
+        )
+        return db.execute(stmt).scalar_one_or_none()
+
+    @staticmethod
+    def get_many(db: Session, ids: list[uuid.UUID]) -> tuple[list[Employee], list[uuid.UUID]]:
+        """
+        Employés demandés en une requête (id = ANY(:ids), un seul paramètre tableau),
+        dans l'ordre de `ids`; renvoie aussi les ids introuvables.
+        """
+        wanted = list(dict.fromkeys(ids))
         stmt = (
             select(Employee)
             .options(joinedload(Employee.department), joinedload(Employee.position))
+            .where(Employee.id == any_(bindparam("ids", wanted, type_=ARRAY(UUID(as_uuid=True)))))
+        )
+        found = {emp.id: emp for emp in db.execute(stmt).scalars()}
+        return [found[i] for i in wanted if i in found], [i for i in wanted if i not in found]
+
+    @staticmethod
+    def last_modified(db: Session, employee_id: uuid.UUID) -> datetime | None:
+        """
+        Dernière modification de l'employé ou de son département / poste (embarqués
+        dans la réponse). None si l'employé n'existe pas.
+        """
+        stmt = (
+            select(func.greatest(Employee.updated_at, Department.updated_at, Position.updated_at))
+            .join(Department, Department.id == Employee.department_id)
+            .join(Position, Position.id == Employee.position_id)
             .where(Employee.id == employee_id)
         )
         return db.execute(stmt).scalar_one_or_none()
 
     @staticmethod
-    def list(
-        db: Session,
+    def page(
+        stmt,
         *,
+        entity=Employee,
         department_id: uuid.UUID | None = None,
         position_id: uuid.UUID | None = None,
         q: str | None = None,
         limit: int = 20,
         offset: int = 0,
-    ) -> list[Employee]:
-        stmt = select(Employee).options(joinedload(Employee.department), joinedload(Employee.position))
+        after: tuple[str, uuid.UUID] | None = None,
+    ):
+        """Filtres, tri et pagination de la liste, communs à toutes les vues."""
+        stmt = EmployeeService.apply_filters(
+            stmt, entity=entity, department_id=department_id, position_id=position_id, q=q
+        )
 
-        if department_id:
-            stmt = stmt.where(Employee.department_id == department_id)
+        # keyset: reprend strictement après (last_name, id) du dernier élément vu
+        if after:
+            stmt = stmt.where(tuple_(entity.last_name, entity.id) > tuple_(*after))
 
-        if position_id:
-            stmt = stmt.where(Employee.position_id == position_id)
+        # recherche: les plus pertinents d'abord (similarité trigramme)
+        if q and q.strip():
+            stmt = stmt.order_by(func.similarity(entity.search_text, q.strip().lower()).desc())
 
-        if q:
-            like = f"%{q.strip()}%"
-            stmt = stmt.where(
-                or_(
-                    Employee.first_name.ilike(like),
-                    Employee.last_name.ilike(like),
-                    Employee.email.ilike(like),
-                )
-            )
+        # id en second critère pour un ordre stable (index ix_employees_last_name_id)
+        return stmt.order_by(entity.last_name.asc(), entity.id.asc()).limit(limit).offset(offset)
 
-        stmt = stmt.order_by(Employee.last_name.asc()).limit(limit).offset(offset)
-        result = db.execute(stmt).scalars().all()
+    @staticmethod
+    def list(
+        db: Session,
+        fields: frozenset[str] | None = None,
+        include_archived: bool = False,
+        **filters,
+    ) -> list[Employee]:
+        entity = EmployeeService.source(include_archived)
+        stmt = select(entity).options(*EmployeeService.load_options(EmployeeListOut, fields, entity))
+        result = db.execute(EmployeeService.page(stmt, entity=entity, **filters)).scalars().all()
         return result
 
+    @staticmethod
+    def list_compact(db: Session, include_archived: bool = False, **filters) -> dict:
+        """
+        Vue compacte: colonnes seulement (pas d'entités ORM ni de jointure), chaque
+        département / poste une seule fois dans "included", depuis le cache mémoire.
+        Dictionnaires prêts pour orjson, sans passer par Pydantic ligne par ligne.
+        """
+        entity = EmployeeService.source(include_archived)
+        columns = [getattr(entity, column.key) for column in COMPACT_COLUMNS]
+        stmt = EmployeeService.page(select(*columns), entity=entity, **filters)
+        data = []
+        for row in db.execute(stmt).mappings():
+            item = dict(row)
+            item["photo_thumb_url"] = photo_variant_url(row["photo_url"], "thumb")
+            item["photo_medium_url"] = photo_variant_url(row["photo_url"], "medium")
+            data.append(item)
+
+        included = {
+            "departments": _included(db, DepartmentService, {item["department_id"] for item in data}),
+            "positions": _included(db, PositionService, {item["position_id"] for item in data}),
+        }
+        return {"data": data, "included": included}
+
     @staticmethod
     def create(
         db: Session,
@@ -63,31 +269,262 @@ class EmployeeService:
         photo_url: str,
         hire_date: date | None = None,
         status: str = "active",
-    ) -> Employee:
-        #verify FK existence
-        if not db.get(Department, department_id):
-            raise ValueError(f"Department does not exist.")
-        if not db.get(Position, position_id):
-            raise ValueError(f"Position does not exist.")
+    ) -> EmployeeDetailOut:
+        #verify FK existence (cache mémoire, la contrainte FK reste l'arbitre)
+        department, position = _check_refs(db, department_id, position_id)
 
-        #unique email check
-        exists = db.execute(select(Employee).where(Employee.email == email)).scalar_one_or_none()
-        if exists:
+        #unique email: la contrainte tranche, la ligne revient via RETURNING
+        stmt = (
+            insert(Employee)
+            .values(
+                first_name=first_name,
+                last_name=last_name,
+                email=email,
+                department_id=department_id,
+                position_id=position_id,
+                photo_url=photo_url,
+                hire_date=hire_date,
+                status="active",
+            )
+            .on_conflict_do_nothing(index_elements=[Employee.email])
+            .returning(Employee)
+        )
+        try:
+            emp = db.scalars(stmt).one_or_none()
+        except IntegrityError as e:
+            db.rollback()
+            _raise_conflict(e)
+        if emp is None:
+            db.rollback()
             raise ValueError(f"Employee with email '{email}' already exists.")
 
-        emp = Employee(
-            first_name=first_name,
-            last_name=last_name,
-            email=email,
-            department_id=department_id,
-            position_id=position_id,
-            photo_url=photo_url,
-            hire_date=hire_date,
-            status="active",
+        #relations depuis le cache: pas de re-lecture avec jointures
+        out = _detail_out(emp, department, position)
+        db.commit()
+        return out
+
+    @staticmethod
+    def update(db: Session, employee_id: uuid.UUID, data: EmployeeUpdate) -> EmployeeDetailOut | None:
+        # None explicite: seul hire_date peut être effacé
+        changes = {k: v for k, v in data.model_dump(exclude_unset=True).items() if v is not None or k == "hire_date"}
+        if "email" in changes:
+            changes["email"] = changes["email"].lower()
+        _check_refs(db, changes.get("department_id"), changes.get("position_id"))
+
+        if changes:
+            stmt = (
+                update(Employee)
+                .where(Employee.id == employee_id)
+                .values(**changes)
+                .returning(Employee)
+                .execution_options(populate_existing=True)
+            )
+        else:
+            stmt = select(Employee).where(Employee.id == employee_id)
+        try:
+            emp = db.scalars(stmt).one_or_none()
+        except IntegrityError as e:
+            db.rollback()
+            _raise_conflict(e, changes.get("email"))
+        if emp is None:
+            db.rollback()
+            return None
+
+        out = _detail_out(
+            emp,
+            DepartmentService.get_cached(db, emp.department_id),
+            PositionService.get_cached(db, emp.position_id),
+        )
+        db.commit()
+        return out
+
+    @staticmethod
+    def replace_photo(
+        db: Session, employee_id: uuid.UUID, photo_url: str
+    ) -> tuple[EmployeeDetailOut | None, str | None]:
+        """Remplace la photo. Retourne (employé, ancienne URL: référence à libérer), (None, None) s'il n'existe pas."""
+        # ancienne valeur lue sous verrou dans le même UPDATE
+        old = select(Employee.id, Employee.photo_url).where(Employee.id == employee_id).with_for_update().subquery("old")
+        stmt = (
+            update(Employee)
+            .where(Employee.id == old.c.id)
+            .values(photo_url=photo_url)
+            .returning(Employee, old.c.photo_url)
+            .execution_options(populate_existing=True)
+        )
+        row = db.execute(stmt).one_or_none()
+        if row is None:
+            db.rollback()
+            return None, None
+
+        emp, old_photo_url = row
+        out = _detail_out(
+            emp,
+            DepartmentService.get_cached(db, emp.department_id),
+            PositionService.get_cached(db, emp.position_id),
+        )
+        db.commit()
+        return out, old_photo_url
+
+    @staticmethod
+    def delete(db: Session, employee_id: uuid.UUID) -> str | None:
+        """Supprime l'employé. Retourne l'URL de sa photo (référence à libérer), None s'il n'existe pas."""
+        photo_url = db.scalar(delete(Employee).where(Employee.id == employee_id).returning(Employee.photo_url))
+        db.commit()
+        return photo_url
+
+    @staticmethod
+    def bulk_update(
+        db: Session,
+        changes: EmployeeBulkChanges,
+        *,
+        ids: "list[uuid.UUID] | None" = None,
+        **filters,
+    ) -> EmployeeBulkResult:
+        """
+        Un seul UPDATE ensembliste (une transaction) sur une liste d'ids ou sur les
+        filtres de list(); les départements / postes cibles sont vérifiés une fois.
+        """
+        values = changes.model_dump(exclude_none=True)
+        _check_refs(db, values.get("department_id"), values.get("position_id"))
+
+        stmt = update(Employee).values(**values).returning(Employee.id)
+        if ids is not None:
+            wanted = list(dict.fromkeys(ids))
+            stmt = stmt.where(Employee.id == any_(bindparam("ids", wanted, type_=ARRAY(UUID(as_uuid=True)))))
+        else:
+            stmt = EmployeeService.apply_filters(stmt, **filters)
+            # garde-fou en plus du schéma: jamais d'UPDATE sans WHERE
+            if stmt.whereclause is None:
+                raise ValueError("filter must select employees")
+        # pas d'entités à resynchroniser: session fraîche, seuls les ids reviennent
+        stmt = stmt.execution_options(synchronize_session=False)
+
+        try:
+            updated = set(db.execute(stmt).scalars())
+        except IntegrityError as e:
+            db.rollback()
+            _raise_conflict(e)
+        db.commit()
+
+        missing = [i for i in wanted if i not in updated] if ids is not None else []
+        return EmployeeBulkResult(updated=len(updated), missing=missing)
+
+    @staticmethod
+    def archive_batch(db: Session, older_than: timedelta, batch_size: int) -> int:
+        """
+        Déplace vers employees_archive au plus `batch_size` employés terminés depuis
+        `older_than` (updated_at), en un seul statement DELETE ... RETURNING -> INSERT.
+        SKIP LOCKED: plusieurs movers, ou une écriture concurrente, ne se bloquent pas.
+        La référence à la photo suit la ligne (restore la rend à l'employé): pas de release ici.
+        """
+        candidates = (
+            select(Employee.id)
+            .where(Employee.status == ARCHIVED_STATUS, Employee.updated_at < func.now() - older_than)
+            .order_by(Employee.updated_at.asc())
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        moved = (
+            delete(Employee)
+            .where(Employee.id.in_(candidates.scalar_subquery()))
+            .returning(*(Employee.__table__.c[name] for name in MOVED_COLUMNS))
+            .cte("moved")
+        )
+        stmt = (
+            insert(ArchivedEmployee)
+            .from_select(MOVED_COLUMNS, select(*(moved.c[name] for name in MOVED_COLUMNS)))
+            .add_cte(moved)
+            .returning(ArchivedEmployee.id)
         )
-        db.add(emp)
+        count = len(db.execute(stmt).all())
         db.commit()
-        db.refresh(emp)
+        return count
 
-        #load relationships
-        return EmployeeService.get(db, emp.id)
+    @staticmethod
+    def restore(db: Session, employee_id: uuid.UUID) -> EmployeeDetailOut | None:
+        """
+        Remet un employé archivé dans employees (statut inchangé). None s'il n'est pas archivé.
+        updated_at repart de maintenant: sinon, toujours terminé et ancien, il repartirait
+        au prochain archive_batch.
+        """
+        moved = (
+            delete(ArchivedEmployee)
+            .where(ArchivedEmployee.id == employee_id)
+            .returning(*(ArchivedEmployee.__table__.c[name] for name in MOVED_COLUMNS))
+            .cte("moved")
+        )
+        restored = [func.now() if name == "updated_at" else moved.c[name] for name in MOVED_COLUMNS]
+        stmt = (
+            insert(Employee)
+            .from_select(MOVED_COLUMNS, select(*restored))
+            .add_cte(moved)
+            .returning(Employee)
+        )
+        try:
+            emp = db.scalars(stmt).one_or_none()
+        except IntegrityError as e:
+            db.rollback()
+            # adresse réattribuée à un employé actif entre-temps
+            _raise_conflict(e, db.scalar(select(ArchivedEmployee.email).where(ArchivedEmployee.id == employee_id)))
+        if emp is None:
+            db.rollback()
+            return None
+
+        out = _detail_out(
+            emp,
+            DepartmentService.get_cached(db, emp.department_id),
+            PositionService.get_cached(db, emp.position_id),
+        )
+        db.commit()
+        return out
+
+
+class AsyncEmployeeService:
+    """Variante async: exécute EmployeeService sur la connexion async (greenlet, pas de thread)."""
+
+    @staticmethod
+    async def get(db: AsyncSession, employee_id: uuid.UUID, fields: frozenset[str] | None = None) -> Employee | None:
+        return await db.run_sync(EmployeeService.get, employee_id, fields)
+
+    @staticmethod
+    async def get_many(db: AsyncSession, ids: list[uuid.UUID]) -> tuple[list[Employee], list[uuid.UUID]]:
+        return await db.run_sync(EmployeeService.get_many, ids)
+
+    @staticmethod
+    async def last_modified(db: AsyncSession, employee_id: uuid.UUID) -> datetime | None:
+        return await db.run_sync(EmployeeService.last_modified, employee_id)
+
+    @staticmethod
+    async def list(db: AsyncSession, **filters) -> list[Employee]:
+        return await db.run_sync(EmployeeService.list, **filters)
+
+    @staticmethod
+    async def list_compact(db: AsyncSession, **filters) -> dict:
+        return await db.run_sync(EmployeeService.list_compact, **filters)
+
+    @staticmethod
+    async def create(db: AsyncSession, **fields) -> EmployeeDetailOut:
+        return await db.run_sync(EmployeeService.create, **fields)
+
+    @staticmethod
+    async def update(db: AsyncSession, employee_id: uuid.UUID, data: EmployeeUpdate) -> EmployeeDetailOut | None:
+        return await db.run_sync(EmployeeService.update, employee_id, data)
+
+    @staticmethod
+    async def bulk_update(db: AsyncSession, changes: EmployeeBulkChanges, **selector) -> EmployeeBulkResult:
+        return await db.run_sync(EmployeeService.bulk_update, changes, **selector)
+
+    @staticmethod
+    async def replace_photo(
+        db: AsyncSession, employee_id: uuid.UUID, photo_url: str
+    ) -> tuple[EmployeeDetailOut | None, str | None]:
+        return await db.run_sync(EmployeeService.replace_photo, employee_id, photo_url)
+
+    @staticmethod
+    async def delete(db: AsyncSession, employee_id: uuid.UUID) -> str | None:
+        return await db.run_sync(EmployeeService.delete, employee_id)
+
+    @staticmethod
+    async def restore(db: AsyncSession, employee_id: uuid.UUID) -> EmployeeDetailOut | None:
+        return await db.run_sync(EmployeeService.restore, employee_id)
@@ -0,0 +1,69 @@
+from fastapi import UploadFile
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+
+from app.models.media import MediaObject
+from app.utils.media import read_upload, photo_url_for, write_employee_photo, delete_employee_photo, media_path
+
+
+class MediaService:
+    @staticmethod
+    def acquire(db: Session, url: str) -> None:
+        stmt = (
+            insert(MediaObject)
+            .values(path=url, ref_count=1)
+            .on_conflict_do_update(
+                index_elements=[MediaObject.path],
+                set_={"ref_count": MediaObject.ref_count + 1, "updated_at": func.now()},
+            )
+        )
+        db.execute(stmt)
+        db.commit()
+
+    @staticmethod
+    def release(db: Session, url: str) -> None:
+        obj = db.execute(
+            select(MediaObject).where(MediaObject.path == url).with_for_update()
+        ).scalar_one_or_none()
+        if obj is None:
+            # fichier non géré par le store (URL externe, import)
+            db.rollback()
+            return
+
+        obj.ref_count -= 1
+        if obj.ref_count <= 0:
+            db.delete(obj)
+            # suppression sous verrou: un acquire concurrent attend le commit puis réécrit le fichier
+            delete_employee_photo(media_path(url))
+        db.commit()
+
+
+class AsyncMediaService:
+    @staticmethod
+    async def acquire(db: AsyncSession, url: str) -> None:
+        await db.run_sync(MediaService.acquire, url)
+
+    @staticmethod
+    async def release(db: AsyncSession, url: str) -> None:
+        await db.run_sync(MediaService.release, url)
+
+    @staticmethod
+    async def store_photo(db: AsyncSession, file: UploadFile) -> str:
+        """
+        Enregistre la photo sous son hash (dédupliquée) et prend une référence.
+        Retourne l'URL publique; à libérer via release si l'employé n'est pas créé.
+        """
+        content, content_type = await read_upload(file)
+        url = photo_url_for(content, content_type)
+
+        # référence d'abord: un release concurrent ne peut plus supprimer le fichier
+        await AsyncMediaService.acquire(db, url)
+        try:
+            await write_employee_photo(url, content)
+        except ValueError:
+            await AsyncMediaService.release(db, url)
+            raise
+        return url
@@ -1,9 +1,16 @@
 import uuid
-from sqlalchemy import select
+from datetime import datetime
+from sqlalchemy import delete, func, literal_column, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.models.position import Position
-from app.schemas.position import PositionCreate, PositionUpdate
+from app.schemas.position import PositionCreate, PositionOut, PositionUpdate
+from app.core.cache import position_cache
+from app.db.replicas import is_replica
+from app.db.errors import constraint_name
 
 class PositionService:
     @staticmethod
@@ -16,31 +23,147 @@ class PositionService:
     def get(db: Session, position_id: uuid.UUID) -> Position | None:
         return db.get(Position, position_id)
 
+    @staticmethod
+    def list_cached(db: Session) -> "list[PositionOut]":
+        return position_cache.load(
+            "list", lambda: [PositionOut.model_validate(obj) for obj in PositionService.list(db)],
+            store=not is_replica(db),
+        )
+
+    @staticmethod
+    def get_cached(db: Session, position_id: uuid.UUID) -> PositionOut | None:
+        def load() -> PositionOut | None:
+            obj = PositionService.get(db, position_id)
+            return PositionOut.model_validate(obj) if obj else None
+
+        return position_cache.load(position_id, load, store=not is_replica(db))
+
+    @staticmethod
+    def fingerprint(db: Session) -> tuple[int, datetime | None]:
+        def load() -> tuple[int, datetime | None]:
+            count, last_modified = db.execute(select(func.count(), func.max(Position.updated_at))).one()
+            return count, last_modified
+
+        return position_cache.load("fingerprint", load, store=not is_replica(db))
+
+    @staticmethod
+    def exists(db: Session, position_id: uuid.UUID) -> bool:
+        return PositionService.get_cached(db, position_id) is not None
+
     @staticmethod
     def create(db: Session, data: PositionCreate) -> Position:
-        exists = db.execute(select(Position).where(Position.title == data.title)).scalar_one_or_none()
-        if exists:
+        # la contrainte unique tranche: pas de SELECT préalable, la ligne revient via RETURNING
+        stmt = (
+            insert(Position)
+            .values(title=data.title)
+            .on_conflict_do_nothing(index_elements=[Position.title])
+            .returning(Position)
+        )
+        obj = db.scalars(stmt).one_or_none()
+        if obj is None:
+            db.rollback()
             raise ValueError(f"Position with title '{data.title}' already exists.")
 
-        obj = Position(title=data.title)
-        db.add(obj)
         db.commit()
-        db.refresh(obj)
+        position_cache.invalidate()
         return obj
 
     @staticmethod
-    def update(db: Session, obj: Position, data: PositionUpdate) -> Position:
-        if data.title is not None and data.title != obj.title:
-            exists = db.execute(select(Position).where(Position.title == data.title)).scalar_one_or_none()
-            if exists:
+    def upsert(db: Session, data: PositionCreate) -> tuple[Position, bool]:
+        """Crée ou met à jour par title. Retourne (objet, créé?)."""
+        stmt = insert(Position).values(title=data.title)
+        stmt = (
+            stmt.on_conflict_do_update(
+                index_elements=[Position.title],
+                set_={"updated_at": func.now()},
+            )
+            # xmax = 0 uniquement pour une ligne fraîchement insérée
+            .returning(Position, literal_column("xmax = 0").label("inserted"))
+            .execution_options(populate_existing=True)
+        )
+        obj, inserted = db.execute(stmt).one()
+        db.commit()
+        position_cache.invalidate()
+        return obj, inserted
+
+    @staticmethod
+    def update(db: Session, position_id: uuid.UUID, data: PositionUpdate) -> Position | None:
+        changes = data.model_dump(exclude_none=True)
+        if not changes:
+            return PositionService.get(db, position_id)
+
+        stmt = (
+            update(Position)
+            .where(Position.id == position_id)
+            .values(**changes)
+            .returning(Position)
+            .execution_options(populate_existing=True)
+        )
+        try:
+            obj = db.scalars(stmt).one_or_none()
+            db.commit()
+        except IntegrityError as e:
+            db.rollback()
+            if constraint_name(e) == "positions_title_key":
                 raise ValueError(f"Position with title '{data.title}' already exists.")
-            obj.title = data.title
+            raise
 
-        db.commit()
-        db.refresh(obj)
+        position_cache.invalidate()
         return obj
 
     @staticmethod
-    def delete(db: Session, obj: Position) -> None:
-        db.delete(obj)
-        db.commit()
+    def delete(db: Session, position_id: uuid.UUID) -> bool:
+        stmt = delete(Position).where(Position.id == position_id).returning(Position.id)
+        try:
+            deleted = db.execute(stmt).scalar_one_or_none()
+            db.commit()
+        except IntegrityError as e:
+            db.rollback()
+            if constraint_name(e) == "employees_position_id_fkey":
+                raise ValueError("Position still has employees.")
+            if constraint_name(e) == "employees_archive_position_id_fkey":
+                raise ValueError("Position still has archived employees.")
+            raise
+
+        position_cache.invalidate()
+        return deleted is not None
+
+
+class AsyncPositionService:
+    """Variante async: exécute PositionService sur la connexion async (greenlet, pas de thread)."""
+
+    @staticmethod
+    async def list(db: AsyncSession) -> list[Position]:
+        return await db.run_sync(PositionService.list)
+
+    @staticmethod
+    async def get(db: AsyncSession, position_id: uuid.UUID) -> Position | None:
+        return await db.get(Position, position_id)
+
+    @staticmethod
+    async def list_cached(db: AsyncSession) -> "list[PositionOut]":
+        return await db.run_sync(PositionService.list_cached)
+
+    @staticmethod
+    async def get_cached(db: AsyncSession, position_id: uuid.UUID) -> PositionOut | None:
+        return await db.run_sync(PositionService.get_cached, position_id)
+
+    @staticmethod
+    async def fingerprint(db: AsyncSession) -> tuple[int, datetime | None]:
+        return await db.run_sync(PositionService.fingerprint)
+
+    @staticmethod
+    async def create(db: AsyncSession, data: PositionCreate) -> Position:
+        return await db.run_sync(PositionService.create, data)
+
+    @staticmethod
+    async def upsert(db: AsyncSession, data: PositionCreate) -> tuple[Position, bool]:
+        return await db.run_sync(PositionService.upsert, data)
+
+    @staticmethod
+    async def update(db: AsyncSession, position_id: uuid.UUID, data: PositionUpdate) -> Position | None:
+        return await db.run_sync(PositionService.update, position_id, data)
+
+    @staticmethod
+    async def delete(db: AsyncSession, position_id: uuid.UUID) -> bool:
+        return await db.run_sync(PositionService.delete, position_id)
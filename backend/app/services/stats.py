@@ -0,0 +1,86 @@
+import uuid
+from collections import Counter
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+
+from app.models.headcount import EmployeeHeadcount
+from app.schemas.stats import HeadcountBucket, HeadcountOut
+from app.services.department import DepartmentService
+from app.services.employees import EmployeeService
+from app.services.position import PositionService
+
+
+class StatsService:
+    @staticmethod
+    def headcount(
+        db: Session,
+        *,
+        department_id: uuid.UUID | None = None,
+        position_id: uuid.UUID | None = None,
+        status: str | None = None,
+        q: str | None = None,
+        include_archived: bool = False,
+    ) -> HeadcountOut:
+        """
+        Effectifs par département, poste et statut, lus dans employee_headcounts
+        (une ligne par combinaison, tenue à jour par trigger) plutôt que sur employees.
+        Recherche texte ou archive: pas de compteur pré-agrégé, comptage sur les employés
+        filtrés comme GET /employees.
+        """
+        if q or include_archived:
+            entity = EmployeeService.source(include_archived)
+            columns = (entity.department_id, entity.position_id, entity.status)
+            stmt = EmployeeService.apply_filters(
+                select(*columns, func.count()),
+                entity=entity,
+                department_id=department_id,
+                position_id=position_id,
+                q=q,
+            )
+            if status:
+                stmt = stmt.where(entity.status == status)
+        else:
+            columns = (EmployeeHeadcount.department_id, EmployeeHeadcount.position_id, EmployeeHeadcount.status)
+            stmt = select(*columns, func.sum(EmployeeHeadcount.headcount)).where(EmployeeHeadcount.headcount > 0)
+            if department_id:
+                stmt = stmt.where(EmployeeHeadcount.department_id == department_id)
+            if position_id:
+                stmt = stmt.where(EmployeeHeadcount.position_id == position_id)
+            if status:
+                stmt = stmt.where(EmployeeHeadcount.status == status)
+
+        # un seul passage, agrégé côté SQL: au plus (#départements + #postes + #statuts) lignes
+        stmt = stmt.group_by(func.grouping_sets(*(tuple_(column) for column in columns)))
+
+        by_department, by_position, by_status = Counter(), Counter(), Counter()
+        for dep_id, pos_id, emp_status, count in db.execute(stmt):
+            if dep_id is not None:
+                by_department[dep_id] = count
+            elif pos_id is not None:
+                by_position[pos_id] = count
+            else:
+                by_status[emp_status] = count
+
+        departments = {d.id: d.name for d in DepartmentService.list_cached(db)}
+        positions = {p.id: p.title for p in PositionService.list_cached(db)}
+
+        return HeadcountOut(
+            total=sum(by_status.values()),
+            by_department=[
+                HeadcountBucket(id=k, label=departments.get(k, ""), headcount=v)
+                for k, v in by_department.most_common()
+            ],
+            by_position=[
+                HeadcountBucket(id=k, label=positions.get(k, ""), headcount=v)
+                for k, v in by_position.most_common()
+            ],
+            by_status=dict(by_status.most_common()),
+        )
+
+
+class AsyncStatsService:
+    @staticmethod
+    async def headcount(db: AsyncSession, **filters) -> HeadcountOut:
+        return await db.run_sync(StatsService.headcount, **filters)
@@ -0,0 +1,74 @@
+import uuid
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+
+from app.models.department import Department
+from app.models.position import Position
+from app.schemas.employee import EmployeeChangesOut, Tombstone
+from app.services.change_feed import ChangeFeedService
+from app.services.employees import EmployeeService
+from app.utils.pagination import encode_sync_token
+
+
+class SyncService:
+    @staticmethod
+    def head_token(db: Session) -> str:
+        return encode_sync_token(ChangeFeedService.head(db))
+
+    @staticmethod
+    def changes(db: Session, after: int, limit: int) -> EmployeeChangesOut:
+        """
+        Delta depuis `after`, lu dans le journal change_events (seq attribué une fois les
+        transactions antérieures terminées, contrairement à updated_at, fixé au début de la
+        transaction). Chaque ligne touchée n'apparaît qu'une fois, dans son état actuel;
+        absente: tombstone.
+        """
+        events = ChangeFeedService.since(db, after, limit=limit + 1)
+        has_more = len(events) > limit
+        events = events[:limit]
+
+        # dernière occurrence de chaque ligne: ordre stable, celui du journal
+        touched: dict[tuple[str, uuid.UUID], None] = {}
+        for event in events:
+            touched.pop((event.entity, event.id), None)
+            touched[(event.entity, event.id)] = None
+        ids = {"employee": [], "department": [], "position": []}
+        for entity, entity_id in touched:
+            ids[entity].append(entity_id)
+
+        employees, gone = EmployeeService.get_many(db, ids["employee"]) if ids["employee"] else ([], [])
+        tombstones = [Tombstone(entity="employee", id=i) for i in gone]
+
+        rows = {}
+        for entity, model in (("department", Department), ("position", Position)):
+            wanted = ids[entity]
+            found = {}
+            if wanted:
+                found = {obj.id: obj for obj in db.scalars(select(model).where(model.id.in_(wanted)))}
+            rows[entity] = [found[i] for i in wanted if i in found]
+            tombstones += [Tombstone(entity=entity, id=i) for i in wanted if i not in found]
+
+        return EmployeeChangesOut(
+            employees=employees,
+            departments=rows["department"],
+            positions=rows["position"],
+            tombstones=tombstones,
+            next=encode_sync_token(events[-1].seq if events else after),
+            has_more=has_more,
+        )
+
+
+class AsyncSyncService:
+    @staticmethod
+    async def head_token(db: AsyncSession) -> str:
+        return await db.run_sync(SyncService.head_token)
+
+    @staticmethod
+    async def is_retained(db: AsyncSession, after: int) -> bool:
+        return await db.run_sync(ChangeFeedService.is_retained, after)
+
+    @staticmethod
+    async def changes(db: AsyncSession, after: int, limit: int) -> EmployeeChangesOut:
+        return await db.run_sync(SyncService.changes, after, limit)
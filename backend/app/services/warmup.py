@@ -0,0 +1,113 @@
+import asyncio
+import logging
+import os
+import time
+from pydantic import TypeAdapter
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import configure_mappers
+
+from app.core.config import settings
+from app.core.metrics import STARTUP_SECONDS
+from app.db.replicas import get_replica_engines
+from app.db.session import AsyncSessionLocal, get_async_engine
+from app.schemas.employee import EmployeeListOut
+from app.services.department import AsyncDepartmentService
+from app.services.employees import AsyncEmployeeService
+from app.services.position import AsyncPositionService
+from app.services.stats import AsyncStatsService
+from app.utils.json_response import FastJSONResponse
+from app.utils.media import get_image_pool
+
+logger = logging.getLogger(__name__)
+
+
+async def fill_pool(engine: AsyncEngine, size: int) -> None:
+    """Ouvre `size` connexions puis les rend au pool: les premières requêtes ne paient plus le connect."""
+    # première connexion seule: initialisation du dialecte (version serveur, types)
+    async with engine.connect():
+        pass
+    connections = await asyncio.gather(*(engine.connect() for _ in range(size)))
+    await asyncio.gather(*(connection.close() for connection in connections))
+
+
+async def warm_queries() -> None:
+    """Lectures représentatives: SQL compilé en cache, caches de référence remplis, sérialisation."""
+    async with AsyncSessionLocal() as db:
+        await AsyncDepartmentService.list_cached(db)
+        await AsyncPositionService.list_cached(db)
+        await AsyncDepartmentService.fingerprint(db)
+        await AsyncPositionService.fingerprint(db)
+        employees = await AsyncEmployeeService.list(db, limit=1)
+        adapter = TypeAdapter(list[EmployeeListOut])
+        adapter.dump_json(adapter.validate_python(employees, from_attributes=True))
+        FastJSONResponse(await AsyncEmployeeService.list_compact(db, limit=1))
+        await AsyncStatsService.headcount(db)
+
+
+async def warm_image_pool() -> None:
+    # un processus par worker d'images, PIL importé
+    loop = asyncio.get_running_loop()
+    await asyncio.gather(*(loop.run_in_executor(get_image_pool(), os.getpid) for _ in range(settings.IMAGE_WORKERS)))
+
+
+async def warm_up() -> dict[str, float]:
+    """Étapes de démarrage et leur durée (secondes)."""
+    timings = {}
+
+    started = time.perf_counter()
+    configure_mappers()
+    timings["mappers"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    await asyncio.gather(
+        fill_pool(get_async_engine(), settings.DB_POOL_SIZE),
+        *(fill_pool(engine, settings.DB_POOL_SIZE) for engine in get_replica_engines()),
+    )
+    timings["pool"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    await warm_queries()
+    timings["queries"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    await warm_image_pool()
+    timings["image_pool"] = time.perf_counter() - started
+
+    return timings
+
+
+async def warm_up_until_ready(state, retry_delay: float = 5.0) -> None:
+    """Tâche de démarrage: réessaie jusqu'au succès (base injoignable, bug...), puis state.ready = True."""
+    while True:
+        try:
+            timings = await warm_up()
+        except Exception:
+            # /ready reste à 503 tant que l'échec se répète: visible, sans tuer la tâche
+            logger.exception("Warm-up failed, retrying in %ss", retry_delay)
+            await asyncio.sleep(retry_delay)
+            continue
+        break
+
+    state.ready = True
+    elapsed = time.perf_counter() - state.started_at
+    STARTUP_SECONDS.set(elapsed)
+    logger.info(
+        "Ready in %.2fs after startup (%s)",
+        elapsed,
+        ", ".join(f"{step} {seconds:.2f}s" for step, seconds in timings.items()),
+    )
+
+
+async def database_ready(timeout: float) -> bool:
+    """Connexion du pool + SELECT 1 en moins de `timeout` secondes (pool saturé: pas prêt)."""
+    async def ping() -> None:
+        async with get_async_engine().connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    try:
+        await asyncio.wait_for(ping(), timeout)
+    except (DBAPIError, OSError, asyncio.TimeoutError):
+        return False
+    return True
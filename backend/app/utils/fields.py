@@ -0,0 +1,61 @@
+from functools import lru_cache
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter, computed_field, create_model
+
+
+def parse_fields(raw: str | None, model: type[BaseModel]) -> frozenset[str] | None:
+    """`fields=a,b,c` -> sous-ensemble des champs de `model` (liste blanche). None: tous les champs."""
+    if raw is None:
+        return None
+    fields = frozenset(name.strip() for name in raw.split(",") if name.strip())
+    if not fields:
+        raise ValueError("fields must name at least one field")
+    unknown = fields - set(model.model_fields) - set(model.model_computed_fields)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return fields
+
+
+def field_dependencies(model: type[BaseModel], fields: frozenset[str]) -> frozenset[str]:
+    """Champs stockés nécessaires pour produire `fields` (les champs calculés lisent d'autres champs)."""
+    depends_on = getattr(model, "field_dependencies", {})
+    return frozenset(dep for name in fields for dep in depends_on.get(name, (name,)))
+
+
+@lru_cache(maxsize=256)
+def partial_model(model: type[BaseModel], fields: frozenset[str]) -> type[BaseModel]:
+    """Modèle de réponse réduit à `fields`; les dépendances des champs calculés sont lues mais pas sérialisées."""
+    needed = fields | field_dependencies(model, fields)
+    stored = {}
+    # ordre de déclaration du modèle complet, pas celui du paramètre
+    for name, info in model.model_fields.items():
+        if name in needed:
+            if name not in fields:
+                info = info.merge_field_infos(info, exclude=True)
+            stored[name] = (info.rebuild_annotation(), info)
+
+    computed = {
+        name: computed_field(model.__pydantic_decorators__.computed_fields[name].info.wrapped_property)
+        for name in model.model_computed_fields
+        if name in fields
+    }
+    return create_model(
+        f"{model.__name__}Partial",
+        __config__=model.model_config,
+        __validators__=computed,
+        **stored,
+    )
+
+
+@lru_cache(maxsize=256)
+def _adapter(model: type[BaseModel], many: bool) -> TypeAdapter:
+    return TypeAdapter(list[model] if many else model)
+
+
+def sparse_response(model: type[BaseModel], fields: frozenset[str], data, response: Response) -> Response:
+    """Sérialise `data` (objets ORM ou modèles complets) avec le modèle réduit, en gardant les en-têtes posés sur `response`."""
+    partial = partial_model(model, fields)
+    many = isinstance(data, list)
+    items = [partial.model_validate(item) for item in data] if many else partial.model_validate(data)
+    return Response(_adapter(partial, many).dump_json(items), media_type="application/json", headers=dict(response.headers))
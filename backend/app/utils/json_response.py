@@ -0,0 +1,12 @@
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON encodé par orjson (UUID, datetime natifs): pour des dictionnaires déjà prêts, sans response_model."""
+
+    def render(self, content: Any) -> bytes:
+        # default=str: UUID asyncpg (pgproto.UUID), inconnu d'orjson
+        return orjson.dumps(content, default=str)
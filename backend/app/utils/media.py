@@ -1,6 +1,13 @@
+import asyncio
+import hashlib
+import os
 import uuid
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from fastapi import UploadFile
+from PIL import Image, ImageOps
+
+from app.core.config import settings
 
 ALLOWED_IMAGE_TYPES = {
     "image/jpeg": ".jpg",
@@ -9,33 +16,146 @@ ALLOWED_IMAGE_TYPES = {
 }
 
 MAX_IMAGE_BYTES = 2 * 1024 * 1024  # 2MB
-MEDIA_ROOT = Path("media") / "employees"
+CHUNK_BYTES = 64 * 1024
+MEDIA_DIR = Path("media")
+
+# variantes WebP générées à l'upload: nom -> côté max en px
+PHOTO_VARIANTS = {
+    "thumb": 96,
+    "medium": 480,
+}
+
+_image_pool: ProcessPoolExecutor | None = None
+
+
+def get_image_pool() -> ProcessPoolExecutor:
+    global _image_pool
+    if _image_pool is None:
+        _image_pool = ProcessPoolExecutor(max_workers=settings.IMAGE_WORKERS)
+    return _image_pool
+
+
+def shutdown_image_pool() -> None:
+    """Arrêt du worker: processus d'images terminés, travaux en attente abandonnés."""
+    global _image_pool
+    if _image_pool is not None:
+        _image_pool.shutdown(cancel_futures=True)
+        _image_pool = None
+
 
+def sniff_image_type(head: bytes) -> str | None:
+    """Type réel d'après les magic bytes (le content_type du client n'est pas fiable)."""
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return None
 
-def save_employee_photo(file: UploadFile) -> tuple[str, Path]:
+
+def variant_path(path: Path, variant: str) -> Path:
+    return path.with_name(f"{path.stem}_{variant}.webp")
+
+
+def photo_variant_url(photo_url: str, variant: str) -> str | None:
     """
-    Sauvegarde la photo et retourne:
-    - l'URL publique (/media/employees/...)
-    - le chemin fichier sur disque (Path) pour cleanup si besoin
+    URL de la variante, dérivée de l'original sans accès disque (calculée pour chaque ligne
+    des listes). Les variantes sont écrites avec l'original; photo plus ancienne: 404 jusqu'au
+    passage de app.jobs.photo_variants, le client retombe sur photo_url. Photo externe: None.
     """
-    if file.content_type not in ALLOWED_IMAGE_TYPES:
+    if not is_media_url(photo_url):
+        return None
+    stem, _, _ = photo_url.rpartition(".")
+    return f"{stem}_{variant}.webp"
+
+
+def missing_variants(path: Path) -> bool:
+    return not all(variant_path(path, v).exists() for v in PHOTO_VARIANTS)
+
+
+def render_photo_variants(path: str) -> None:
+    """Exécuté dans le process pool: redimensionne l'original en variantes WebP."""
+    source = Path(path)
+    with Image.open(source) as img:
+        img = ImageOps.exif_transpose(img)
+        img = img.convert("RGBA" if "A" in img.getbands() or "transparency" in img.info else "RGB")
+        for variant, size in PHOTO_VARIANTS.items():
+            resized = img.copy()
+            resized.thumbnail((size, size))
+            target = variant_path(source, variant)
+            tmp = target.with_name(f".{target.name}.{uuid.uuid4().hex}.tmp")
+            resized.save(tmp, "WEBP", quality=80)
+            os.replace(tmp, target)
+
+
+async def read_upload(file: UploadFile) -> tuple[bytes, str]:
+    """
+    Lit l'upload par morceaux et abandonne dès que MAX_IMAGE_BYTES est dépassé.
+    Retourne le contenu et le type détecté.
+    """
+    chunks = []
+    size = 0
+    while chunk := await file.read(CHUNK_BYTES):
+        size += len(chunk)
+        if size > MAX_IMAGE_BYTES:
+            raise ValueError("Image too large (max 2MB)")
+        chunks.append(chunk)
+
+    content = b"".join(chunks)
+    content_type = sniff_image_type(content[:16])
+    if content_type is None:
         raise ValueError("Unsupported image type (allowed: jpg, png, webp)")
+    return content, content_type
+
+
+def photo_url_for(content: bytes, content_type: str) -> str:
+    """URL adressée par le contenu: même photo => même fichier."""
+    digest = hashlib.sha256(content).hexdigest()
+    return f"/media/employees/{digest[:2]}/{digest}{ALLOWED_IMAGE_TYPES[content_type]}"
+
+
+def is_media_url(url: str) -> bool:
+    """Fichier du store (référencé dans media_objects), par opposition à une URL externe."""
+    return url.startswith("/media/")
+
+
+def media_path(url: str) -> Path:
+    return MEDIA_DIR / url.removeprefix("/media/")
 
-    content = file.file.read()
-    if len(content) > MAX_IMAGE_BYTES:
-        raise ValueError("Image too large (max 2MB)")
 
-    ext = ALLOWED_IMAGE_TYPES[file.content_type]
-    filename = f"{uuid.uuid4()}{ext}"
+def write_file_atomic(path: Path, content: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    tmp.write_bytes(content)
+    os.replace(tmp, path)
+
+
+async def write_employee_photo(url: str, content: bytes) -> Path:
+    """
+    Écrit l'original et ses variantes s'ils n'existent pas déjà (dédup).
+    Retourne le chemin de l'original.
+    """
+    file_path = media_path(url)
+    if not file_path.exists():
+        await asyncio.to_thread(write_file_atomic, file_path, content)
+
+    if not missing_variants(file_path):
+        return file_path
+
+    try:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(get_image_pool(), render_photo_variants, str(file_path))
+    except Exception:
+        raise ValueError("Invalid or corrupted image")
 
-    MEDIA_ROOT.mkdir(parents=True, exist_ok=True)
-    file_path = MEDIA_ROOT / filename
+    return file_path
 
-    with open(file_path, "wb") as f:
-        f.write(content)
 
-    url = f"/media/employees/{filename}"
-    return url, file_path
+def delete_employee_photo(path: Path) -> None:
+    safe_delete_file(path)
+    for variant in PHOTO_VARIANTS:
+        safe_delete_file(variant_path(path, variant))
 
 
 def safe_delete_file(path: Path) -> None:
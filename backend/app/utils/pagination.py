@@ -0,0 +1,40 @@
+import base64
+import json
+import uuid
+
+
+def encode_cursor(last_name: str, employee_id: uuid.UUID) -> str:
+    """
+    Encode la position (last_name, id) du dernier élément d'une page
+    en un curseur opaque, sûr pour une URL.
+    """
+    raw = json.dumps([last_name, str(employee_id)], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, uuid.UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        last_name, employee_id = json.loads(base64.urlsafe_b64decode(padded))
+        # curseur forgé: {"id": 5}, [1, 2]... rejetés comme un curseur illisible
+        if not isinstance(last_name, str) or not isinstance(employee_id, str):
+            raise ValueError
+        return last_name, uuid.UUID(employee_id)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+
+def encode_sync_token(seq: int) -> str:
+    """Position (seq) dans le journal change_events, opaque pour les clients de synchronisation."""
+    return base64.urlsafe_b64encode(json.dumps(["seq", seq]).encode()).decode().rstrip("=")
+
+
+def decode_sync_token(token: str) -> int:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        kind, seq = json.loads(base64.urlsafe_b64decode(padded))
+        if kind != "seq" or not isinstance(seq, int) or seq < 0:
+            raise ValueError
+        return seq
+    except (ValueError, TypeError):
+        raise ValueError("Invalid sync token")
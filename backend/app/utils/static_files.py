@@ -0,0 +1,34 @@
+import os
+from pathlib import Path
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+# les fichiers média ne sont jamais réécrits sous le même nom (hash du contenu / uuid)
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class ImmutableStaticFiles(StaticFiles):
+    """
+    StaticFiles pour /media: cache navigateur/CDN d'un an, ETag fort dérivé du nom
+    de fichier. Les requêtes Range sont gérées par FileResponse.
+    """
+
+    def file_response(
+        self,
+        full_path: str | os.PathLike[str],
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        headers = {
+            "cache-control": IMMUTABLE_CACHE_CONTROL,
+            "etag": f'"{Path(full_path).stem}"',
+        }
+
+        response = FileResponse(full_path, status_code=status_code, stat_result=stat_result, headers=headers)
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
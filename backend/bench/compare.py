@@ -0,0 +1,42 @@
+"""
+Compare deux rapports de bench.run (avant / après).
+
+    python -m bench.compare baseline.json candidate.json
+"""
+import argparse
+import json
+
+METRICS = ["throughput_rps", "p50_ms", "p95_ms", "p99_ms"]
+
+
+def compare(baseline: dict, candidate: dict) -> dict:
+    diff = {}
+    for name, after in candidate["scenarios"].items():
+        before = baseline["scenarios"].get(name)
+        if before is None:
+            continue
+        diff[name] = {
+            metric: {
+                "before": before[metric],
+                "after": after[metric],
+                "change_pct": round((after[metric] - before[metric]) / before[metric] * 100, 1) if before[metric] else None,
+            }
+            for metric in METRICS
+        }
+    return diff
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Diff two benchmark reports.")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    args = parser.parse_args()
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+    print(json.dumps(compare(baseline, candidate), indent=2, sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Générateur d'annuaire synthétique, reproductible (seed).
+
+    python -m bench.generate --employees 100000 --seed 42 --reset
+
+Sans --reset, relançable: les lignes déjà présentes (même id, email, nom) sont ignorées.
+"""
+import argparse
+import io
+import random
+import time
+import unicodedata
+import uuid
+from datetime import date, timedelta
+from PIL import Image
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.db.session import SessionLocal
+from app.models import ArchivedEmployee, Department, Employee, MediaObject, Position
+from app.utils.media import media_path, photo_url_for, render_photo_variants, write_file_atomic
+
+FIRST_NAMES = [
+    "Alice", "Bruno", "Chloé", "David", "Emma", "Farid", "Gabrielle", "Hugo", "Inès", "Jules",
+    "Karim", "Léa", "Manon", "Nicolas", "Olivia", "Paul", "Quentin", "Rose", "Samir", "Théo",
+    "Ursula", "Victor", "William", "Xavier", "Yasmine", "Zoé",
+]
+LAST_NAMES = [
+    "Martin", "Bernard", "Dubois", "Thomas", "Robert", "Richard", "Petit", "Durand", "Leroy", "Moreau",
+    "Simon", "Laurent", "Lefebvre", "Michel", "Garcia", "David", "Bertrand", "Roux", "Vincent", "Fournier",
+    "Morel", "Girard", "Andre", "Mercier", "Dupont", "Lambert", "Bonnet", "Francois", "Martinez", "Legrand",
+]
+STATUSES = ["active"] * 17 + ["inactive", "terminated", "terminated"]
+BATCH_SIZE = 5000
+PHOTO_COUNT = 20
+
+
+def _ascii(value: str) -> str:
+    return unicodedata.normalize("NFKD", value).encode("ascii", "ignore").decode()
+
+
+def _make_photos(rng: random.Random) -> list[str]:
+    """Quelques photos partagées, écrites dans le media store comme un upload réel."""
+    urls = []
+    for _ in range(PHOTO_COUNT):
+        buf = io.BytesIO()
+        color = tuple(rng.randrange(256) for _ in range(3))
+        Image.new("RGB", (512, 512), color).save(buf, "JPEG", quality=85)
+        content = buf.getvalue()
+        url = photo_url_for(content, "image/jpeg")
+        path = media_path(url)
+        if not path.exists():
+            write_file_atomic(path, content)
+            render_photo_variants(str(path))
+        urls.append(url)
+    return urls
+
+
+def generate(*, employees: int, departments: int, positions: int, seed: int, reset: bool) -> dict:
+    rng = random.Random(seed)
+    started = time.perf_counter()
+
+    with SessionLocal() as db:
+        if reset:
+            db.execute(delete(ArchivedEmployee))
+            db.execute(delete(Employee))
+            db.execute(delete(MediaObject))
+            db.execute(delete(Department))
+            db.execute(delete(Position))
+            db.commit()
+
+        # noms existants (autre seed, run précédent): ids relus en base
+        department_names = [f"Department {i:04d}" for i in range(departments)]
+        db.execute(
+            insert(Department).on_conflict_do_nothing(),
+            [
+                {
+                    "id": uuid.UUID(int=rng.getrandbits(128), version=4),
+                    "name": name,
+                    "description": f"Synthetic department #{i}",
+                }
+                for i, name in enumerate(department_names)
+            ],
+        )
+        department_ids = db.scalars(
+            select(Department.id).where(Department.name.in_(department_names)).order_by(Department.name)
+        ).all()
+
+        position_titles = [f"Position {i:04d}" for i in range(positions)]
+        db.execute(
+            insert(Position).on_conflict_do_nothing(),
+            [
+                {"id": uuid.UUID(int=rng.getrandbits(128), version=4), "title": title}
+                for title in position_titles
+            ],
+        )
+        position_ids = db.scalars(
+            select(Position.id).where(Position.title.in_(position_titles)).order_by(Position.title)
+        ).all()
+
+        photos = _make_photos(rng)
+        photo_refs = dict.fromkeys(photos, 0)
+        inserted = 0
+        first_hire = date(2005, 1, 1)
+
+        for start in range(0, employees, BATCH_SIZE):
+            rows = []
+            for i in range(start, min(start + BATCH_SIZE, employees)):
+                first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+                photo = rng.choice(photos)
+                rows.append(
+                    {
+                        "id": uuid.UUID(int=rng.getrandbits(128), version=4),
+                        "first_name": first,
+                        "last_name": last,
+                        "email": _ascii(f"{first}.{last}.{i}@example.com").lower(),
+                        "department_id": rng.choice(department_ids),
+                        "position_id": rng.choice(position_ids),
+                        "photo_url": photo,
+                        "hire_date": first_hire + timedelta(days=rng.randrange(7300)),
+                        "status": rng.choice(STATUSES),
+                    }
+                )
+            # seules les lignes insérées prennent une référence sur leur photo
+            for photo in db.scalars(
+                insert(Employee).on_conflict_do_nothing().returning(Employee.photo_url), rows
+            ):
+                photo_refs[photo] += 1
+                inserted += 1
+            db.commit()
+
+        refs = [{"path": url, "ref_count": count} for url, count in photo_refs.items() if count]
+        if refs:
+            stmt = insert(MediaObject)
+            db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[MediaObject.path],
+                    set_={"ref_count": MediaObject.ref_count + stmt.excluded.ref_count, "updated_at": func.now()},
+                ),
+                refs,
+            )
+            db.commit()
+
+    return {
+        "employees": employees,
+        "inserted": inserted,
+        "departments": departments,
+        "positions": positions,
+        "seed": seed,
+        "seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Seed the database with a synthetic directory.")
+    parser.add_argument("--employees", type=int, default=10_000)
+    parser.add_argument("--departments", type=int, default=40)
+    parser.add_argument("--positions", type=int, default=120)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reset", action="store_true", help="delete existing employees, departments and positions first")
+    args = parser.parse_args()
+    print(generate(
+        employees=args.employees,
+        departments=args.departments,
+        positions=args.positions,
+        seed=args.seed,
+        reset=args.reset,
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Mesure débit et latences (p50/p95/p99) par scénario, résultat en JSON.
+
+    python -m bench.run --requests 500 --concurrency 16 --output bench.json
+    python -m bench.run --base-url http://localhost:8000 --scenario employees_list
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+import httpx
+
+from bench.scenarios import SCENARIOS, BenchContext, load_context
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    # nearest-rank
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    ctx: BenchContext,
+    name: str,
+    *,
+    requests: int,
+    concurrency: int,
+    seed: int,
+) -> dict:
+    scenario = SCENARIOS[name]
+    latencies: list[float] = []
+    errors = 0
+    remaining = requests
+
+    async def worker(worker_id: int) -> None:
+        nonlocal remaining, errors
+        rng = random.Random(f"{seed}-{name}-{worker_id}")
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            try:
+                response = await scenario(client, ctx, rng)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies.append(time.perf_counter() - started)
+            errors += failed
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 2) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+@asynccontextmanager
+async def _client(base_url: str | None) -> AsyncIterator[httpx.AsyncClient]:
+    if base_url:
+        async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+            yield client
+        return
+
+    # application dans le process, même base de données. ASGITransport n'envoie pas les
+    # événements lifespan: démarrage (warm-up, LISTEN, flux) lancé ici comme sous uvicorn
+    from app.main import create_app
+    app = create_app()
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=60) as client:
+            yield client
+
+
+async def wait_ready(client: httpx.AsyncClient, timeout: float = 60) -> None:
+    """Mesures après le warm-up de l'application (/ready), pas pendant."""
+    deadline = time.monotonic() + timeout
+    while (await client.get("/ready")).status_code != 200:
+        if time.monotonic() > deadline:
+            raise SystemExit("Application not ready: see GET /ready")
+        await asyncio.sleep(0.2)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    names = args.scenario or list(SCENARIOS)
+    async with _client(args.base_url) as client:
+        await wait_ready(client)
+        ctx = await load_context(client, random.Random(args.seed))
+        if not ctx.employee_ids:
+            raise SystemExit("No employees found: seed the database first (python -m bench.generate)")
+
+        # échauffement: pool de connexions, caches, process pool d'images
+        for name in names:
+            await run_scenario(client, ctx, name, requests=args.warmup, concurrency=1, seed=args.seed)
+
+        results = {}
+        for name in names:
+            results[name] = await run_scenario(
+                client, ctx, name, requests=args.requests, concurrency=args.concurrency, seed=args.seed
+            )
+            print(f"{name:28} {results[name]['throughput_rps']:>9} req/s  p95 {results[name]['p95_ms']} ms", file=sys.stderr)
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "target": args.base_url or "in-process",
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "python": platform.python_version(),
+        },
+        "scenarios": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the HTTP benchmark scenarios.")
+    parser.add_argument("--base-url", default=None, help="running server; default runs the app in-process")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    payload = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(payload + "\n")
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
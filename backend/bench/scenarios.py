@@ -0,0 +1,133 @@
+import io
+import random
+import uuid
+from dataclasses import dataclass, field
+from collections.abc import Awaitable, Callable
+
+import httpx
+from PIL import Image
+
+
+@dataclass
+class BenchContext:
+    """Identifiants échantillonnés une fois avant les mesures."""
+
+    department_ids: list[str]
+    position_ids: list[str]
+    employee_ids: list[str]
+    last_names: list[str]
+    media_urls: list[str]
+    deep_cursor: str | None
+    photo: bytes = field(repr=False, default=b"")
+
+
+Scenario = Callable[[httpx.AsyncClient, BenchContext, random.Random], Awaitable[httpx.Response]]
+
+
+async def load_context(client: httpx.AsyncClient, rng: random.Random) -> BenchContext:
+    departments = (await client.get("/departments")).json()
+    positions = (await client.get("/positions")).json()
+
+    employees = []
+    cursor = None
+    # ~10 pages en keyset pour avoir un échantillon et un curseur "profond"
+    for _ in range(10):
+        params = {"limit": 100}
+        if cursor:
+            params["cursor"] = cursor
+        response = await client.get("/employees", params=params)
+        employees.extend(response.json())
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            break
+
+    buf = io.BytesIO()
+    Image.new("RGB", (800, 800), (rng.randrange(256), 80, 160)).save(buf, "JPEG", quality=85)
+
+    return BenchContext(
+        department_ids=[d["id"] for d in departments],
+        position_ids=[p["id"] for p in positions],
+        employee_ids=[e["id"] for e in employees],
+        last_names=sorted({e["last_name"] for e in employees}),
+        media_urls=[e["photo_thumb_url"] for e in employees if e.get("photo_thumb_url")],
+        deep_cursor=cursor,
+        photo=buf.getvalue(),
+    )
+
+
+async def departments_list(client, ctx, rng):
+    return await client.get("/departments")
+
+
+async def department_detail(client, ctx, rng):
+    return await client.get(f"/departments/{rng.choice(ctx.department_ids)}")
+
+
+async def department_crud(client, ctx, rng):
+    created = await client.post("/departments", json={"name": f"bench-{uuid.uuid4().hex[:12]}"})
+    created.raise_for_status()
+    dep_id = created.json()["id"]
+    (await client.patch(f"/departments/{dep_id}", json={"description": "bench"})).raise_for_status()
+    return await client.delete(f"/departments/{dep_id}")
+
+
+async def positions_list(client, ctx, rng):
+    return await client.get("/positions")
+
+
+async def employees_list(client, ctx, rng):
+    return await client.get("/employees", params={"limit": 20})
+
+
+async def employees_list_filtered(client, ctx, rng):
+    return await client.get("/employees", params={"limit": 20, "department_id": rng.choice(ctx.department_ids)})
+
+
+async def employees_list_deep(client, ctx, rng):
+    params = {"limit": 100}
+    if ctx.deep_cursor:
+        params["cursor"] = ctx.deep_cursor
+    return await client.get("/employees", params=params)
+
+
+async def employees_search(client, ctx, rng):
+    return await client.get("/employees", params={"q": rng.choice(ctx.last_names)[:4], "limit": 20})
+
+
+async def employee_detail(client, ctx, rng):
+    return await client.get(f"/employees/{rng.choice(ctx.employee_ids)}")
+
+
+async def employee_create_photo(client, ctx, rng):
+    data = {
+        "first_name": "Bench",
+        "last_name": "Runner",
+        "email": f"bench-{uuid.uuid4().hex}@example.com",
+        "department_id": rng.choice(ctx.department_ids),
+        "position_id": rng.choice(ctx.position_ids),
+    }
+    return await client.post("/employees", data=data, files={"photo": ("bench.jpg", ctx.photo, "image/jpeg")})
+
+
+async def stats_headcount(client, ctx, rng):
+    return await client.get("/stats/headcount")
+
+
+async def media_thumb(client, ctx, rng):
+    return await client.get(rng.choice(ctx.media_urls))
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "departments_list": departments_list,
+    "department_detail": department_detail,
+    "department_crud": department_crud,
+    "positions_list": positions_list,
+    "employees_list": employees_list,
+    "employees_list_filtered": employees_list_filtered,
+    "employees_list_deep": employees_list_deep,
+    "employees_search": employees_search,
+    "employee_detail": employee_detail,
+    "employee_create_photo": employee_create_photo,
+    "stats_headcount": stats_headcount,
+    "media_thumb": media_thumb,
+}
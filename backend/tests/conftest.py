@@ -0,0 +1,100 @@
+import io
+import os
+import time
+
+# budgets SQL vérifiés: un dépassement fait échouer le test
+os.environ.setdefault("QUERY_BUDGET_MODE", "raise")
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from fastapi.testclient import TestClient
+from PIL import Image
+from sqlalchemy import text
+
+from app.core.config import settings
+
+# engines créés au premier usage (app.db.session): base de test, sans réplica
+settings.DATABASE_URL = settings.TEST_DATABASE_URL
+settings.ASYNC_DATABASE_URL = None
+settings.READ_REPLICA_URLS = []
+
+from app.core.cache import CACHES  # noqa: E402
+from app.db.session import get_engine  # noqa: E402
+from app.main import create_app  # noqa: E402
+
+TABLES = (
+    "employees",
+    "employees_archive",
+    "departments",
+    "positions",
+    "employee_headcounts",
+    "change_events",
+    "media_objects",
+)
+
+
+
+def png(color=(200, 30, 30)) -> bytes:
+    out = io.BytesIO()
+    Image.new("RGB", (4, 4), color).save(out, "PNG")
+    return out.getvalue()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    """Schéma recréé par les migrations (triggers compris) une fois par session."""
+    with get_engine().begin() as conn:
+        conn.execute(text("DROP SCHEMA public CASCADE"))
+        conn.execute(text("CREATE SCHEMA public"))
+    command.upgrade(Config("alembic.ini"), "head")
+    yield
+    get_engine().dispose()
+
+
+@pytest.fixture(autouse=True)
+def clean_tables(database):
+    yield
+    with get_engine().begin() as conn:
+        conn.execute(text(f"TRUNCATE {', '.join(TABLES)} CASCADE"))
+    for cache in CACHES.values():
+        cache.invalidate()
+
+
+@pytest.fixture(scope="session")
+def client(database):
+    # une seule boucle asyncio pour toute la session: le pool asyncpg y reste attaché
+    with TestClient(create_app()) as client:
+        # préchauffage terminé: ses requêtes ne croisent pas le TRUNCATE de clean_tables
+        deadline = time.monotonic() + 30
+        while client.get("/ready").status_code != 200 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        yield client
+
+
+@pytest.fixture
+def department(client):
+    return client.post("/departments", json={"name": "Engineering"}).json()
+
+
+@pytest.fixture
+def position(client):
+    return client.post("/positions", json={"title": "Developer"}).json()
+
+
+@pytest.fixture
+def make_employee(client, department, position):
+    def make(last_name: str, **fields) -> dict:
+        data = {
+            "first_name": "Alice",
+            "last_name": last_name,
+            "email": f"{last_name.lower()}@example.com",
+            "department_id": department["id"],
+            "position_id": position["id"],
+            **fields,
+        }
+        response = client.post("/employees", data=data, files={"photo": ("photo.png", png(), "image/png")})
+        assert response.status_code == 201, response.text
+        return response.json()
+
+    return make
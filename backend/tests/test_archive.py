@@ -0,0 +1,49 @@
+from datetime import timedelta
+
+from sqlalchemy import text
+
+from app.db.session import SessionLocal, get_engine
+from app.services.employees import EmployeeService
+
+OLDER_THAN = timedelta(days=365)
+
+
+def _terminate_long_ago(employee_id: str) -> None:
+    with get_engine().begin() as conn:
+        conn.execute(
+            text("UPDATE employees SET status = 'terminated', updated_at = now() - interval '2 years' WHERE id = :id"),
+            {"id": employee_id},
+        )
+
+
+def _archive() -> int:
+    with SessionLocal() as db:
+        return EmployeeService.archive_batch(db, OLDER_THAN, batch_size=100)
+
+
+def test_archive_moves_only_long_terminated_employees(client, make_employee):
+    gone = make_employee("Martin")
+    make_employee("Bernard", status="terminated")  # terminé récemment: reste
+    _terminate_long_ago(gone["id"])
+
+    assert _archive() == 1
+    assert [e["last_name"] for e in client.get("/employees").json()] == ["Bernard"]
+    assert client.get(f"/employees/{gone['id']}").status_code == 404
+
+    archived = client.get("/employees", params={"include_archived": True}).json()
+    assert [e["last_name"] for e in archived] == ["Bernard", "Martin"]
+
+
+def test_restored_employee_is_not_archived_again(client, make_employee):
+    employee = make_employee("Martin")
+    _terminate_long_ago(employee["id"])
+    assert _archive() == 1
+
+    restored = client.post(f"/employees/{employee['id']}/restore")
+    assert restored.status_code == 200
+    assert restored.json()["status"] == "terminated"
+    assert restored.json()["created_at"] == employee["created_at"]
+
+    assert _archive() == 0
+    assert client.get(f"/employees/{employee['id']}").status_code == 200
+    assert client.post(f"/employees/{employee['id']}/restore").status_code == 404
@@ -0,0 +1,54 @@
+import pytest
+
+from app.db.session import SessionLocal
+from app.schemas.employee import EmployeeBulkChanges
+from app.services.employees import EmployeeService
+
+
+def _statuses(client) -> dict[str, str]:
+    return {e["last_name"]: e["status"] for e in client.get("/employees").json()}
+
+
+def test_bulk_update_by_ids_reports_missing(client, make_employee):
+    martin = make_employee("Martin")["id"]
+    make_employee("Bernard")
+    unknown = "00000000-0000-0000-0000-000000000000"
+
+    response = client.post(
+        "/employees/bulk-update",
+        json={"ids": [martin, martin, unknown], "changes": {"status": "on_leave"}},
+    )
+    assert response.status_code == 200
+    assert response.json() == {"updated": 1, "missing": [unknown]}
+    assert _statuses(client) == {"Martin": "on_leave", "Bernard": "active"}
+
+
+def test_bulk_update_by_filter(client, make_employee, department):
+    make_employee("Martin")
+    make_employee("Bernard")
+    sales = client.post("/departments", json={"name": "Sales"}).json()
+
+    response = client.post(
+        "/employees/bulk-update",
+        json={"filter": {"q": "bern"}, "changes": {"department_id": sales["id"]}},
+    )
+    assert response.json() == {"updated": 1, "missing": []}
+    moved = client.get("/employees", params={"department_id": sales["id"]}).json()
+    assert [e["last_name"] for e in moved] == ["Bernard"]
+
+
+@pytest.mark.parametrize("selector", [{"filter": {"q": ""}}, {"filter": {"q": "   "}}, {"filter": {}}])
+def test_bulk_update_rejects_filter_matching_everyone(client, make_employee, selector):
+    make_employee("Martin")
+
+    response = client.post("/employees/bulk-update", json={**selector, "changes": {"status": "terminated"}})
+    assert response.status_code == 422
+    assert _statuses(client) == {"Martin": "active"}
+
+
+def test_bulk_update_service_refuses_update_without_predicate(client, make_employee):
+    make_employee("Martin")
+
+    with SessionLocal() as db, pytest.raises(ValueError):
+        EmployeeService.bulk_update(db, EmployeeBulkChanges(status="terminated"), q="   ")
+    assert _statuses(client) == {"Martin": "active"}
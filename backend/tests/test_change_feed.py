@@ -0,0 +1,95 @@
+import asyncio
+
+from sqlalchemy import select
+
+from app.db import notifications
+from app.db.session import SessionLocal
+from app.models.change_event import ChangeEvent
+from app.models.department import Department
+from app.services.change_feed import ChangeFeedService, change_feed, stream_changes
+
+
+def sequence_all() -> None:
+    with SessionLocal() as db:
+        while ChangeFeedService.sequence(db):
+            pass
+
+
+def seq_of(entity_id):
+    with SessionLocal() as db:
+        return db.scalar(select(ChangeEvent.seq).where(ChangeEvent.entity_id == entity_id))
+
+
+def test_events_of_a_later_xid_wait_for_an_older_transaction():
+    with SessionLocal() as slow, SessionLocal() as fast:
+        first = Department(name="Slow")
+        slow.add(first)
+        slow.flush()  # xid attribué, transaction laissée ouverte
+
+        second = Department(name="Fast")
+        fast.add(second)
+        fast.commit()  # ne bloque pas derrière la transaction ouverte
+
+        with SessionLocal() as db:
+            assert ChangeFeedService.sequence(db) is True
+        assert seq_of(second.id) is None
+
+        slow.commit()
+
+    sequence_all()
+    assert seq_of(first.id) < seq_of(second.id)
+
+
+def test_stream_subscribes_only_once_iterated():
+    async def scenario():
+        before = len(change_feed._subscribers)
+        stream = stream_changes()
+        # client parti avant la première lecture: aucun abonné laissé derrière
+        assert len(change_feed._subscribers) == before
+        await stream.__anext__()
+        assert len(change_feed._subscribers) == before + 1
+        await stream.aclose()
+        assert len(change_feed._subscribers) == before
+
+    asyncio.run(scenario())
+
+
+class FakeConnection:
+    def __init__(self, fail: bool):
+        self.fail = fail
+        self.closed = False
+
+    def add_termination_listener(self, callback):
+        pass
+
+    async def add_listener(self, channel, callback):
+        if self.fail:
+            raise OSError("connection reset")
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+
+def test_listener_reconnects_when_listen_fails(monkeypatch):
+    connections = [FakeConnection(fail=True), FakeConnection(fail=False)]
+
+    async def connect(dsn):
+        return connections.pop(0)
+
+    monkeypatch.setattr(notifications.asyncpg, "connect", connect)
+
+    async def scenario():
+        subscribed = asyncio.Event()
+        task = asyncio.create_task(
+            notifications.listen(
+                "postgresql://localhost/hr", {"hr_changes": lambda _: subscribed.set()}, retry_delay=0
+            )
+        )
+        await asyncio.wait_for(subscribed.wait(), 5)
+        task.cancel()
+
+    asyncio.run(scenario())
+    assert connections == []
@@ -0,0 +1,49 @@
+from starlette.applications import Starlette
+from starlette.responses import StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.core.compression import CompressionMiddleware
+
+GZIP = {"Accept-Encoding": "gzip"}
+
+
+def test_small_response_keeps_strong_etag_on_revalidation(client, department):
+    first = client.get(f"/departments/{department['id']}", headers=GZIP)
+    assert "content-encoding" not in first.headers
+    etag = first.headers["etag"]
+    assert not etag.startswith("W/")
+
+    revalidated = client.get(f"/departments/{department['id']}", headers={**GZIP, "If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == etag
+
+
+def test_compressed_response_revalidates_with_weak_etag(client):
+    for i in range(30):
+        client.post("/departments", json={"name": f"Department {i:02d}", "description": "x" * 40})
+
+    first = client.get("/departments", headers=GZIP)
+    assert first.headers["content-encoding"] == "gzip"
+    etag = first.headers["etag"]
+    assert etag.startswith("W/")
+
+    revalidated = client.get("/departments", headers={**GZIP, "If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == etag
+
+
+def test_event_stream_is_not_compressed():
+    async def events(request):
+        async def body():
+            for i in range(3):
+                yield f"data: {'x' * 2000} {i}\n\n"
+
+        return StreamingResponse(body(), media_type="text/event-stream")
+
+    app = CompressionMiddleware(Starlette(routes=[Route("/events", events)]), minimum_size=10)
+    with TestClient(app) as client:
+        response = client.get("/events", headers=GZIP)
+
+    assert "content-encoding" not in response.headers
+    assert response.text.count("data: ") == 3
@@ -0,0 +1,66 @@
+import pytest
+
+
+def _revalidate(client, url: str, etag: str):
+    return client.get(url, headers={"If-None-Match": etag})
+
+
+def test_employee_revalidation_until_updated(client, make_employee):
+    employee = make_employee("Martin")
+    url = f"/employees/{employee['id']}"
+
+    first = client.get(url)
+    etag = first.headers["etag"]
+    assert first.headers["last-modified"]
+
+    cached = _revalidate(client, url, etag)
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+
+    assert client.patch(url, json={"first_name": "Alicia"}).status_code == 200
+    fresh = _revalidate(client, url, etag)
+    assert fresh.status_code == 200
+    assert fresh.headers["etag"] != etag
+    assert fresh.json()["first_name"] == "Alicia"
+
+
+def test_employee_etag_depends_on_fields(client, make_employee):
+    employee = make_employee("Martin")
+    url = f"/employees/{employee['id']}"
+
+    full = client.get(url).headers["etag"]
+    partial = client.get(url, params={"fields": "first_name"}).headers["etag"]
+    assert partial != full
+    assert _revalidate(client, url, partial).status_code == 200
+
+
+def test_employee_if_modified_since(client, make_employee):
+    employee = make_employee("Martin")
+    url = f"/employees/{employee['id']}"
+    last_modified = client.get(url).headers["last-modified"]
+
+    assert client.get(url, headers={"If-Modified-Since": last_modified}).status_code == 304
+
+
+@pytest.mark.parametrize(
+    "collection, payload, change",
+    [
+        ("departments", {"name": "Sales"}, {"description": "Field sales"}),
+        ("positions", {"title": "Manager"}, {"title": "Team manager"}),
+    ],
+)
+def test_reference_revalidation_until_updated(client, collection, payload, change):
+    created = client.post(f"/{collection}", json=payload).json()
+    url = f"/{collection}/{created['id']}"
+    etag = client.get(url).headers["etag"]
+    list_etag = client.get(f"/{collection}").headers["etag"]
+
+    assert _revalidate(client, url, etag).status_code == 304
+    assert _revalidate(client, f"/{collection}", list_etag).status_code == 304
+    # validation faible (réponse compressée): même représentation
+    assert _revalidate(client, url, f"W/{etag}").status_code == 304
+
+    assert client.patch(url, json=change).status_code == 200
+    assert _revalidate(client, url, etag).status_code == 200
+    assert _revalidate(client, f"/{collection}", list_etag).status_code == 200
@@ -0,0 +1,16 @@
+def test_upsert_keeps_description_when_omitted(client):
+    created = client.post("/departments?upsert=true", json={"name": "Sales", "description": "Field sales"})
+    assert created.status_code == 201
+
+    updated = client.post("/departments?upsert=true", json={"name": "Sales"})
+    assert updated.status_code == 200
+    assert updated.json()["description"] == "Field sales"
+
+    updated = client.post("/departments?upsert=true", json={"name": "Sales", "description": "Inside sales"})
+    assert updated.json()["description"] == "Inside sales"
+    assert updated.json()["id"] == created.json()["id"]
+
+
+def test_duplicate_department_is_a_conflict(client, department):
+    response = client.post("/departments", json={"name": department["name"]})
+    assert response.status_code == 409
@@ -0,0 +1,65 @@
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.models.employee import Employee
+from app.schemas.employee import EmployeeListOut
+from app.services.employees import EmployeeService
+
+
+def _sql(fields: frozenset[str] | None) -> str:
+    stmt = select(Employee).options(*EmployeeService.load_options(EmployeeListOut, fields))
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def test_sparse_fields_return_only_requested_keys(client, make_employee):
+    make_employee("Martin")
+
+    listed = client.get("/employees", params={"fields": "last_name,photo_thumb_url"}).json()
+    assert listed == [{"last_name": "Martin", "photo_thumb_url": listed[0]["photo_thumb_url"]}]
+    assert listed[0]["photo_thumb_url"].endswith("_thumb.webp")
+
+    employee_id = client.get("/employees").json()[0]["id"]
+    detail = client.get(f"/employees/{employee_id}", params={"fields": "email,department"}).json()
+    assert detail == {"email": "martin@example.com", "department": detail["department"]}
+    assert detail["department"]["name"] == "Engineering"
+
+
+def test_unknown_field_is_rejected(client):
+    response = client.get("/employees", params={"fields": "last_name,salary"})
+    assert response.status_code == 422
+    assert response.json()["detail"] == "Unknown fields: salary"
+
+    assert client.get("/employees", params={"fields": " , "}).status_code == 422
+
+
+def test_fields_are_not_combined_with_compact_view(client):
+    response = client.get("/employees", params={"fields": "last_name", "view": "compact"})
+    assert response.status_code == 422
+
+
+def test_load_options_join_only_requested_relations():
+    scalar_only = _sql(frozenset({"first_name", "photo_thumb_url"}))
+    assert "JOIN" not in scalar_only
+    assert "employees.photo_url" in scalar_only
+    assert "employees.email" not in scalar_only
+
+    with_department = _sql(frozenset({"first_name", "department"}))
+    assert "JOIN departments" in with_department
+    assert "JOIN positions" not in with_department
+
+    full = _sql(None)
+    assert "JOIN departments" in full and "JOIN positions" in full
+
+
+def test_compact_view_embeds_references_once(client, make_employee, department, position):
+    for name in ("Martin", "Bernard"):
+        make_employee(name)
+
+    page = client.get("/employees", params={"view": "compact"}).json()
+    assert [e["last_name"] for e in page["data"]] == ["Bernard", "Martin"]
+    assert {e["department_id"] for e in page["data"]} == {department["id"]}
+    assert "department" not in page["data"][0]
+    assert page["data"][0]["photo_thumb_url"].endswith("_thumb.webp")
+    assert list(page["included"]["departments"]) == [department["id"]]
+    assert page["included"]["positions"][position["id"]]["title"] == "Developer"
+    assert page["next_cursor"] is None
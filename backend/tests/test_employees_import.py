@@ -0,0 +1,109 @@
+from sqlalchemy import text
+
+from app.db.session import get_engine
+from app.services import employee_import
+from app.utils.media import media_path
+
+
+def _csv(*rows: str, columns: str = "first_name,last_name,email,department,position") -> bytes:
+    return "\n".join((columns, *rows)).encode()
+
+
+def _import(client, body: bytes):
+    return client.post("/employees/import", content=body, headers={"Content-Type": "text/csv"})
+
+
+def _ref_count(url: str) -> int | None:
+    with get_engine().connect() as conn:
+        return conn.scalar(text("SELECT ref_count FROM media_objects WHERE path = :path"), {"path": url})
+
+
+def test_import_reports_rejected_rows(client, department, position):
+    body = _csv(
+        "Alice,Martin,alice@example.com,Engineering,Developer",
+        "Bob,Bernard,bob@example.com,Unknown,Developer",
+        "Alice,Martin,ALICE@example.com,Engineering,Developer",
+        "X,Dubois,x@example.com,Engineering,Developer",
+    )
+    report = client.post("/employees/import", content=body, headers={"Content-Type": "text/csv"}).json()
+
+    assert report["inserted"] == 1
+    assert report["failed"] == 3
+    assert [e["line"] for e in report["errors"]] == [3, 4, 5]
+    assert report["errors"][0]["error"] == "Department 'Unknown' does not exist."
+    assert report["errors"][1]["error"] == "Duplicate email 'alice@example.com' in file."
+
+
+def test_department_deleted_during_import_rejects_its_rows(client, position, monkeypatch):
+    kept = client.post("/departments", json={"name": "Sales"}).json()
+    gone = client.post("/departments", json={"name": "Legal"}).json()
+    resolve = employee_import._resolve_refs
+    calls = []
+
+    def resolve_then_delete(db, model, label_col, refs):
+        resolved = resolve(db, model, label_col, refs)
+        if label_col.key == "name" and not calls:
+            calls.append(refs)
+            # suppression concurrente, validée avant l'INSERT du lot
+            with get_engine().begin() as conn:
+                conn.execute(text("DELETE FROM departments WHERE id = :id"), {"id": gone["id"]})
+        return resolved
+
+    monkeypatch.setattr(employee_import, "_resolve_refs", resolve_then_delete)
+    body = _csv(
+        "Alice,Martin,alice@example.com,Sales,Developer",
+        "Bob,Bernard,bob@example.com,Legal,Developer",
+    )
+    response = client.post("/employees/import", content=body, headers={"Content-Type": "text/csv"})
+
+    assert response.status_code == 200
+    report = response.json()
+    assert report["inserted"] == 1
+    assert report["errors"] == [{"line": 3, "error": "Department 'Legal' does not exist."}]
+    employees = client.get("/employees", params={"department_id": kept["id"]}).json()
+    assert [e["email"] for e in employees] == ["alice@example.com"]
+
+
+def test_imported_store_photo_takes_a_reference(client, make_employee):
+    original = make_employee("Martin")
+    url = original["photo_url"]
+
+    body = _csv(
+        f"Bob,Bernard,bob@example.com,Engineering,Developer,{url}",
+        columns="first_name,last_name,email,department,position,photo_url",
+    )
+    assert _import(client, body).json()["inserted"] == 1
+    assert _ref_count(url) == 2
+
+    # le fichier partagé survit à la suppression de l'employé d'origine
+    assert client.delete(f"/employees/{original['id']}").status_code == 204
+    assert _ref_count(url) == 1
+    assert media_path(url).exists()
+
+
+def test_import_rejects_photo_unknown_to_the_store(client, department, position):
+    url = "/media/employees/00/00unknown.png"
+    body = _csv(
+        f"Bob,Bernard,bob@example.com,Engineering,Developer,{url}",
+        "Eve,Durand,eve@example.com,Engineering,Developer,https://cdn.example.com/eve.png",
+        columns="first_name,last_name,email,department,position,photo_url",
+    )
+    report = _import(client, body).json()
+
+    assert report["inserted"] == 1
+    assert report["errors"] == [{"line": 2, "error": f"Photo '{url}' is not in the media store."}]
+    assert _ref_count(url) is None
+
+
+def test_import_rejects_email_longer_than_the_column(client, department, position):
+    long_email = "a" * 95 + "@example.com"
+    body = _csv(
+        "Alice,Martin,alice@example.com,Engineering,Developer",
+        f"Bob,Bernard,{long_email},Engineering,Developer",
+    )
+    response = _import(client, body)
+
+    assert response.status_code == 200
+    report = response.json()
+    assert report["inserted"] == 1
+    assert [e["line"] for e in report["errors"]] == [3]
@@ -0,0 +1,64 @@
+import base64
+import json
+import uuid
+
+from app.schemas.employee import MAX_BATCH_IDS
+
+
+def _cursor(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def test_cursor_pages_through_employees(client, make_employee):
+    for name in ("Martin", "Bernard", "Dubois"):
+        make_employee(name)
+
+    first = client.get("/employees", params={"limit": 2})
+    assert [e["last_name"] for e in first.json()] == ["Bernard", "Dubois"]
+    cursor = first.headers["X-Next-Cursor"]
+
+    second = client.get("/employees", params={"limit": 2, "cursor": cursor})
+    assert [e["last_name"] for e in second.json()] == ["Martin"]
+    assert "X-Next-Cursor" not in second.headers
+
+
+def test_compact_view_returns_next_cursor_in_body(client, make_employee):
+    for name in ("Martin", "Bernard"):
+        make_employee(name)
+
+    page = client.get("/employees", params={"limit": 1, "view": "compact"}).json()
+    assert [e["last_name"] for e in page["data"]] == ["Bernard"]
+
+    page = client.get("/employees", params={"limit": 1, "view": "compact", "cursor": page["next_cursor"]}).json()
+    assert [e["last_name"] for e in page["data"]] == ["Martin"]
+
+
+def test_malformed_cursor_is_rejected(client):
+    for cursor in ("not-base64!", _cursor({"id": 5}), _cursor(["Martin", 5]), _cursor([1, "x"]), _cursor(["a", "b"])):
+        response = client.get("/employees", params={"cursor": cursor})
+        assert response.status_code == 422, cursor
+        assert response.json()["detail"] == "Invalid cursor"
+
+
+def test_batch_fetch_deduplicates_and_reports_missing(client, make_employee):
+    martin = make_employee("Martin")["id"]
+    bernard = make_employee("Bernard")["id"]
+    unknown = "00000000-0000-0000-0000-000000000000"
+
+    ids = [bernard, martin, bernard, unknown]
+    for response in (
+        client.get("/employees/batch", params={"ids": ",".join(ids)}),
+        client.post("/employees/batch", json={"ids": ids}),
+    ):
+        assert response.status_code == 200
+        body = response.json()
+        assert [e["id"] for e in body["items"]] == [bernard, martin]
+        assert body["missing"] == [unknown]
+
+
+def test_batch_fetch_limits_ids(client):
+    too_many = [str(uuid.uuid4()) for _ in range(MAX_BATCH_IDS + 1)]
+    assert client.post("/employees/batch", json={"ids": too_many}).status_code == 422
+    assert client.post("/employees/batch", json={"ids": []}).status_code == 422
+    assert client.get("/employees/batch", params={"ids": "not-a-uuid"}).status_code == 422
+    assert client.get("/employees/batch", params={"ids": ","}).status_code == 422
@@ -0,0 +1,97 @@
+import asyncio
+import logging
+import os
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+
+from app.core.config import settings
+from app.main import log_failure
+from app.services import warmup
+from app.utils import media
+
+
+def test_ready_is_503_until_warm_up_finishes(client):
+    client.app.state.ready = False
+    try:
+        response = client.get("/ready")
+        assert response.status_code == 503
+        assert response.json() == {"status": "warming up"}
+    finally:
+        client.app.state.ready = True
+    assert client.get("/ready").status_code == 200
+
+
+def test_warm_up_retries_after_any_error(monkeypatch, caplog):
+    attempts = []
+
+    async def flaky_warm_up() -> dict[str, float]:
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("mapper configuration failed")
+        return {}
+
+    monkeypatch.setattr(warmup, "warm_up", flaky_warm_up)
+    state = SimpleNamespace(ready=False, started_at=time.perf_counter())
+
+    asyncio.run(warmup.warm_up_until_ready(state, retry_delay=0))
+
+    assert state.ready is True
+    assert len(attempts) == 2
+    assert "Warm-up failed" in caplog.text
+
+
+def test_failed_background_task_is_logged(caplog):
+    async def broken() -> None:
+        raise RuntimeError("listener crashed")
+
+    async def scenario():
+        task = asyncio.create_task(broken(), name="notifications")
+        task.add_done_callback(log_failure)
+        await asyncio.gather(task, return_exceptions=True)
+        await asyncio.sleep(0)
+
+    with caplog.at_level(logging.ERROR):
+        asyncio.run(scenario())
+    assert "Background task notifications failed" in caplog.text
+
+
+def test_image_pool_is_shut_down_and_recreated_on_demand():
+    pool = media.get_image_pool()
+    media.shutdown_image_pool()
+    assert media._image_pool is None
+    assert media.get_image_pool() is not pool
+
+
+def _run(code: str, **env: str) -> subprocess.CompletedProcess:
+    environ = {k: v for k, v in os.environ.items() if not k.endswith("DATABASE_URL")}
+    return subprocess.run([sys.executable, "-c", code], env={**environ, **env}, capture_output=True, text=True)
+
+
+def test_import_reads_no_settings_and_builds_no_engine():
+    # ni DATABASE_URL ni .env lus: l'import seul doit réussir
+    result = _run(
+        "import app.main, app.jobs.archive_employees, app.services.warmup\n"
+        "from app.core.config import get_settings\n"
+        "from app.db import replicas, session\n"
+        "assert get_settings.cache_info().currsize == 0\n"
+        "assert session._engine is None and session._async_engine is None\n"
+        "assert replicas._replica_engines is None\n"
+    )
+    assert result.returncode == 0, result.stderr
+
+
+def test_engines_are_disposed_and_rebuilt_on_demand():
+    result = _run(
+        "import asyncio\n"
+        "from app.db import session\n"
+        "engine = session.get_engine()\n"
+        "async_engine = session.get_async_engine()\n"
+        "asyncio.run(session.dispose_engines())\n"
+        "assert session._engine is None and session._async_engine is None\n"
+        "assert session.get_engine() is not engine\n",
+        DATABASE_URL=settings.DATABASE_URL,
+        TEST_DATABASE_URL=settings.TEST_DATABASE_URL,
+    )
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,35 @@
+from app.jobs.photo_variants import backfill_photo_variants
+from app.utils.media import PHOTO_VARIANTS, media_path, variant_path
+
+
+def test_missing_variants_are_served_after_backfill(client, make_employee):
+    employee = make_employee("Martin")
+    thumb_url = employee["photo_thumb_url"]
+    assert thumb_url.endswith("_thumb.webp")
+    assert client.get(thumb_url).status_code == 200
+
+    # photo antérieure aux variantes: URL inchangée (pas d'accès disque), fichier absent
+    original = media_path(employee["photo_url"])
+    for variant in PHOTO_VARIANTS:
+        variant_path(original, variant).unlink()
+
+    listed = client.get("/employees").json()[0]
+    assert listed["photo_thumb_url"] == thumb_url
+    assert client.get(thumb_url).status_code == 404
+
+    report = backfill_photo_variants(workers=1)
+    assert report["rendered"] == 1
+    assert client.get(thumb_url).status_code == 200
+    assert backfill_photo_variants(workers=1)["rendered"] == 0
+
+
+def test_external_photo_has_no_variants(client, department, position):
+    body = (
+        "first_name,last_name,email,department,position,photo_url\n"
+        "Alice,Martin,alice@example.com,Engineering,Developer,https://cdn.example.com/a.png"
+    ).encode()
+    client.post("/employees/import", content=body, headers={"Content-Type": "text/csv"})
+
+    listed = client.get("/employees").json()[0]
+    assert listed["photo_url"] == "https://cdn.example.com/a.png"
+    assert listed["photo_thumb_url"] is None
@@ -0,0 +1,53 @@
+from sqlalchemy import text
+
+from app.db.session import get_engine
+from app.utils.media import media_path
+from conftest import png
+
+
+def _ref_counts() -> dict[str, int]:
+    with get_engine().connect() as conn:
+        return dict(conn.execute(text("SELECT path, ref_count FROM media_objects")).all())
+
+
+def test_replacing_photo_releases_the_old_one(client, make_employee):
+    employee = make_employee("Martin")
+    old_url = employee["photo_url"]
+
+    response = client.post(
+        f"/employees/{employee['id']}/photo",
+        files={"photo": ("new.png", png((10, 120, 10)), "image/png")},
+    )
+    assert response.status_code == 200
+    new_url = response.json()["photo_url"]
+
+    assert new_url != old_url
+    assert _ref_counts() == {new_url: 1}
+    assert not media_path(old_url).exists()
+    assert media_path(new_url).exists()
+
+
+def test_shared_photo_survives_until_last_reference(client, make_employee):
+    first = make_employee("Martin")
+    second = make_employee("Bernard")
+    url = first["photo_url"]
+    assert second["photo_url"] == url
+    assert _ref_counts() == {url: 2}
+
+    assert client.delete(f"/employees/{first['id']}").status_code == 204
+    assert _ref_counts() == {url: 1}
+    assert media_path(url).exists()
+
+    assert client.delete(f"/employees/{second['id']}").status_code == 204
+    assert _ref_counts() == {}
+    assert not media_path(url).exists()
+    assert client.delete(f"/employees/{second['id']}").status_code == 404
+
+
+def test_photo_for_unknown_employee_is_not_kept(client):
+    response = client.post(
+        "/employees/00000000-0000-0000-0000-000000000000/photo",
+        files={"photo": ("new.png", png((1, 2, 3)), "image/png")},
+    )
+    assert response.status_code == 404
+    assert _ref_counts() == {}
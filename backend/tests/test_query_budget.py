@@ -0,0 +1,39 @@
+import pytest
+from sqlalchemy import text
+
+from app.core.query_budget import QueryBudgetExceeded, query_budget
+from app.db.session import SessionLocal
+from app.routers.employees import export_employees, get_employee
+
+
+def test_export_streams_within_budget(client, make_employee):
+    for name in ("Martin", "Bernard"):
+        make_employee(name)
+
+    response = client.get("/employees/export", params={"format": "ndjson"})
+    assert response.status_code == 200
+    assert len(response.text.splitlines()) == 2
+
+
+def test_streamed_queries_count_against_the_route_budget(client, make_employee, monkeypatch):
+    make_employee("Martin")
+    # le handler ne lit rien: seule la requête du corps streamé peut dépasser
+    monkeypatch.setattr(export_employees, "__query_budget__", 0)
+
+    with pytest.raises(QueryBudgetExceeded, match="GET /employees/export executed 1 SQL statements"):
+        client.get("/employees/export")
+
+
+def test_route_over_budget_raises(client, make_employee, monkeypatch):
+    employee = make_employee("Martin")
+    monkeypatch.setattr(get_employee, "__query_budget__", 1)
+
+    with pytest.raises(QueryBudgetExceeded):
+        client.get(f"/employees/{employee['id']}")
+
+
+def test_block_budget():
+    with pytest.raises(QueryBudgetExceeded, match="budget: 0"):
+        with query_budget(0, "block"):
+            with SessionLocal() as db:
+                db.execute(text("SELECT 1"))
@@ -0,0 +1,49 @@
+import asyncio
+import time
+
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.db import replicas
+from app.db.session import get_async_database_url
+
+
+def test_primary_reports_no_replication_lag():
+    async def lag() -> float:
+        engine = create_async_engine(get_async_database_url(), poolclass=NullPool)
+        try:
+            return await replicas.replica_lag(engine)
+        finally:
+            await engine.dispose()
+
+    assert asyncio.run(lag()) == 0
+
+
+def test_lagging_replica_leaves_rotation_until_it_catches_up(monkeypatch):
+    lags = iter([60.0, 0.0])
+
+    async def fake_lag(engine) -> float:
+        return next(lags)
+
+    monkeypatch.setattr(replicas, "_replica_engines", [object()])
+    monkeypatch.setattr(replicas, "_down_until", [0.0])
+    monkeypatch.setattr(replicas, "replica_lag", fake_lag)
+
+    asyncio.run(replicas.check_replicas())
+    assert replicas._down_until[0] > time.monotonic()
+    assert replicas._pick_replica() is None
+
+    asyncio.run(replicas.check_replicas())
+    assert replicas._pick_replica() == 0
+
+
+def test_unreachable_replica_leaves_rotation(monkeypatch):
+    async def unreachable(engine) -> float:
+        raise OSError("connection refused")
+
+    monkeypatch.setattr(replicas, "_replica_engines", [object()])
+    monkeypatch.setattr(replicas, "_down_until", [0.0])
+    monkeypatch.setattr(replicas, "replica_lag", unreachable)
+
+    asyncio.run(replicas.check_replicas())
+    assert replicas._pick_replica() is None
@@ -0,0 +1,20 @@
+def test_headcount_facets(client, make_employee, department):
+    for name in ("Martin", "Bernard", "Dubois"):
+        make_employee(name)
+
+    stats = client.get("/stats/headcount").json()
+    assert stats["total"] == 3
+    assert stats["by_department"] == [{"id": department["id"], "label": "Engineering", "headcount": 3}]
+    assert stats["by_status"] == {"active": 3}
+
+
+def test_headcount_matches_searched_list(client, make_employee):
+    for name in ("Martin", "Martinez", "Bernard"):
+        make_employee(name)
+
+    listed = client.get("/employees", params={"q": "martin"}).json()
+    stats = client.get("/stats/headcount", params={"q": "martin"}).json()
+
+    assert len(listed) == 2
+    assert stats["total"] == 2
+    assert [b["headcount"] for b in stats["by_position"]] == [2]
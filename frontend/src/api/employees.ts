@@ -2,6 +2,7 @@ import { http } from "../lib/http";
 
 import type {
   Employee,
+  EmployeeBatch,
   EmployeeListParams,
   EmployeeUpdate,
 } from "../types/domain";
@@ -18,6 +19,12 @@ export async function getEmployee(id: string): Promise<Employee> {
   return res.data;
 }
 
+// POST /employees/batch: une seule requête pour une sélection de personnes
+export async function getEmployeesBatch(ids: string[]): Promise<EmployeeBatch> {
+  const res = await http.post("/employees/batch", { ids });
+  return res.data;
+}
+
 export async function createEmployee(formData: FormData): Promise<Employee> {
   const res = await http.post("/employees", formData, {
     headers: { "Content-Type": "multipart/form-data" },
@@ -34,6 +41,12 @@ export async function updateEmployee(
   return res.data;
 }
 
+// POST /employees/{employee_id}/restore: sort l'employé de l'archive
+export async function restoreEmployee(id: string): Promise<Employee> {
+  const res = await http.post(`/employees/${id}/restore`);
+  return res.data;
+}
+
 // ✅ POST /employees/{employee_id}/photo
 export async function updateEmployeePhoto(
   id: string,
@@ -0,0 +1,28 @@
+import { http } from "../lib/http";
+import type { ChangeEvent } from "../types/domain";
+
+const EVENT_TYPES = ["employee", "department", "position"].flatMap((entity) =>
+  ["created", "updated", "deleted"].map((op) => `${entity}.${op}`),
+);
+
+type ChangeHandlers = {
+  onChange: (event: ChangeEvent) => void;
+  // reprise impossible (journal purgé): recharger les listes
+  onReset?: () => void;
+};
+
+// GET /events (SSE): EventSource se reconnecte seul et renvoie Last-Event-ID
+export function subscribeToChanges(
+  { onChange, onReset }: ChangeHandlers,
+  departmentId?: string,
+): () => void {
+  const url = new URL("/events", http.defaults.baseURL);
+  if (departmentId) url.searchParams.set("department_id", departmentId);
+
+  const source = new EventSource(url);
+  const listener = (e: MessageEvent<string>) => onChange(JSON.parse(e.data));
+  EVENT_TYPES.forEach((type) => source.addEventListener(type, listener));
+  source.addEventListener("reset", () => onReset?.());
+
+  return () => source.close();
+}
@@ -228,7 +228,14 @@ export default function EmployeesPage() {
                     <td className="px-4 py-3">
                       <div className="flex items-center gap-3">
                         <img
-                          src={mediaUrl(e.photo_url)}
+                          src={mediaUrl(e.photo_thumb_url ?? e.photo_url)}
+                          // variante pas encore générée (photo ancienne): l'original
+                          onError={(ev) => {
+                            const img = ev.currentTarget;
+                            if (img.dataset.fallback) return;
+                            img.dataset.fallback = "1";
+                            img.src = mediaUrl(e.photo_url);
+                          }}
                           alt={`${e.first_name} ${e.last_name}`}
                           className="h-10 w-10 rounded-full border object-cover"
                         />
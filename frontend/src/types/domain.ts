@@ -20,6 +20,8 @@ export type Employee = {
   email: string;
   status: "active" | "inactive" | string;
   photo_url: string;
+  photo_thumb_url?: string | null;
+  photo_medium_url?: string | null;
 
   department: Department;
   position: Position;
@@ -29,12 +31,18 @@ export type Employee = {
   hire_date?: string | null;
 };
 
+export type EmployeeBatch = {
+  items: Employee[];
+  missing: string[];
+};
+
 export type EmployeeListParams = {
   department_id?: string;
   position_id?: string;
   q?: string;
   limit?: number;
   offset?: number;
+  include_archived?: boolean;
 };
 
 export type DepartmentCreate = {
@@ -55,3 +63,12 @@ export type EmployeeUpdate = Partial<{
   hire_date: string | null;
   status: "active" | "inactive";
 }>;
+
+export type ChangeEvent = {
+  seq: number;
+  entity: "employee" | "department" | "position";
+  op: "created" | "updated" | "deleted";
+  id: string;
+  department_ids: string[] | null;
+  created_at: string;
+};